@@ -0,0 +1,425 @@
+"""
+Arithmetic on distributions, compiling combined values into one sampler.
+
+Rather than drawing several values and combining them on every draw, as in
+``weighted_choice(base) + weighted_rand(detune)``, the distributions can be
+combined once into a new distribution, after which each combined value
+costs a single draw:
+
+>>> from blur.rand import DiscreteDistribution, PiecewiseLinearDistribution
+>>> base = DiscreteDistribution([(220, 1), (330, 2)])
+>>> detune = PiecewiseLinearDistribution([(-2, 0), (0, 1), (2, 0)])
+>>> pitch = add(base, detune)                        # doctest: +REQUIRES_NUMPY
+>>> pitch.sample()                                             # doctest: +SKIP
+331.20558232594855
+>>> pitch.sample_many(3)                                       # doctest: +SKIP
+array([327.93413502, 219.6613914 , 330.42418766])
+
+Discrete distributions must have numerical outcomes. Combinations of
+discrete distributions are exact ``rand.DiscreteDistribution`` objects.
+Combinations involving continuous distributions are
+``rand.PiecewiseLinearDistribution`` objects, which are exact wherever the
+result is itself piecewise linear: shifting, scaling and mixing weight
+curves, and adding or multiplying a weight curve and a discrete
+distribution. Adding two continuous distributions convolves their
+densities numerically on an even grid. Other continuous distributions,
+such as those of ``dist``, are first approximated by a weight curve
+of ``resolution`` steps, packed most tightly into their tails.
+
+Requires NumPy.
+"""
+
+from __future__ import division
+
+import numbers
+
+from blur.rand import (ContinuousDistribution, DiscreteDistribution,
+                       PiecewiseLinearDistribution, ProbabilityUndefinedError,
+                       WeightArrays, _import_numpy, _standard_normal_cdf,
+                       _standard_normal_ppf)
+
+__all__ = ['shift', 'scale', 'add', 'multiply', 'mixture']
+
+# The probability cut from each tail of unbounded distributions
+# when approximating them with a weight curve
+_TAIL_PROBABILITY = 1e-6
+
+
+def _discrete_table(distribution):
+    """
+    Get the distinct outcomes of a discrete distribution and their masses.
+
+    Returns:
+        tuple(numpy.ndarray): The outcomes and their probabilities
+
+    Raises:
+        TypeError: if the outcomes are not numbers
+    """
+    outcomes, masses, cumulative = distribution._outcome_table_arrays()
+    if outcomes.dtype.kind not in 'biuf' and not all(
+            isinstance(outcome, numbers.Real) for outcome in outcomes):
+        raise TypeError('Only discrete distributions with numerical '
+                        'outcomes can be combined.')
+    return outcomes.astype(float), masses
+
+
+def _as_curve(distribution, resolution):
+    """
+    Get a continuous distribution as a ``PiecewiseLinearDistribution``.
+
+    Weight curves are returned as-is. Other continuous distributions are
+    approximated by a step of constant density between each of
+    ``resolution + 1`` quantiles, leaving out ``_TAIL_PROBABILITY`` of
+    each tail. The quantiles are those of evenly spaced points of a
+    standard normal distribution, which packs them more tightly into
+    the tails, where the density changes quickest.
+
+    Raises:
+        TypeError: if ``distribution`` cannot be approximated
+    """
+    if isinstance(distribution, PiecewiseLinearDistribution):
+        return distribution
+    numpy = _import_numpy()
+    reach = -_standard_normal_ppf(_TAIL_PROBABILITY)
+    fractions = numpy.array([_standard_normal_cdf(z) for z in
+                             numpy.linspace(-reach, reach, resolution + 1)])
+    try:
+        quantiles = distribution._inverse_array(fractions)
+    except NotImplementedError:
+        raise TypeError('{} has no inverse cumulative distribution function '
+                        'and cannot be combined.'.format(
+                            type(distribution).__name__))
+    with numpy.errstate(divide='ignore'):
+        densities = numpy.diff(fractions) / numpy.diff(quantiles)
+    densities[~numpy.isfinite(densities)] = 0
+    outcomes = numpy.column_stack((quantiles[:-1], quantiles[1:])).ravel()
+    return PiecewiseLinearDistribution(
+        WeightArrays(outcomes, numpy.repeat(densities, 2)))
+
+
+def _segments(curve, factor=1, offset=0, strength=1):
+    """
+    Get the segments of a weight curve, transformed and normalized.
+
+    Args:
+        curve (PiecewiseLinearDistribution): The curve
+        factor (float): A non-zero factor to scale outcomes by
+        offset (float): An offset to add to outcomes after scaling
+        strength (float): The total area to scale the curve to
+
+    Returns:
+        tuple(numpy.ndarray): The start and end outcomes and
+        the start and end strengths of every segment
+    """
+    x_starts, y_starts, slopes, widths, area_starts = curve._curve_tables()
+    x_ends = x_starts + widths
+    y_ends = y_starts + (slopes * widths)
+    # Scaling outcomes stretches the curve, so lower it to keep its area
+    height = strength / (curve.total_area * abs(factor))
+    if factor < 0:
+        x_starts, x_ends = x_ends, x_starts
+        y_starts, y_ends = y_ends, y_starts
+    return ((x_starts * factor) + offset, (x_ends * factor) + offset,
+            y_starts * height, y_ends * height)
+
+
+def _sum_segments(segment_tables):
+    """
+    Compile the sum of many sets of segments into one weight curve.
+
+    The sum of linear segments is linear between every point where a
+    segment starts or ends, so the summed curve is exact. Each segment is
+    written as ``a + (b * x)``, and the sum of ``a`` and ``b`` over the
+    segments covering each point is found with a cumulative sum over the
+    points where segments start and end.
+
+    Args:
+        segment_tables (list): Tables of segments from ``_segments()``
+
+    Returns:
+        PiecewiseLinearDistribution
+    """
+    numpy = _import_numpy()
+    x_starts, x_ends, y_starts, y_ends = [
+        numpy.concatenate(column) for column in zip(*segment_tables)]
+    slopes = (y_ends - y_starts) / (x_ends - x_starts)
+    intercepts = y_starts - (slopes * x_starts)
+    positions = numpy.concatenate((x_starts, x_ends))
+    order = numpy.argsort(positions, kind='mergesort')
+    positions = positions.take(order)
+    intercept_sums = numpy.cumsum(
+        numpy.concatenate((intercepts, -intercepts)).take(order))
+    slope_sums = numpy.cumsum(
+        numpy.concatenate((slopes, -slopes)).take(order))
+    points = numpy.unique(positions)
+    strengths = []
+    # Find the strength just left and just right of every point, where
+    # segments ending or starting at the point are left out or counted
+    for side in ('left', 'right'):
+        counted = numpy.searchsorted(positions, points, side=side) - 1
+        strength = numpy.where(
+            counted >= 0,
+            intercept_sums.take(counted) +
+            (slope_sums.take(counted) * points), 0)
+        strengths.append(numpy.maximum(strength, 0))
+    return PiecewiseLinearDistribution(WeightArrays(
+        numpy.repeat(points, 2),
+        numpy.column_stack(strengths).ravel()))
+
+
+def _transform(distribution, factor, offset, resolution):
+    """Scale then shift the outcomes of a distribution."""
+    if isinstance(distribution, DiscreteDistribution):
+        outcomes, masses = _discrete_table(distribution)
+        return DiscreteDistribution(
+            WeightArrays((outcomes * factor) + offset, masses))
+    if factor == 0:
+        raise ValueError(
+            'Continuous distributions cannot be scaled by 0.')
+    return _sum_segments([_segments(_as_curve(distribution, resolution),
+                                    factor, offset)])
+
+
+def shift(distribution, offset, resolution=1024):
+    """
+    Shift every outcome of a distribution by ``offset``.
+
+    Args:
+        distribution (DiscreteDistribution or ContinuousDistribution):
+            The distribution to shift
+        offset (float): The amount to add to every outcome
+        resolution (int): The number of steps to approximate continuous
+            distributions which are not weight curves with
+
+    Returns:
+        DiscreteDistribution or PiecewiseLinearDistribution: The
+        distribution of ``distribution + offset``
+
+    Example:
+        >>> curve = PiecewiseLinearDistribution([(0, 0), (1, 1)])
+        >>> shift(curve, 10).support                 # doctest: +REQUIRES_NUMPY
+        (10.0, 11.0)
+    """
+    return _transform(distribution, 1, offset, resolution)
+
+
+def scale(distribution, factor, resolution=1024):
+    """
+    Multiply every outcome of a distribution by ``factor``.
+
+    Args:
+        distribution (DiscreteDistribution or ContinuousDistribution):
+            The distribution to scale
+        factor (float): The amount to multiply every outcome by.
+            Negative factors mirror the distribution.
+        resolution (int): The number of steps to approximate continuous
+            distributions which are not weight curves with
+
+    Returns:
+        DiscreteDistribution or PiecewiseLinearDistribution: The
+        distribution of ``distribution * factor``
+
+    Raises:
+        ValueError: if ``distribution`` is continuous and ``factor == 0``
+
+    Example:
+        >>> curve = PiecewiseLinearDistribution([(0, 0), (1, 1)])
+        >>> scale(curve, -2).support                 # doctest: +REQUIRES_NUMPY
+        (-2.0, 0.0)
+    """
+    return _transform(distribution, factor, 0, resolution)
+
+
+def _convolve(first, second, resolution):
+    """
+    Numerically convolve two weight curves.
+
+    Both curves are cut into cells of an even width, small enough that
+    the wider of the two spans ``resolution`` cells. The probability of
+    every cell is found exactly from the cumulative distribution
+    function, and the sum of the cells of both curves is spread over
+    the width of one cell either side of their summed midpoints.
+
+    Placing the mass of each cell at its midpoint can move the mean of
+    the sum by up to a cell, so the result is shifted back onto the exact
+    mean, the sum of the means of both curves. A curve narrower than a
+    cell is instead added exactly as a single point at its mean.
+    """
+    numpy = _import_numpy()
+    first_low, first_high = first.support
+    second_low, second_high = second.support
+    if first_high - first_low < second_high - second_low:
+        first, second = second, first
+        first_low, first_high, second_low, second_high = (
+            second_low, second_high, first_low, first_high)
+    step = (first_high - first_low) / resolution
+    if second_high - second_low < step:
+        return _sum_segments([_segments(first, 1, second.mean)])
+    masses = []
+    for curve, low, high in ((first, first_low, first_high),
+                             (second, second_low, second_high)):
+        edges = low + (numpy.arange(int(numpy.ceil(
+            (high - low) / step)) + 1) * step)
+        masses.append(numpy.diff(curve.cdf(edges)))
+    summed = numpy.convolve(masses[0], masses[1])
+    # Each cell of the sum is spread symmetrically around its midpoint
+    midpoints = (first_low + second_low +
+                 (numpy.arange(1, len(summed) + 1) * step))
+    offset = ((first.mean + second.mean) -
+              (numpy.dot(summed, midpoints) / summed.sum()))
+    outcomes = (first_low + second_low + offset +
+                (numpy.arange(len(summed) + 2) * step))
+    strengths = numpy.concatenate(([0], summed / step, [0]))
+    return PiecewiseLinearDistribution(WeightArrays(outcomes, strengths))
+
+
+def add(first, second, resolution=1024):
+    """
+    Find the distribution of the sum of values drawn from two distributions.
+
+    Adding two discrete distributions, or a discrete distribution and a
+    weight curve, is exact. Adding two continuous distributions convolves
+    them numerically.
+
+    Args:
+        first (DiscreteDistribution or ContinuousDistribution):
+            The first distribution
+        second (DiscreteDistribution or ContinuousDistribution):
+            The second distribution
+        resolution (int): The number of grid cells across the wider of two
+            continuous distributions being added, and the number of steps
+            to approximate continuous distributions which are not weight
+            curves with
+
+    Returns:
+        DiscreteDistribution or PiecewiseLinearDistribution: The
+        distribution of ``first + second``
+
+    Example:
+        >>> dice = DiscreteDistribution([(i, 1) for i in range(1, 7)])
+        >>> round(add(dice, dice).pmf(7), 4)         # doctest: +REQUIRES_NUMPY
+        0.1667
+    """
+    numpy = _import_numpy()
+    if isinstance(first, ContinuousDistribution):
+        first, second = second, first
+    if isinstance(first, DiscreteDistribution):
+        outcomes, masses = _discrete_table(first)
+        if isinstance(second, DiscreteDistribution):
+            other_outcomes, other_masses = _discrete_table(second)
+            return DiscreteDistribution(WeightArrays(
+                numpy.add.outer(outcomes, other_outcomes).ravel(),
+                numpy.multiply.outer(masses, other_masses).ravel()))
+        curve = _as_curve(second, resolution)
+        return _sum_segments([_segments(curve, 1, outcome, mass)
+                              for outcome, mass in zip(outcomes, masses)])
+    return _convolve(_as_curve(first, resolution),
+                     _as_curve(second, resolution), resolution)
+
+
+def multiply(first, second, resolution=1024):
+    """
+    Find the distribution of the product of values from two distributions.
+
+    At least one of the distributions must be discrete. The product is
+    exact for two discrete distributions, or a discrete distribution
+    and a weight curve.
+
+    Args:
+        first (DiscreteDistribution or ContinuousDistribution):
+            The first distribution
+        second (DiscreteDistribution or ContinuousDistribution):
+            The second distribution
+        resolution (int): The number of steps to approximate continuous
+            distributions which are not weight curves with
+
+    Returns:
+        DiscreteDistribution or PiecewiseLinearDistribution: The
+        distribution of ``first * second``
+
+    Raises:
+        TypeError: if neither distribution is discrete
+        ValueError: if one distribution is continuous and the other
+            can be ``0``
+
+    Example:
+        >>> octave = DiscreteDistribution([(1, 3), (2, 1)])
+        >>> pitch = PiecewiseLinearDistribution([(430, 0), (440, 1),
+        ...                                      (450, 0)])
+        >>> multiply(octave, pitch).support          # doctest: +REQUIRES_NUMPY
+        (430.0, 900.0)
+    """
+    numpy = _import_numpy()
+    if isinstance(first, ContinuousDistribution):
+        first, second = second, first
+    if not isinstance(first, DiscreteDistribution):
+        raise TypeError('At least one distribution to multiply '
+                        'must be discrete.')
+    outcomes, masses = _discrete_table(first)
+    if isinstance(second, DiscreteDistribution):
+        other_outcomes, other_masses = _discrete_table(second)
+        return DiscreteDistribution(WeightArrays(
+            numpy.multiply.outer(outcomes, other_outcomes).ravel(),
+            numpy.multiply.outer(masses, other_masses).ravel()))
+    if (outcomes == 0).any():
+        raise ValueError('Continuous distributions cannot be '
+                         'multiplied by a distribution which can be 0.')
+    curve = _as_curve(second, resolution)
+    return _sum_segments([_segments(curve, outcome, 0, mass)
+                          for outcome, mass in zip(outcomes, masses)])
+
+
+def mixture(weights, resolution=1024):
+    """
+    Find the distribution which draws from one of many distributions.
+
+    Each value is drawn from one of the distributions, picked with a chance
+    proportional to its strength, as in ``rand.weighted_choice()``. The
+    distributions must either all be discrete or all be continuous.
+
+    Args:
+        weights (list): A list of tuples of form
+            ``(DiscreteDistribution or ContinuousDistribution, float)``
+            corresponding to ``(distribution, strength)``. Distributions
+            with strength ``0`` or less have no chance to be drawn from.
+        resolution (int): The number of steps to approximate continuous
+            distributions which are not weight curves with
+
+    Returns:
+        DiscreteDistribution or PiecewiseLinearDistribution: The mixture
+
+    Raises:
+        TypeError: if the distributions are not all discrete
+            or all continuous
+        ProbabilityUndefinedError: if no strength in ``weights``
+            is greater than ``0``
+
+    Example:
+        >>> low = PiecewiseLinearDistribution([(0, 1), (1, 1)])
+        >>> high = PiecewiseLinearDistribution([(9, 1), (10, 1)])
+        >>> mixture([(low, 3), (high, 1)]).cdf(5)    # doctest: +REQUIRES_NUMPY
+        0.75
+    """
+    numpy = _import_numpy()
+    weights = [(distribution, strength) for distribution, strength in weights
+               if strength > 0]
+    if not weights:
+        raise ProbabilityUndefinedError(
+            'No distribution strengths in mixture() are greater than 0. '
+            'Probability distribution is undefined.')
+    discrete_count = sum(isinstance(distribution, DiscreteDistribution)
+                         for distribution, strength in weights)
+    if discrete_count == len(weights):
+        tables = [(_discrete_table(distribution), strength)
+                  for distribution, strength in weights]
+        return DiscreteDistribution(WeightArrays(
+            numpy.concatenate([outcomes for (outcomes, masses), strength
+                               in tables]),
+            numpy.concatenate([masses * strength for (outcomes, masses),
+                               strength in tables])))
+    if discrete_count:
+        raise TypeError('Distributions in a mixture must either all be '
+                        'discrete or all be continuous.')
+    return _sum_segments([
+        _segments(_as_curve(distribution, resolution), strength=strength)
+        for distribution, strength in weights])
@@ -0,0 +1,260 @@
+"""
+A counter-based source of randomness with random access.
+
+A ``CounterRandom`` computes every value of its stream directly from the
+value's position, by encrypting the position with the Philox4x32-10
+function of Salmon et al. (*Parallel Random Numbers: As Easy as 1, 2, 3*,
+SC 2011). There is no hidden state to replay, so jumping to any position
+costs nothing, and workers which each draw a different part of a stream
+produce exactly the values a single worker drawing all of it would.
+
+A ``CounterRandom`` can be passed as the ``rng`` of any function in blur:
+
+>>> from blur.rand import weighted_rand
+>>> rng = CounterRandom(seed=42, stream='clouds')
+>>> weighted_rand([(0, 1), (10, 5)], rng=rng)
+4.626268563576069
+
+Batch functions such as ``rand.weighted_rand_many()`` draw exactly one
+value of the stream per result, so splitting a batch into parts starting
+at the right positions gives exactly the same results:
+
+>>> from blur.rand import weighted_rand_many
+>>> weights = [(0, 1), (10, 5)]
+>>> whole = weighted_rand_many(weights, 10, rng=CounterRandom(42, 'clouds'))
+>>> second_half = weighted_rand_many(
+...     weights, 5, rng=CounterRandom(42, 'clouds', position=5))
+>>> list(whole[5:]) == list(second_half)
+True
+"""
+
+from __future__ import division
+import hashlib
+import random
+
+from blur.rand import _get_numpy
+
+# Multipliers and key schedule constants of Philox4x32
+_PHILOX_M0 = 0xD2511F53
+_PHILOX_M1 = 0xCD9E8D57
+_PHILOX_W0 = 0x9E3779B9
+_PHILOX_W1 = 0xBB67AE85
+_PHILOX_ROUNDS = 10
+
+_MASK_32 = 0xFFFFFFFF
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _philox(counter, key):
+    """
+    Encrypt a counter with the Philox4x32-10 function.
+
+    Args:
+        counter (tuple(int)): Four 32-bit words
+        key (tuple(int)): Two 32-bit words
+
+    Returns:
+        tuple(int): Four pseudo-random 32-bit words
+    """
+    c0, c1, c2, c3 = counter
+    k0, k1 = key
+    for i in range(_PHILOX_ROUNDS):
+        product_0 = _PHILOX_M0 * c0
+        product_1 = _PHILOX_M1 * c2
+        c0, c1, c2, c3 = ((product_1 >> 32) ^ c1 ^ k0,
+                          product_1 & _MASK_32,
+                          (product_0 >> 32) ^ c3 ^ k1,
+                          product_0 & _MASK_32)
+        k0 = (k0 + _PHILOX_W0) & _MASK_32
+        k1 = (k1 + _PHILOX_W1) & _MASK_32
+    return c0, c1, c2, c3
+
+
+def _philox_array(counter, key):
+    """
+    Vectorized version of ``_philox()`` over NumPy arrays of words.
+
+    Every word is held in a ``uint64`` array so that products of two
+    32-bit words are exact.
+    """
+    numpy = _get_numpy()
+    c0, c1, c2, c3 = [numpy.asarray(word, dtype=numpy.uint64)
+                      for word in counter]
+    k0, k1 = key
+    m0 = numpy.uint64(_PHILOX_M0)
+    m1 = numpy.uint64(_PHILOX_M1)
+    mask = numpy.uint64(_MASK_32)
+    shift = numpy.uint64(32)
+    for i in range(_PHILOX_ROUNDS):
+        product_0 = m0 * c0
+        product_1 = m1 * c2
+        c0, c1, c2, c3 = ((product_1 >> shift) ^ c1 ^ numpy.uint64(k0),
+                          product_1 & mask,
+                          (product_0 >> shift) ^ c3 ^ numpy.uint64(k1),
+                          product_0 & mask)
+        k0 = (k0 + _PHILOX_W0) & _MASK_32
+        k1 = (k1 + _PHILOX_W1) & _MASK_32
+    return c0, c1, c2, c3
+
+
+def _stream_id(stream):
+    """
+    Convert a stream name or number to a 64-bit stream id.
+
+    Names are hashed with SHA-256, so the same name gives
+    the same stream on every platform and in every session.
+    """
+    if isinstance(stream, int):
+        return stream & _MASK_64
+    if not isinstance(stream, bytes):
+        stream = stream.encode('utf-8')
+    return int(hashlib.sha256(stream).hexdigest()[:16], 16)
+
+
+class CounterRandom(object):
+    """
+    A random-access stream of uniformly random values.
+
+    Each position of the stream holds one 64-bit block of random bits,
+    from which ``random()`` builds a ``float`` in ``[0, 1)`` exactly the
+    way ``random.random()`` does. Every draw reads the value at
+    ``position`` and moves ``position`` forward by one.
+
+    The ``seed`` and ``stream`` together pick one of ``2 ** 128``
+    independent streams, each ``2 ** 64`` values long.
+
+    Attributes:
+        seed (int): The seed of the stream
+        stream (int or str): The name or number of the stream
+        position (int): The position of the next value to be drawn.
+            It may be set directly to jump anywhere in the stream.
+
+    Example:
+        >>> rng = CounterRandom(seed=7, stream='wind')
+        >>> first = rng.random()
+        >>> rng.position
+        1
+        >>> rng.position = 0
+        >>> rng.random() == first
+        True
+        >>> rng.random_at(1000) == CounterRandom(7, 'wind', 1000).random()
+        True
+    """
+
+    def __init__(self, seed=None, stream=0, position=0):
+        """
+        Args:
+            seed (int): The seed of the stream. Only its lowest 64 bits
+                are used. If ``None``, a seed is drawn from the global
+                ``random`` module.
+            stream (int or str): The name or number of the stream.
+                Names are hashed to numbers.
+            position (int): The position of the first value to draw
+        """
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.stream = stream
+        self.position = position
+        self._key = (seed & _MASK_32, (seed >> 32) & _MASK_32)
+        stream_id = _stream_id(stream)
+        self._stream_words = (stream_id & _MASK_32, stream_id >> 32)
+
+    def __repr__(self):
+        return 'CounterRandom(seed={!r}, stream={!r}, position={!r})'.format(
+            self.seed, self.stream, self.position)
+
+    def _words_at(self, position):
+        """Get the two 32-bit words of the block at ``position``."""
+        block = position >> 1
+        words = _philox((block & _MASK_32, block >> 32) + self._stream_words,
+                        self._key)
+        if position & 1:
+            return words[2], words[3]
+        return words[0], words[1]
+
+    def random_at(self, position):
+        """
+        Get the value at any position without moving ``position``.
+
+        Args:
+            position (int): The position of the value in the stream
+
+        Returns:
+            float: A value in ``[0, 1)``
+        """
+        high, low = self._words_at(position)
+        return ((high >> 5) * 67108864 + (low >> 6)) / 9007199254740992
+
+    def random(self):
+        """
+        Draw the next value of the stream.
+
+        Returns:
+            float: A value in ``[0, 1)``
+        """
+        value = self.random_at(self.position)
+        self.position += 1
+        return value
+
+    def getrandbits(self, k):
+        """
+        Draw an ``int`` with ``k`` random bits.
+
+        Each full or partial 64 bits of the result draws
+        one value of the stream.
+
+        Args:
+            k (int): The number of bits
+
+        Returns:
+            int: A value in ``[0, 2 ** k)``
+        """
+        result = 0
+        for i in range(-(-k // 64)):
+            high, low = self._words_at(self.position)
+            self.position += 1
+            result = (result << 64) | (high << 32) | low
+        return result >> (-k % 64)
+
+    def random_many(self, count):
+        """
+        Draw the next ``count`` values of the stream at once.
+
+        If NumPy is installed, the values are computed in a single
+        vectorized pass, and are exactly the values ``random()``
+        would draw one at a time.
+
+        Args:
+            count (int): The number of values to draw
+
+        Returns:
+            numpy.ndarray: ``count`` values in ``[0, 1)``
+
+            list: ``count`` values if NumPy is not installed
+        """
+        numpy = _get_numpy()
+        if numpy is None:
+            return [self.random() for i in range(count)]
+        start = self.position
+        self.position += count
+        if count <= 0:
+            return numpy.empty(0)
+        first_block = start >> 1
+        block_count = ((start + count - 1) >> 1) - first_block + 1
+        blocks = numpy.arange(block_count, dtype=numpy.uint64)
+        blocks += numpy.uint64(first_block)
+        words = _philox_array(
+            (blocks & numpy.uint64(_MASK_32), blocks >> numpy.uint64(32),
+             numpy.full(block_count, self._stream_words[0], numpy.uint64),
+             numpy.full(block_count, self._stream_words[1], numpy.uint64)),
+            self._key)
+        high = numpy.empty(block_count * 2, dtype=numpy.uint64)
+        low = numpy.empty(block_count * 2, dtype=numpy.uint64)
+        high[0::2], low[0::2] = words[0], words[1]
+        high[1::2], low[1::2] = words[2], words[3]
+        offset = start & 1
+        high = high[offset:offset + count] >> numpy.uint64(5)
+        low = low[offset:offset + count] >> numpy.uint64(6)
+        return ((high * numpy.uint64(67108864) + low).astype(float) /
+                9007199254740992)
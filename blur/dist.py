@@ -0,0 +1,533 @@
+"""
+A collection of common parametric probability distributions.
+
+Every distribution is a compiled ``rand.ContinuousDistribution``, drawn
+with ``sample()`` or, for many values at once, ``sample_many()``.
+Where the distribution has a closed-form inverse cumulative distribution
+function, each value costs a single uniform roll.
+
+Distributions can be used anywhere a ``rand.ContinuousDistribution`` is
+accepted, including as the weights of a ``soft.SoftFloat``:
+
+>>> from blur.soft import SoftFloat
+>>> blurry_float = SoftFloat(Exponential(0.5))
+>>> blurry_float.get()                                         # doctest: +SKIP
+1.4712394807340236
+"""
+
+from __future__ import division
+import math
+
+from blur.rand import (ContinuousDistribution, NormalDistribution,
+                       is_random_stream, numpy_generator, random_value,
+                       _MAX_PROBABILITY, _MIN_PROBABILITY,
+                       _get_numpy, _import_numpy, _standard_normal_ppf,
+                       _standard_normal_ppf_array)
+
+__all__ = ['Exponential', 'Beta', 'Triangular', 'LogNormal', 'Pareto',
+           'NormalDistribution']
+
+# The most steps taken by numerical inverses, and the relative
+# change in their results at which they stop
+_MAX_INVERSE_STEPS = 200
+_INVERSE_TOLERANCE = 1e-15
+
+
+class Exponential(ContinuousDistribution):
+    """
+    An exponential distribution.
+
+    Example:
+        >>> distribution = Exponential(2)
+        >>> distribution.sample()                              # doctest: +SKIP
+        0.23411620917342376
+    """
+
+    def __init__(self, rate):
+        """
+        Args:
+            rate (float): The rate of the distribution, which is
+                ``1`` divided by its mean.
+
+        Raises:
+            ValueError: if ``rate <= 0``
+        """
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0')
+        self.rate = rate
+
+    def _inverse(self, fraction):
+        fraction = min(fraction, _MAX_PROBABILITY)
+        return -math.log1p(-fraction) / self.rate
+
+    def _inverse_array(self, fractions):
+        numpy = _import_numpy()
+        fractions = numpy.minimum(numpy.asarray(fractions, dtype=float),
+                                  _MAX_PROBABILITY)
+        return -numpy.log1p(-fractions) / self.rate
+
+
+class Triangular(ContinuousDistribution):
+    """
+    A triangular distribution between two values, peaking at ``mode``.
+
+    Example:
+        >>> distribution = Triangular(0, 10, mode=2)
+        >>> distribution.sample()                              # doctest: +SKIP
+        3.3716223467419124
+    """
+
+    def __init__(self, low, high, mode=None):
+        """
+        Args:
+            low (float): The lowest possible outcome
+            high (float): The highest possible outcome
+            mode (float): The most likely outcome. Defaults to the
+                midpoint between ``low`` and ``high``.
+
+        Raises:
+            ValueError: if ``high <= low`` or ``mode`` is not between
+                ``low`` and ``high``
+        """
+        if mode is None:
+            mode = (low + high) / 2
+        if high <= low:
+            raise ValueError('high must be greater than low')
+        if not low <= mode <= high:
+            raise ValueError('mode must be between low and high')
+        self.low = low
+        self.high = high
+        self.mode = mode
+        self._mode_fraction = (mode - low) / (high - low)
+
+    def _inverse(self, fraction):
+        width = self.high - self.low
+        if fraction < self._mode_fraction:
+            return self.low + math.sqrt(
+                fraction * width * (self.mode - self.low))
+        else:
+            return self.high - math.sqrt(
+                (1 - fraction) * width * (self.high - self.mode))
+
+    def _inverse_array(self, fractions):
+        numpy = _import_numpy()
+        fractions = numpy.asarray(fractions, dtype=float)
+        width = self.high - self.low
+        return numpy.where(
+            fractions < self._mode_fraction,
+            self.low + numpy.sqrt(
+                fractions * width * (self.mode - self.low)),
+            self.high - numpy.sqrt(
+                (1 - fractions) * width * (self.high - self.mode)))
+
+
+class LogNormal(ContinuousDistribution):
+    """
+    A log-normal distribution, whose natural logarithm is normal.
+
+    Example:
+        >>> distribution = LogNormal(0, 0.5)
+        >>> distribution.sample()                              # doctest: +SKIP
+        1.2200213465713095
+    """
+
+    def __init__(self, mu, sigma):
+        """
+        Args:
+            mu (float): The mean of the underlying normal distribution
+            sigma (float): The standard deviation of the underlying
+                normal distribution
+
+        Raises:
+            ValueError: if ``sigma <= 0``
+        """
+        if sigma <= 0:
+            raise ValueError('sigma must be greater than 0')
+        self.mu = mu
+        self.sigma = sigma
+
+    def _inverse(self, fraction):
+        fraction = min(max(fraction, _MIN_PROBABILITY), _MAX_PROBABILITY)
+        return math.exp(
+            self.mu + (self.sigma * _standard_normal_ppf(fraction)))
+
+    def _inverse_array(self, fractions):
+        numpy = _import_numpy()
+        fractions = numpy.clip(numpy.asarray(fractions, dtype=float),
+                               _MIN_PROBABILITY, _MAX_PROBABILITY)
+        return numpy.exp(
+            self.mu + (self.sigma * _standard_normal_ppf_array(fractions)))
+
+
+class Pareto(ContinuousDistribution):
+    """
+    A Pareto distribution, a heavy-tailed power law starting at ``scale``.
+
+    Example:
+        >>> distribution = Pareto(3)
+        >>> distribution.sample()                              # doctest: +SKIP
+        1.1407569376282542
+    """
+
+    def __init__(self, alpha, scale=1):
+        """
+        Args:
+            alpha (float): The shape of the distribution. Lower values
+                give heavier tails.
+            scale (float): The lowest possible outcome
+
+        Raises:
+            ValueError: if ``alpha <= 0`` or ``scale <= 0``
+        """
+        if alpha <= 0:
+            raise ValueError('alpha must be greater than 0')
+        if scale <= 0:
+            raise ValueError('scale must be greater than 0')
+        self.alpha = alpha
+        self.scale = scale
+
+    def _inverse(self, fraction):
+        fraction = min(fraction, _MAX_PROBABILITY)
+        return self.scale * ((1 - fraction) ** (-1 / self.alpha))
+
+    def _inverse_array(self, fractions):
+        numpy = _import_numpy()
+        fractions = numpy.minimum(numpy.asarray(fractions, dtype=float),
+                                  _MAX_PROBABILITY)
+        return self.scale * numpy.power(1 - fractions, -1 / self.alpha)
+
+
+class Beta(ContinuousDistribution):
+    """
+    A beta distribution between ``0`` and ``1``.
+
+    The beta distribution has no closed-form inverse cumulative
+    distribution function, so values are drawn as a ratio of two gamma
+    variates instead, each found with the method of Marsaglia and Tsang.
+    ``ppf()`` inverts the regularized incomplete beta function
+    numerically.
+
+    Example:
+        >>> distribution = Beta(2, 5)
+        >>> distribution.sample()                              # doctest: +SKIP
+        0.2204627138372731
+    """
+
+    def __init__(self, alpha, beta):
+        """
+        Args:
+            alpha (float): The first shape parameter
+            beta (float): The second shape parameter
+
+        Raises:
+            ValueError: if ``alpha <= 0`` or ``beta <= 0``
+        """
+        if alpha <= 0 or beta <= 0:
+            raise ValueError('alpha and beta must be greater than 0')
+        self.alpha = alpha
+        self.beta = beta
+        self._log_beta = (math.lgamma(alpha) + math.lgamma(beta) -
+                          math.lgamma(alpha + beta))
+
+    def _cdf(self, x):
+        """Find the regularized incomplete beta function at ``x``."""
+        if x <= 0:
+            return 0.0
+        if x >= 1:
+            return 1.0
+        front = math.exp((self.alpha * math.log(x)) +
+                         (self.beta * math.log1p(-x)) - self._log_beta)
+        # The continued fraction converges quickly below this point, and
+        # above it the complement of the mirrored distribution is used
+        if x < (self.alpha + 1) / (self.alpha + self.beta + 2):
+            return (front * _incomplete_beta_fraction(x, self.alpha,
+                                                      self.beta) /
+                    self.alpha)
+        return 1 - (front * _incomplete_beta_fraction(1 - x, self.beta,
+                                                      self.alpha) /
+                    self.beta)
+
+    def _inverse(self, fraction):
+        """
+        Invert ``_cdf()`` with Newton's method, guarded by bisection.
+
+        The search starts from the approximate inverse of whichever tail
+        ``fraction`` falls in, where the density is close to a power of
+        ``x`` or ``1 - x``. Newton steps which leave the interval known to
+        hold the result are replaced by bisecting it.
+        """
+        if fraction <= 0:
+            return 0.0
+        if fraction >= 1:
+            return 1.0
+        low, high = 0.0, 1.0
+        mean = self.alpha / (self.alpha + self.beta)
+        if fraction < self._cdf(mean):
+            high = mean
+            x = min(math.exp((math.log(fraction * self.alpha) +
+                              self._log_beta) / self.alpha), mean)
+        else:
+            low = mean
+            x = max(1 - math.exp((math.log((1 - fraction) * self.beta) +
+                                  self._log_beta) / self.beta), mean)
+        if not 0 < x < 1:
+            return x
+        for i in range(_MAX_INVERSE_STEPS):
+            error = self._cdf(x) - fraction
+            if error == 0:
+                return x
+            if error < 0:
+                low = x
+            else:
+                high = x
+            density = math.exp(((self.alpha - 1) * math.log(x)) +
+                               ((self.beta - 1) * math.log1p(-x)) -
+                               self._log_beta)
+            step = x - (error / density) if density > 0 else low
+            if not low < step < high:
+                step = (low + high) / 2
+            if abs(step - x) <= _INVERSE_TOLERANCE * x:
+                return step
+            x = step
+        return x
+
+    def _cdf_array(self, x):
+        """Vectorized version of ``_cdf()`` over a NumPy array."""
+        numpy = _import_numpy()
+        x = numpy.asarray(x, dtype=float)
+        inside = (x > 0) & (x < 1)
+        points = numpy.where(inside, x, 0.5)
+        mirrored = points >= ((self.alpha + 1) /
+                              (self.alpha + self.beta + 2))
+        a = numpy.where(mirrored, self.beta, self.alpha)
+        b = numpy.where(mirrored, self.alpha, self.beta)
+        front = numpy.exp((self.alpha * numpy.log(points)) +
+                          (self.beta * numpy.log1p(-points)) -
+                          self._log_beta)
+        part = front * _incomplete_beta_fraction_array(
+            numpy.where(mirrored, 1 - points, points), a, b) / a
+        results = numpy.where(mirrored, 1 - part, part)
+        return numpy.where(inside, results, numpy.where(x <= 0, 0.0, 1.0))
+
+    def _inverse_array(self, fractions):
+        """
+        Vectorized version of ``_inverse()`` over a NumPy array.
+
+        Every fraction takes the same Newton and bisection steps as in
+        ``_inverse()``, all advanced together until each has converged.
+        """
+        numpy = _import_numpy()
+        fractions = numpy.asarray(fractions, dtype=float)
+        inside = (fractions > 0) & (fractions < 1)
+        targets = numpy.where(inside, fractions, 0.5)
+        mean = self.alpha / (self.alpha + self.beta)
+        below = targets < self._cdf(mean)
+        with numpy.errstate(divide='ignore', over='ignore',
+                            invalid='ignore'):
+            x = numpy.where(
+                below,
+                numpy.minimum(numpy.exp(
+                    (numpy.log(targets * self.alpha) + self._log_beta) /
+                    self.alpha), mean),
+                numpy.maximum(1 - numpy.exp(
+                    (numpy.log((1 - targets) * self.beta) +
+                     self._log_beta) / self.beta), mean))
+            low = numpy.where(below, 0.0, mean)
+            high = numpy.where(below, mean, 1.0)
+            active = inside & (x > 0) & (x < 1)
+            for i in range(_MAX_INVERSE_STEPS):
+                indices = numpy.flatnonzero(active)
+                if not indices.size:
+                    break
+                points = x[indices]
+                errors = self._cdf_array(points) - targets[indices]
+                lows = numpy.where(errors < 0, points, low[indices])
+                highs = numpy.where(errors > 0, points, high[indices])
+                densities = numpy.exp(
+                    ((self.alpha - 1) * numpy.log(points)) +
+                    ((self.beta - 1) * numpy.log1p(-points)) -
+                    self._log_beta)
+                steps = points - (errors / densities)
+                steps = numpy.where(
+                    (densities > 0) & (lows < steps) & (steps < highs),
+                    steps, (lows + highs) / 2)
+                steps = numpy.where(errors == 0, points, steps)
+                done = ((errors == 0) |
+                        (numpy.abs(steps - points) <=
+                         _INVERSE_TOLERANCE * points))
+                x[indices] = steps
+                low[indices] = lows
+                high[indices] = highs
+                active[indices[done]] = False
+        return numpy.where(inside, x,
+                           numpy.where(fractions <= 0, 0.0, 1.0))
+
+    def sample(self, rng=None):
+        """
+        Draw a value from the distribution.
+
+        Args:
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            float
+        """
+        # Small shapes give gamma variates too small for a float, so
+        # their ratio is found from their logarithms
+        difference = (_log_gamma_variate(self.beta, rng) -
+                      _log_gamma_variate(self.alpha, rng))
+        if difference > 0:
+            ratio = math.exp(-difference)
+            return ratio / (1 + ratio)
+        return 1 / (1 + math.exp(difference))
+
+    def sample_many(self, count, rng=None):
+        """
+        Draw many values from the distribution at once.
+
+        If NumPy is installed, the values are drawn from a NumPy
+        ``Generator``. Otherwise, or if ``rng`` draws its own arrays of
+        values like ``counter.CounterRandom``, they are drawn one at a
+        time with ``sample()``.
+
+        Args:
+            count (int): The number of values to draw
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            numpy.ndarray: ``count`` values
+
+            list: ``count`` values if NumPy is not installed
+        """
+        numpy = _get_numpy()
+        if numpy is None:
+            return [self.sample(rng) for i in range(count)]
+        if is_random_stream(rng):
+            return numpy.array([self.sample(rng) for i in range(count)])
+        return numpy_generator(rng).beta(self.alpha, self.beta, count)
+
+
+def _incomplete_beta_fraction(x, a, b):
+    """
+    Evaluate the continued fraction of the incomplete beta function.
+
+    Uses the modified Lentz method, as described in Numerical Recipes.
+    Converges quickly for ``x < (a + 1) / (a + b + 2)``.
+
+    Returns:
+        float
+    """
+    tiny = 1e-300
+    c = 1.0
+    d = 1 - ((a + b) * x / (a + 1))
+    d = 1 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, _MAX_INVERSE_STEPS + 1):
+        # Every step of the fraction has an even and an odd term
+        for numerator in (m * (b - m) * x / ((a + (2 * m) - 1) *
+                                             (a + (2 * m))),
+                          -(a + m) * (a + b + m) * x / ((a + (2 * m)) *
+                                                        (a + (2 * m) + 1))):
+            d = 1 + (numerator * d)
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + (numerator / c)
+            c = c if abs(c) > tiny else tiny
+            result *= d * c
+        if abs((d * c) - 1) < _INVERSE_TOLERANCE:
+            break
+    return result
+
+
+def _incomplete_beta_fraction_array(x, a, b):
+    """
+    Vectorized version of ``_incomplete_beta_fraction()``.
+
+    Args:
+        x (numpy.ndarray): The points to evaluate the fraction at
+        a (numpy.ndarray): The first shape parameter at every point
+        b (numpy.ndarray): The second shape parameter at every point
+
+    Returns:
+        numpy.ndarray
+    """
+    numpy = _import_numpy()
+    tiny = 1e-300
+
+    def guard(values):
+        return numpy.where(numpy.abs(values) > tiny, values, tiny)
+
+    c = numpy.ones_like(x)
+    d = 1 / guard(1 - ((a + b) * x / (a + 1)))
+    result = d
+    for m in range(1, _MAX_INVERSE_STEPS + 1):
+        for numerator in (m * (b - m) * x / ((a + (2 * m) - 1) *
+                                             (a + (2 * m))),
+                          -(a + m) * (a + b + m) * x / ((a + (2 * m)) *
+                                                        (a + (2 * m) + 1))):
+            d = 1 / guard(1 + (numerator * d))
+            c = guard(1 + (numerator / c))
+            result = result * d * c
+        if (numpy.abs((d * c) - 1) < _INVERSE_TOLERANCE).all():
+            break
+    return result
+
+
+def _log_gamma_variate(shape, rng):
+    """
+    Draw the natural logarithm of a gamma variate with a scale of ``1``.
+
+    Shapes below ``1`` are boosted above ``1``, and the result scaled back
+    down by a uniform roll to the power of ``1 / shape``. For small
+    shapes this factor is too small for a float, so it is applied to
+    the logarithm of the result instead.
+
+    Args:
+        shape (float): The shape of the distribution. Must be positive.
+        rng: A source of randomness. If ``None``,
+            the global ``random`` module is used.
+
+    Returns:
+        float
+    """
+    if shape < 1:
+        roll = max(random_value(rng), _MIN_PROBABILITY)
+        return (_log_gamma_variate(shape + 1, rng) +
+                (math.log(roll) / shape))
+    return math.log(_gamma_variate(shape, rng))
+
+
+def _gamma_variate(shape, rng):
+    """
+    Draw a value from a gamma distribution with a scale of ``1``.
+
+    Uses the method of Marsaglia and Tsang, drawing its normal variates
+    by inverting the normal cumulative distribution function.
+
+    Args:
+        shape (float): The shape of the distribution. Must be at least
+            ``1``; see ``_log_gamma_variate()`` for smaller shapes.
+        rng: A source of randomness. If ``None``,
+            the global ``random`` module is used.
+
+    Returns:
+        float
+    """
+    d = shape - (1 / 3)
+    c = 1 / math.sqrt(9 * d)
+    while True:
+        fraction = min(max(random_value(rng), _MIN_PROBABILITY),
+                       _MAX_PROBABILITY)
+        x = _standard_normal_ppf(fraction)
+        v = (1 + (c * x)) ** 3
+        if v <= 0:
+            continue
+        u = random_value(rng)
+        if u < 1 - (0.0331 * (x ** 4)):
+            return d * v
+        if u > 0 and math.log(u) < ((0.5 * x * x) +
+                                    (d * (1 - v + math.log(v)))):
+            return d * v
@@ -8,9 +8,8 @@ All data and probabilities taken from Wikipedia at:
 """
 
 from __future__ import unicode_literals
-import random
 
-from blur.rand import weighted_choice
+from blur.rand import DiscreteDistribution
 
 __all__ = ['hexagrams', 'get_hexagram']
 
@@ -159,7 +158,22 @@ _hexagram_dict = {
 }
 
 
-def get_hexagram(method='THREE COIN'):
+_method_distributions = {
+    'THREE COIN': DiscreteDistribution([('MOVING YANG', 2),
+                                        ('MOVING YIN',  2),
+                                        ('STATIC YANG', 6),
+                                        ('STATIC YIN',  6)]),
+    'YARROW': DiscreteDistribution([('MOVING YANG', 8),
+                                    ('MOVING YIN',  2),
+                                    ('STATIC YANG', 11),
+                                    ('STATIC YIN',  17)]),
+}
+
+_naive_distribution = DiscreteDistribution(
+    [(number, 1) for number in range(1, 65)])
+
+
+def get_hexagram(method='THREE COIN', rng=None):
     """
     Return one or two hexagrams using any of a variety of divination methods.
 
@@ -179,6 +193,9 @@ def get_hexagram(method='THREE COIN'):
             yarrow methods are not actually literally simulated,
             but rather statistical models reflecting the methods are passed
             to `blur.rand` functions to accurately approximate them.
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
 
     Returns:
         int: If ``method == 'NAIVE'``, the ``int`` key of the found hexagram.
@@ -221,18 +238,10 @@ def get_hexagram(method='THREE COIN'):
         ...     )                                              # doctest: +SKIP
         Confining moving to Augmenting
     """
-    if method == 'THREE COIN':
-        weights = [('MOVING YANG', 2),
-                   ('MOVING YIN',  2),
-                   ('STATIC YANG', 6),
-                   ('STATIC YIN',  6)]
-    elif method == 'YARROW':
-        weights = [('MOVING YANG', 8),
-                   ('MOVING YIN',  2),
-                   ('STATIC YANG', 11),
-                   ('STATIC YIN',  17)]
-    elif method == 'NAIVE':
-        return random.randint(1, 64)
+    if method == 'NAIVE':
+        return _naive_distribution.sample(rng=rng)
+    elif method in _method_distributions:
+        distribution = _method_distributions[method]
     else:
         raise ValueError('`method` value of "{}" is invalid')
 
@@ -240,7 +249,7 @@ def get_hexagram(method='THREE COIN'):
     hexagram_2 = []
 
     for i in range(6):
-        roll = weighted_choice(weights)
+        roll = distribution.sample(rng=rng)
         if roll == 'MOVING YANG':
             hexagram_1.append(1)
             hexagram_2.append(0)
@@ -12,10 +12,10 @@
 """
 
 from __future__ import division
-import random
 import re
 
-from blur.rand import weighted_choice, weighted_rand
+from blur.rand import (weighted_choice, weighted_rand, WeightArrays,
+                       random_item, uniform_value)
 from blur.markov.node import Node
 
 
@@ -29,12 +29,15 @@ class Graph:
     Several utilities offer conveniences for managing the network.
     """
 
-    def __init__(self, node_list=None):
+    def __init__(self, node_list=None, rng=None):
         """
         Args:
             node_list (list): An optional list of nodes to
                 populate the network with. To populate the network after
                 initialization, use the ``Graph.add_nodes()`` method.
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
 
         Warning:
             Nodes are not copied when placed into the graph:
@@ -45,6 +48,7 @@ class Graph:
         """
         self.current_node = None
         self.node_list = []
+        self.rng = rng
         if node_list:
             self.add_nodes(node_list)
 
@@ -246,10 +250,11 @@ class Graph:
         for node in self.node_list:
             for link in node.link_list:
                 if noise_weights is not None:
-                    noise_amount = round(weighted_rand(noise_weights), 3)
+                    noise_amount = round(
+                        weighted_rand(noise_weights, rng=self.rng), 3)
                 else:
-                    noise_amount = round(random.uniform(
-                        0, link.weight * uniform_amount), 3)
+                    noise_amount = round(uniform_value(
+                        0, link.weight * uniform_amount, self.rng), 3)
                 link.weight += noise_amount
 
     def find_node_by_value(self, value):
@@ -373,6 +378,9 @@ class Graph:
 
         Returns: Node
 
+        Raises:
+            ValueError: if the node to pick from has no links
+
         Example:
             >>> from blur.markov.node import Node
             >>> node_1 = Node('One')
@@ -386,14 +394,16 @@ class Graph:
         """
         if starting_node is None:
             if self.current_node is None:
-                random_node = random.choice(self.node_list)
+                random_node = random_item(self.node_list, self.rng)
                 self.current_node = random_node
                 return random_node
             else:
                 starting_node = self.current_node
-        # Use weighted_choice on start_node.link_list
+        links = starting_node.link_list
         self.current_node = weighted_choice(
-            [(link.target, link.weight) for link in starting_node.link_list])
+            WeightArrays([link.target for link in links],
+                         [link.weight for link in links]),
+            rng=self.rng)
         return self.current_node
 
     @classmethod
@@ -402,7 +412,8 @@ class Graph:
                     distance_weights=None,
                     merge_same_words=False,
                     group_marker_opening='<<',
-                    group_marker_closing='>>'):
+                    group_marker_closing='>>',
+                    rng=None):
         """
         Read a string and derive of ``Graph`` from it.
 
@@ -454,6 +465,9 @@ class Graph:
                 of word groups. It is strongly recommended that this be
                 different than ``group_marker_opening`` to prevent unexpected
                 behavior with the regex pattern.
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness for the graph to use instead of the
+                global ``random`` module.
 
         Returns: Graph
 
@@ -516,7 +530,7 @@ class Graph:
                     wrapped_index = (key + i) % len(temp_node_list)
                     node.add_link(temp_node_list[wrapped_index], weight)
 
-        graph = cls()
+        graph = cls(rng=rng)
         graph.add_nodes(temp_node_list)
         return graph
 
@@ -526,7 +540,8 @@ class Graph:
                   distance_weights=None,
                   merge_same_words=False,
                   group_marker_opening='<<',
-                  group_marker_closing='>>'):
+                  group_marker_closing='>>',
+                  rng=None):
         """
         Read a string from a file and derive a ``Graph`` from it.
 
@@ -543,6 +558,9 @@ class Graph:
                 of word groups.
             group_marker_closing (str): The string used to mark the end
                 of word groups.
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness for the graph to use instead of the
+                global ``random`` module.
 
         Returns: Graph
 
@@ -556,4 +574,5 @@ class Graph:
                                distance_weights,
                                merge_same_words,
                                group_marker_opening=group_marker_opening,
-                               group_marker_closing=group_marker_closing)
+                               group_marker_closing=group_marker_closing,
+                               rng=rng)
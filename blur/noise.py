@@ -0,0 +1,287 @@
+"""
+Smooth noise for values which should drift rather than jump.
+
+Noise maps coordinates in 1, 2 or 3 dimensions to values between about
+``-1`` and ``1`` which change smoothly as the coordinates change. Nearby
+coordinates give similar values, while coordinates far apart are
+unrelated. Every noise object is seeded once, after which the same
+coordinates always give the same value.
+
+Coordinates may be single numbers or NumPy arrays of any shape, which are
+evaluated together in a single vectorized pass:
+
+>>> noise = GradientNoise(seed=3)
+>>> noise(0.5)
+0.1458428604087454
+>>> import numpy                                     # doctest: +REQUIRES_NUMPY
+>>> noise(numpy.linspace(0, 2, 5))                   # doctest: +REQUIRES_NUMPY
+array([0.        , 0.14584286, 0.        , 0.29006624, 0.        ])
+>>> noise(x=numpy.arange(3), y=0.5, z=7.25)          # doctest: +REQUIRES_NUMPY
+array([ 0.27587891, -0.22412109, -0.02587891])
+
+To draw smoothly drifting values from noise, see ``soft.SoftNoise``.
+"""
+
+from __future__ import division
+import itertools
+import math
+
+from blur.rand import _import_numpy, random_seed
+
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+# Multipliers of the splitmix64 finalizer
+_MIX_1 = 0xBF58476D1CE4E5B9
+_MIX_2 = 0x94D049BB133111EB
+
+# Gradient directions for 2-dimensional noise: the axes and diagonals
+_DIAGONAL = math.sqrt(0.5)
+_GRADIENTS_2D = ((1, 0), (-1, 0), (0, 1), (0, -1),
+                 (_DIAGONAL, _DIAGONAL), (-_DIAGONAL, _DIAGONAL),
+                 (_DIAGONAL, -_DIAGONAL), (-_DIAGONAL, -_DIAGONAL))
+# Gradient directions for 3-dimensional noise: the edges of a cube
+_GRADIENTS_3D = ((1, 1, 0), (-1, 1, 0), (1, -1, 0), (-1, -1, 0),
+                 (1, 0, 1), (-1, 0, 1), (1, 0, -1), (-1, 0, -1),
+                 (0, 1, 1), (0, -1, 1), (0, 1, -1), (0, -1, -1))
+
+
+def _mix(value):
+    """Scramble a 64-bit ``int`` with the splitmix64 finalizer."""
+    value = ((value ^ (value >> 30)) * _MIX_1) & _MASK_64
+    value = ((value ^ (value >> 27)) * _MIX_2) & _MASK_64
+    return value ^ (value >> 31)
+
+
+def _mix_array(values):
+    """Vectorized version of ``_mix()`` over a ``uint64`` NumPy array."""
+    numpy = _import_numpy()
+    values = (values ^ (values >> numpy.uint64(30))) * numpy.uint64(_MIX_1)
+    values = (values ^ (values >> numpy.uint64(27))) * numpy.uint64(_MIX_2)
+    return values ^ (values >> numpy.uint64(31))
+
+
+def _fade(t):
+    """Ease a fraction between ``0`` and ``1`` with a quintic curve."""
+    return t * t * t * ((t * ((t * 6) - 15)) + 10)
+
+
+class Noise(object):
+    """
+    An abstract base class for smooth noise.
+
+    Direct instances of ``Noise`` should not be created; instead, the
+    appropriate subclass should be used.
+
+    Noise is built on a grid of points one unit apart, each holding a
+    random value or gradient picked by hashing its position with the
+    noise's seed. Values between the points are blended with a smooth
+    curve. Several layers, or octaves, of noise may be added together,
+    each twice the frequency and half the strength of the one before,
+    for noise with finer detail.
+
+    Subclasses implement ``_corner()`` and ``_corner_array()``, giving
+    the contribution of a grid point to a nearby position.
+    """
+
+    def __init__(self, seed=None, frequency=1, octaves=1, rng=None):
+        """
+        Args:
+            seed (int): The seed of the noise. If ``None``, a seed is
+                rolled from ``rng``.
+            frequency (float): How quickly the noise changes. The grid
+                points of the first octave are ``1 / frequency`` apart.
+            octaves (int): The number of layers of noise to add together
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to roll the seed from instead of the
+                global ``random`` module.
+
+        Raises:
+            ValueError: if ``octaves < 1``
+        """
+        if octaves < 1:
+            raise ValueError('octaves must be at least 1')
+        if seed is None:
+            seed = random_seed(rng)
+        self.seed = seed
+        self.frequency = frequency
+        self.octaves = octaves
+        self._octave_seeds = [_mix((seed + octave) & _MASK_64)
+                              for octave in range(octaves)]
+
+    def __call__(self, x, y=None, z=None):
+        """
+        Evaluate the noise at given coordinates.
+
+        Giving only ``x`` evaluates 1-dimensional noise, giving ``x`` and
+        ``y`` evaluates 2-dimensional noise, and giving all three evaluates
+        3-dimensional noise. Arrays of coordinates are broadcast together.
+
+        Args:
+            x (float or numpy.ndarray): The first coordinates
+            y (float or numpy.ndarray): The second coordinates, if any
+            z (float or numpy.ndarray): The third coordinates, if any
+
+        Returns:
+            float: The noise at a single position, between about
+            ``-1`` and ``1``
+
+            numpy.ndarray: The noise at every position if any coordinates
+            are sequences
+
+        Raises:
+            ValueError: if ``z`` is given without ``y``
+        """
+        if z is not None and y is None:
+            raise ValueError('z cannot be given without y')
+        coordinates = [c for c in (x, y, z) if c is not None]
+        if any(isinstance(c, (list, tuple)) or getattr(c, 'ndim', 0) > 0
+               for c in coordinates):
+            numpy = _import_numpy()
+            coordinates = numpy.broadcast_arrays(
+                *[numpy.asarray(c, dtype=float) for c in coordinates])
+            octave_noise = self._octave_array
+        else:
+            coordinates = [float(c) for c in coordinates]
+            octave_noise = self._octave
+        total = 0
+        strength = 1
+        total_strength = 0
+        frequency = self.frequency
+        for seed in self._octave_seeds:
+            total = total + (strength * octave_noise(
+                seed, [c * frequency for c in coordinates]))
+            total_strength += strength
+            strength /= 2
+            frequency *= 2
+        return total / total_strength
+
+    def _octave(self, seed, coordinates):
+        """Evaluate one octave of noise at a single position."""
+        cells = [int(math.floor(c)) for c in coordinates]
+        offsets = [c - cell for c, cell in zip(coordinates, cells)]
+        fades = [_fade(offset) for offset in offsets]
+        result = 0
+        for corner in itertools.product((0, 1), repeat=len(cells)):
+            value = seed
+            weight = 1
+            for cell, bit, fade in zip(cells, corner, fades):
+                value = _mix(value ^ ((cell + bit) & _MASK_64))
+                weight *= fade if bit else 1 - fade
+            result += weight * self._corner(
+                value, [offset - bit for offset, bit in zip(offsets, corner)])
+        return result
+
+    def _octave_array(self, seed, coordinates):
+        """Vectorized version of ``_octave()`` over NumPy arrays."""
+        numpy = _import_numpy()
+        floors = [numpy.floor(c) for c in coordinates]
+        cells = [floor.astype(numpy.int64).view(numpy.uint64)
+                 for floor in floors]
+        offsets = [c - floor for c, floor in zip(coordinates, floors)]
+        fades = [_fade(offset) for offset in offsets]
+        result = 0
+        for corner in itertools.product((0, 1), repeat=len(cells)):
+            value = numpy.uint64(seed)
+            weight = 1
+            for cell, bit, fade in zip(cells, corner, fades):
+                value = _mix_array(value ^ (cell + numpy.uint64(bit)))
+                weight = weight * (fade if bit else 1 - fade)
+            result = result + (weight * self._corner_array(
+                value, [offset - bit for offset, bit in zip(offsets, corner)]))
+        return result
+
+    def _corner(self, value, offsets):
+        """
+        Find the contribution of a grid point to a nearby position.
+
+        This is an abstract method and should not be called. Subclasses of
+        ``Noise`` must override and implement this.
+
+        Args:
+            value (int): The 64-bit hash of the grid point
+            offsets (list(float)): The offset of the position
+                from the grid point along each axis
+
+        Returns:
+            float
+        """
+        raise NotImplementedError
+
+    def _corner_array(self, values, offsets):
+        """
+        Vectorized version of ``_corner()`` over NumPy arrays.
+
+        This is an abstract method and should not be called. Subclasses of
+        ``Noise`` must override and implement this.
+        """
+        raise NotImplementedError
+
+
+class ValueNoise(Noise):
+    """
+    Noise blending random values held at every grid point.
+
+    Value noise passes through a random value at every grid point,
+    which makes it blockier than ``GradientNoise``, but cheaper.
+
+    Example:
+        >>> noise = ValueNoise(seed=1, frequency=0.5)
+        >>> noise(1.25)
+        0.010828277120296055
+    """
+
+    def _corner(self, value, offsets):
+        return ((value >> 11) / 4503599627370496) - 1
+
+    def _corner_array(self, values, offsets):
+        numpy = _import_numpy()
+        return ((values >> numpy.uint64(11)).astype(float) /
+                4503599627370496) - 1
+
+
+class GradientNoise(Noise):
+    """
+    Noise blending random slopes held at every grid point.
+
+    Gradient noise, in the style of Ken Perlin's noise, is ``0`` at
+    every grid point and rises or falls away from it along a random
+    direction, giving smoother and more natural looking noise
+    than ``ValueNoise``.
+
+    Example:
+        >>> noise = GradientNoise(seed=1, octaves=3)
+        >>> noise(1.25, 0.5)
+        0.11383724270544485
+    """
+
+    # Scales bringing the noise of each dimension to about -1 to 1
+    _SCALES = (2, math.sqrt(2), 1)
+
+    def _corner(self, value, offsets):
+        if len(offsets) == 1:
+            slope = ((value >> 11) / 4503599627370496) - 1
+            return self._SCALES[0] * slope * offsets[0]
+        elif len(offsets) == 2:
+            gradient = _GRADIENTS_2D[value >> 61]
+        else:
+            gradient = _GRADIENTS_3D[value % 12]
+        dot = 0
+        for component, offset in zip(gradient, offsets):
+            dot += component * offset
+        return self._SCALES[len(offsets) - 1] * dot
+
+    def _corner_array(self, values, offsets):
+        numpy = _import_numpy()
+        if len(offsets) == 1:
+            slopes = ((values >> numpy.uint64(11)).astype(float) /
+                      4503599627370496) - 1
+            return self._SCALES[0] * slopes * offsets[0]
+        elif len(offsets) == 2:
+            gradients = numpy.array(_GRADIENTS_2D).take(
+                (values >> numpy.uint64(61)).astype(numpy.intp), axis=0)
+        else:
+            gradients = numpy.array(_GRADIENTS_3D, dtype=float).take(
+                (values % numpy.uint64(12)).astype(numpy.intp), axis=0)
+        dot = 0
+        for axis, offset in enumerate(offsets):
+            dot = dot + (gradients[..., axis] * offset)
+        return self._SCALES[len(offsets) - 1] * dot
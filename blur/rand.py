@@ -8,9 +8,67 @@ or any type depending on the function.
 
 # Python 2/3 compatibility
 from __future__ import division
+import bisect
+import heapq
+import numbers
 import random
 import math
 import warnings
+from collections import OrderedDict
+
+# The number of values computed at a time in batch operations
+_BATCH_BLOCK_SIZE = 16384
+
+# The smallest and largest probabilities passed to inverse
+# cumulative distribution functions, keeping them finite
+_MIN_PROBABILITY = 1e-300
+_MAX_PROBABILITY = 1 - 2 ** -53
+
+# Coefficients of the rational approximations to the inverse of the
+# standard normal cumulative distribution function, from highest to lowest
+# order, in Wichura's algorithm AS241 (Applied Statistics, 1988, 37(3)).
+_AS241_CENTRAL = (
+    (2.5090809287301226727e+3, 3.3430575583588128105e+4,
+     6.7265770927008700853e+4, 4.5921953931549871457e+4,
+     1.3731693765509461125e+4, 1.9715909503065514427e+3,
+     1.3314166789178437745e+2, 3.3871328727963666080e+0),
+    (5.2264952788528545610e+3, 2.8729085735721942674e+4,
+     3.9307895800092710610e+4, 2.1213794301586595867e+4,
+     5.3941960214247511077e+3, 6.8718700749205790830e+2,
+     4.2313330701600911252e+1, 1.0))
+_AS241_INTERMEDIATE = (
+    (7.7454501427834140764e-4, 2.2723844989269184583e-2,
+     2.4178072517745061177e-1, 1.2704582524523683826e+0,
+     3.6478483247632045405e+0, 5.7694972214606914055e+0,
+     4.6303378461565452959e+0, 1.4234371107496835773e+0),
+    (1.0507500716444168432e-9, 5.4759380849953449460e-4,
+     1.5198666563616457197e-2, 1.4810397642748007459e-1,
+     6.8976733498510000455e-1, 1.6763848301838038494e+0,
+     2.0531916266377588219e+0, 1.0))
+_AS241_TAIL = (
+    (2.0103343992922881327e-7, 2.7115555687434875782e-5,
+     1.2426609473880784386e-3, 2.6532189526576123093e-2,
+     2.9656057182850489123e-1, 1.7848265399172913358e+0,
+     5.4637849111641143699e+0, 6.6579046435011037772e+0),
+    (2.0442631033899397856e-15, 1.4215117583164458887e-7,
+     1.8463183175100546818e-5, 7.8686913114561325910e-4,
+     1.4875361290850614853e-2, 1.3692988092273580531e-1,
+     5.9983220655588793769e-1, 1.0))
+
+# The widest weight curve, in integers, whose rounded outcomes are
+# compiled into a table rather than rounded one draw at a time
+_MAX_ROUNDED_WIDTH = 65536
+
+# The fewest options weighted_choice() keeps a compiled table for;
+# scanning fewer options costs about as much as looking up their table
+_MIN_CACHED_CHOICES = 100
+
+# Marks the outcomes of options removed from a DynamicDistribution
+_REMOVED = object()
+
+# The NumPy module, imported on first use by batch operations.
+# ``None`` until then, and ``False`` if NumPy is not installed.
+_numpy = None
 
 
 ###############################################################################
@@ -21,13 +79,468 @@ class ProbabilityUndefinedError(Exception):
     pass
 
 
+###############################################################################
+#   Sources of randomness
+###############################################################################
+def random_value(rng=None):
+    """
+    Roll a uniformly random ``float`` in ``[0, 1)`` from ``rng``.
+
+    Everything in blur draws its randomness through this function, so any
+    object with a ``random()`` method returning a float in ``[0, 1)`` can
+    be used as the ``rng`` of any function in blur. This includes
+    ``random.Random``, ``counter.CounterRandom``, and NumPy's ``Generator``
+    and ``RandomState``. The other functions in this section build on it.
+
+    Args:
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        float
+
+    Example:
+        >>> 0 <= random_value(random.Random(1)) < 1
+        True
+    """
+    if rng is None:
+        return random.random()
+    return rng.random()
+
+
+def uniform_value(minimum, maximum, rng=None):
+    """
+    Roll a uniformly random ``float`` between two values from ``rng``.
+
+    Args:
+        minimum (float): The lowest value to roll
+        maximum (float): The highest value to roll
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        float
+    """
+    return minimum + ((maximum - minimum) * random_value(rng))
+
+
+def random_int(minimum, maximum, rng=None):
+    """
+    Roll a uniformly random ``int`` in ``[minimum, maximum]`` from ``rng``.
+
+    Args:
+        minimum (int): The lowest value to roll
+        maximum (int): The highest value to roll
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        int
+    """
+    span = maximum - minimum
+    return minimum + min(int(random_value(rng) * (span + 1)), span)
+
+
+def random_item(sequence, rng=None):
+    """
+    Pick a uniformly random item from a non-empty sequence with ``rng``.
+
+    Args:
+        sequence (list): The items to pick from
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        Any: One of the items in ``sequence``
+    """
+    return sequence[random_int(0, len(sequence) - 1, rng)]
+
+
+def random_seed(rng=None):
+    """
+    Roll a random ``int`` seed from ``rng`` for seeding other generators.
+
+    Args:
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        int: A seed of up to 64 bits
+    """
+    if rng is None:
+        return random.getrandbits(64)
+    elif hasattr(rng, 'getrandbits'):
+        return rng.getrandbits(64)
+    else:
+        return int(random_value(rng) * (2 ** 53))
+
+
+def is_random_stream(rng):
+    """
+    Check whether ``rng`` can draw arrays of values itself.
+
+    Sources of randomness with a ``random_many(count)`` method, such as
+    ``counter.CounterRandom``, have batches drawn from them directly
+    instead of through a NumPy ``Generator`` seeded from them. Batch
+    operations then draw exactly one value from them for every result,
+    so a batch gives the same results however it is split up.
+
+    Args:
+        rng: A source of randomness, or ``None``
+
+    Returns:
+        bool
+    """
+    return hasattr(rng, 'random_many')
+
+
+def numpy_generator(rng=None):
+    """
+    Get a NumPy ``Generator`` drawing from ``rng``.
+
+    NumPy ``Generator`` objects are used directly. Any other source
+    of randomness, including the global ``random`` module when ``rng`` is
+    ``None``, seeds a new ``Generator`` with ``random_seed()``. This keeps
+    batch draws reproducible with ``random.seed()``, the same as every
+    other function in ``rand``.
+
+    Args:
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        numpy.random.Generator
+
+    Raises:
+        ImportError: if NumPy is not installed
+    """
+    numpy = _import_numpy()
+    if isinstance(rng, numpy.random.Generator):
+        return rng
+    return numpy.random.default_rng(random_seed(rng))
+
+
 ###############################################################################
 #   Private utility functions
 ###############################################################################
+def _get_numpy():
+    """
+    Get the NumPy module if it is installed, importing it on first use.
+
+    blur has no required dependencies. When NumPy is available, batch
+    operations use it to draw from a NumPy ``Generator`` in vectorized
+    passes, and otherwise fall back on the pure Python implementations.
+    NumPy is never imported just by importing blur.
+
+    Returns:
+        module: The ``numpy`` module, or ``None`` if it is not installed
+    """
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def _import_numpy():
+    """
+    Get the NumPy module for operations which cannot work without it.
+
+    Raises:
+        ImportError: if NumPy is not installed
+    """
+    numpy = _get_numpy()
+    if numpy is None:
+        raise ImportError('NumPy is required for this operation in blur. '
+                          'Install it with `pip install numpy`.')
+    return numpy
+
+
+def _rng_expovariate(rng, rate):
+    """Roll an exponentially distributed ``float`` with rate ``rate``."""
+    return -math.log(1 - random_value(rng)) / rate
+
+
+class _LRUCache(object):
+    """
+    A bounded mapping which discards its least recently used items.
+
+    Attributes:
+        maxsize (int): The most items the cache will hold
+        placeholder (Any): A value marking keys which have been seen,
+            but hold nothing useful yet. Finding it counts as a miss.
+        hits (int): The number of lookups which found a value
+        misses (int): The number of lookups which did not
+    """
+
+    def __init__(self, maxsize, placeholder=None):
+        self.maxsize = maxsize
+        self.placeholder = placeholder
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        """
+        Look up ``key``, marking it as the most recently used.
+
+        Returns:
+            Any: The cached value, which may be ``placeholder``,
+            or ``None`` if ``key`` is not cached
+        """
+        value = self._items.pop(key, None)
+        if value is None:
+            self.misses += 1
+            return None
+        if value is self.placeholder:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._items[key] = value
+        return value
+
+    def put(self, key, value):
+        """Cache ``value`` under ``key``, evicting old items if needed."""
+        self._items.pop(key, None)
+        self._items[key] = value
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def resize(self, maxsize):
+        """Change ``maxsize``, evicting old items if needed."""
+        self.maxsize = maxsize
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        """Remove every item and reset the hit and miss counts."""
+        self._items.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def _weight_columns(weights):
+    """
+    Split weights into a sequence of outcomes and a sequence of strengths.
+
+    The sequences of a ``WeightArrays`` are returned as-is.
+
+    Args:
+        weights (list or WeightArrays): The weights to split
+
+    Returns:
+        tuple: The outcomes and strengths of ``weights``
+    """
+    if isinstance(weights, WeightArrays):
+        return weights.outcomes, weights.strengths
+    return [w[0] for w in weights], [w[1] for w in weights]
+
+
+def _column_key(column):
+    """
+    Build a hashable key from the content of a sequence of values.
+
+    Numerical NumPy arrays are keyed on their raw bytes, which is much
+    faster than building a tuple of their values.
+    """
+    dtype = getattr(column, 'dtype', None)
+    if dtype is not None and dtype.kind in 'biuf':
+        return (dtype.str, column.shape, column.tobytes())
+    return tuple(column)
+
+
+def _map_values(values, function, array_function):
+    """
+    Apply a function to a single value or to a sequence of values.
+
+    Lists, tuples and NumPy arrays are passed to ``array_function`` as a
+    NumPy array if NumPy is installed, and otherwise passed to ``function``
+    one value at a time.
+
+    Args:
+        values (Any or list or tuple or numpy.ndarray): The values
+        function (callable): The function to apply to a single value
+        array_function (callable): The vectorized counterpart of
+            ``function``, taking and returning a NumPy array
+
+    Returns:
+        Any: ``function(values)`` if ``values`` is a single value
+
+        numpy.ndarray: ``array_function(values)`` if ``values``
+        is a sequence
+
+        list: ``function`` applied to every one of ``values``
+        if NumPy is not installed
+    """
+    if not (isinstance(values, (list, tuple)) or
+            getattr(values, 'ndim', 0) > 0):
+        return function(values)
+    numpy = _get_numpy()
+    if numpy is None:
+        return [function(value) for value in values]
+    return array_function(numpy.asarray(values))
+
+
+def _outcome_array(outcomes):
+    """
+    Convert a list of outcomes to a 1-dimensional NumPy array.
+
+    Outcomes which are already a 1-dimensional array are used as-is.
+    Outcomes which are all ``bool``, all ``int`` or all ``float`` are
+    stored in a native array. Any other outcomes, including tuples and
+    mixtures of types, are kept unchanged in an ``object`` array so
+    that batch draws return the same objects passed in.
+
+    Args:
+        outcomes (list or numpy.ndarray): The outcomes to convert
+
+    Returns:
+        numpy.ndarray: A 1-dimensional array of ``outcomes``
+    """
+    numpy = _import_numpy()
+    if isinstance(outcomes, numpy.ndarray) and outcomes.ndim == 1:
+        return outcomes
+    outcome_types = set(type(outcome) for outcome in outcomes)
+    if len(outcome_types) == 1 and outcome_types <= {bool, int, float}:
+        try:
+            return numpy.asarray(outcomes)
+        except OverflowError:
+            # Integers too large for a native dtype
+            pass
+    array = numpy.empty(len(outcomes), dtype=object)
+    for i, outcome in enumerate(outcomes):
+        array[i] = outcome
+    return array
+
+
+class _CurveInterpolator(object):
+    """
+    A piecewise linear curve compiled for repeated interpolation.
+
+    The start and end ``x`` values, slopes, and ``y`` intercepts of every
+    segment are computed once, so that each query only needs a binary
+    search for its segment.
+
+    Example:
+        >>> interpolator = _CurveInterpolator([(0, 0), (2, 1), (4, 1)])
+        >>> interpolator(0.5)
+        0.25
+        >>> interpolator(3)
+        1
+    """
+
+    def __init__(self, curve):
+        """
+        Args:
+            curve (list[tuple]): A list of ``(x, y)`` points sorted in
+                nondecreasing ``x`` value. Where multiple points have the
+                same ``x`` value, ``x`` is interpolated on the segment
+                ending there.
+        """
+        self._starts = []
+        self._ends = []
+        self._slopes = []
+        self._intercepts = []
+        for (x_a, y_a), (x_b, y_b) in zip(curve, curve[1:]):
+            # Ignore points which share an x value with the following point
+            if x_a == x_b:
+                continue
+            slope = (y_b - y_a) / (x_b - x_a)
+            self._starts.append(x_a)
+            self._ends.append(x_b)
+            self._slopes.append(slope)
+            self._intercepts.append(y_a - (slope * x_a))
+        self._arrays = None
+
+    def __call__(self, test_x, round_result=False):
+        """
+        Find the ``y`` value of the curve at ``test_x``.
+
+        Args:
+            test_x (float): The ``x`` value to find the ``y`` value of
+            round_result (bool): Whether to round the result to the
+                nearest ``int``
+
+        Returns:
+            float or int: The ``y`` value of the curve at ``test_x``,
+            as in ``_linear_interp()``
+
+        Raises:
+            ProbabilityUndefinedError: if ``test_x`` is out of the
+                domain of the curve
+        """
+        if not (self._ends and self._starts[0] <= test_x <= self._ends[-1]):
+            raise ProbabilityUndefinedError
+        # The first segment ending at or after test_x contains it
+        index = bisect.bisect_left(self._ends, test_x)
+        result = (self._slopes[index] * test_x) + self._intercepts[index]
+        if round_result:
+            return int(round(result))
+        elif result.is_integer():
+            return int(result)
+        else:
+            return result
+
+    def interpolate_many(self, test_xs, round_result=False):
+        """
+        Find the ``y`` values of the curve at many ``x`` values at once.
+
+        If NumPy is installed, every value is found in a single
+        vectorized pass.
+
+        Args:
+            test_xs (list or numpy.ndarray): The ``x`` values to find the
+                ``y`` values of
+            round_result (bool): Whether to round the results to the
+                nearest ``int``
+
+        Returns:
+            numpy.ndarray: The ``y`` values of the curve at ``test_xs``
+
+            list: The ``y`` values if NumPy is not installed
+
+        Raises:
+            ProbabilityUndefinedError: if any of ``test_xs`` is out of the
+                domain of the curve
+        """
+        numpy = _get_numpy()
+        if numpy is None:
+            return [self(test_x, round_result) for test_x in test_xs]
+        test_xs = numpy.asarray(test_xs, dtype=float)
+        if not self._ends or not numpy.all(
+                (self._starts[0] <= test_xs) & (test_xs <= self._ends[-1])):
+            raise ProbabilityUndefinedError
+        if self._arrays is None:
+            self._arrays = (numpy.array(self._ends, dtype=float),
+                            numpy.array(self._slopes, dtype=float),
+                            numpy.array(self._intercepts, dtype=float))
+        ends, slopes, intercepts = self._arrays
+        indices = numpy.searchsorted(ends, test_xs, side='left')
+        results = (slopes.take(indices) * test_xs) + intercepts.take(indices)
+        if round_result:
+            return numpy.rint(results).astype(int)
+        else:
+            return results
+
+
 def _linear_interp(curve, test_x, round_result=False):
     """
     Take a series of points and interpolate between them at ``test_x``.
 
+    To interpolate the same curve many times, use a ``_CurveInterpolator``.
+
     Args:
         curve (list[tuple]): A list of ``(x, y)`` points sorted in
             nondecreasing ``x`` value. If multiple points have the same
@@ -53,25 +566,7 @@ def _linear_interp(curve, test_x, round_result=False):
         >>> _linear_interp(curve, 0.5, round_result=True)
         0
     """
-    index = 0
-    for index in range(len(curve) - 1):
-        # Ignore points which share an x value with the following point
-        if curve[index][0] == curve[index + 1][0]:
-            continue
-        if curve[index][0] <= test_x <= curve[index + 1][0]:
-            slope = ((curve[index + 1][1] - curve[index][1]) /
-                     (curve[index + 1][0] - curve[index][0]))
-            y_intercept = curve[index][1] - (slope * curve[index][0])
-            result = (slope * test_x) + y_intercept
-            if round_result:
-                return int(round(result))
-            else:
-                if result.is_integer():
-                    return int(result)
-                else:
-                    return result
-    else:
-        raise ProbabilityUndefinedError
+    return _CurveInterpolator(curve)(test_x, round_result)
 
 
 def _point_under_curve(curve, point):
@@ -161,30 +656,2196 @@ def _normal_function(x, mean, variance):
     return (1 / math.sqrt(2 * variance * math.pi)) * (math.e ** e_power)
 
 
-def _is_valid_options_weights_list(value):
-    '''Check whether ``values`` is a valid argument for ``weighted_choice``.'''
-    return ((isinstance(value, list)) and
-            len(value) > 1 and
-            (all(isinstance(opt, tuple) and
-                 len(opt) == 2 and
-                 isinstance(opt[1], (int, float))
-                 for opt in value)))
+def _polynomial(coefficients, x):
+    """
+    Evaluate a polynomial at ``x`` with Horner's method.
+
+    Works elementwise if ``x`` is a NumPy array.
+
+    Args:
+        coefficients (tuple): The polynomial's coefficients
+            from highest to lowest order
+        x (float or numpy.ndarray): The value to evaluate at
+
+    Example:
+        >>> _polynomial((2, 0, 1), 3)
+        19
+    """
+    result = 0
+    for coefficient in coefficients:
+        result = (result * x) + coefficient
+    return result
+
+
+def _standard_normal_cdf(x):
+    """
+    Find the cumulative distribution function of the standard normal at x.
+
+    Example:
+        >>> _standard_normal_cdf(0)
+        0.5
+    """
+    return 0.5 * math.erfc(-x / math.sqrt(2))
+
+
+def _standard_normal_ppf(p):
+    """
+    Find the inverse cumulative distribution function of the standard normal.
+
+    Uses Wichura's algorithm AS241, which is accurate to about 1 part
+    in 10 ** 16.
+
+    Args:
+        p (float): A probability strictly between ``0`` and ``1``
+
+    Returns:
+        float: The value below which ``p`` of the distribution lies
+
+    Example:
+        >>> round(_standard_normal_ppf(0.975), 6)
+        1.959964
+    """
+    q = p - 0.5
+    if abs(q) <= 0.425:
+        r = 0.180625 - (q * q)
+        return (q * _polynomial(_AS241_CENTRAL[0], r) /
+                _polynomial(_AS241_CENTRAL[1], r))
+    r = math.sqrt(-math.log(p if q < 0 else 1 - p))
+    if r <= 5:
+        coefficients = _AS241_INTERMEDIATE
+        r -= 1.6
+    else:
+        coefficients = _AS241_TAIL
+        r -= 5
+    x = _polynomial(coefficients[0], r) / _polynomial(coefficients[1], r)
+    return -x if q < 0 else x
+
+
+def _standard_normal_ppf_array(p):
+    """
+    Vectorized version of ``_standard_normal_ppf()`` over a NumPy array.
+
+    Args:
+        p (numpy.ndarray): Probabilities strictly between ``0`` and ``1``
+
+    Returns:
+        numpy.ndarray
+    """
+    numpy = _import_numpy()
+    q = p - 0.5
+    results = numpy.empty_like(q)
+    central = numpy.abs(q) <= 0.425
+    q_central = q[central]
+    r = 0.180625 - (q_central * q_central)
+    results[central] = (q_central * _polynomial(_AS241_CENTRAL[0], r) /
+                        _polynomial(_AS241_CENTRAL[1], r))
+    outer = ~central
+    q_outer = q[outer]
+    r = numpy.sqrt(-numpy.log(numpy.where(q_outer < 0,
+                                          p[outer], 1 - p[outer])))
+    intermediate = r <= 5
+    x = numpy.empty_like(r)
+    r_intermediate = r[intermediate] - 1.6
+    x[intermediate] = (_polynomial(_AS241_INTERMEDIATE[0], r_intermediate) /
+                       _polynomial(_AS241_INTERMEDIATE[1], r_intermediate))
+    r_tail = r[~intermediate] - 5
+    x[~intermediate] = (_polynomial(_AS241_TAIL[0], r_tail) /
+                        _polynomial(_AS241_TAIL[1], r_tail))
+    results[outer] = numpy.where(q_outer < 0, -x, x)
+    return results
+
+
+def _is_valid_options_weights_list(value):
+    '''Check whether ``values`` is a valid argument for ``weighted_choice``.'''
+    return ((isinstance(value, list)) and
+            len(value) > 1 and
+            (all(isinstance(opt, tuple) and
+                 len(opt) == 2 and
+                 isinstance(opt[1], (int, float))
+                 for opt in value)))
+
+
+def _is_valid_numerical_weights_list(value):
+    '''Check whether ``values`` is a valid argument for ``weighted_rand``.'''
+    return ((isinstance(value, list)) and
+            len(value) > 1 and
+            (all(isinstance(opt, tuple) and
+                 len(opt) == 2 and
+                 isinstance(opt[0], (int, float)) and
+                 isinstance(opt[1], (int, float))
+                 for opt in value)))
+
+
+###############################################################################
+#   Compiled distributions
+###############################################################################
+class ContinuousDistribution(object):
+    """
+    An abstract base class for compiled continuous distributions.
+
+    Direct instances of ``ContinuousDistribution`` should not be created;
+    instead, the appropriate subclass should be used.
+
+    Subclasses implement ``_inverse()``, mapping a fraction of the
+    distribution's probability to the outcome below which it lies.
+    Sampling then costs one uniform roll and one call to ``_inverse()``.
+    Subclasses may also implement ``_inverse_array()`` to draw batches
+    in vectorized passes.
+
+    Any ``ContinuousDistribution`` can be used as the weights of a
+    ``soft.SoftFloat`` or ``soft.SoftInt``.
+    """
+
+    def _inverse(self, fraction):
+        """
+        Find the outcome below which ``fraction`` of the probability lies.
+
+        This is an abstract method and should not be called. Subclasses of
+        ``ContinuousDistribution`` must override and implement this.
+        """
+        raise NotImplementedError
+
+    def _inverse_array(self, fractions):
+        """
+        Vectorized version of ``_inverse()`` over a NumPy array.
+
+        Subclasses should override this with a vectorized implementation.
+        By default ``_inverse()`` is called on every fraction.
+        """
+        numpy = _import_numpy()
+        return numpy.array([self._inverse(f) for f in fractions],
+                           dtype=float)
+
+    def ppf(self, fractions):
+        """
+        Find the outcomes below which given fractions of the probability lie.
+
+        This is the percent point function (or quantile function),
+        the inverse of the cumulative distribution function.
+
+        Args:
+            fractions (float or list or numpy.ndarray): One or many values
+                between ``0`` and ``1``
+
+        Returns:
+            float: The outcome for a single fraction
+
+            numpy.ndarray: The outcomes for a sequence of fractions
+
+            list: The outcomes for a sequence of fractions
+            if NumPy is not installed
+
+        Raises:
+            ValueError: if any fraction is not between ``0`` and ``1``
+        """
+        def inverse(fraction):
+            if not 0 <= fraction <= 1:
+                raise ValueError('fractions must be between 0 and 1')
+            return self._inverse(fraction)
+
+        def inverse_array(fractions):
+            fractions = fractions.astype(float)
+            if ((fractions < 0) | (fractions > 1)).any():
+                raise ValueError('fractions must be between 0 and 1')
+            return self._inverse_array(fractions)
+
+        return _map_values(fractions, inverse, inverse_array)
+
+    def sample(self, rng=None):
+        """
+        Draw a value from the distribution.
+
+        Args:
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            float
+        """
+        return self._inverse(random_value(rng))
+
+    def sample_many(self, count, rng=None):
+        """
+        Draw many values from the distribution at once.
+
+        If NumPy is installed, the values are drawn in a vectorized pass
+        from a NumPy ``Generator``. Otherwise they are drawn one at a time
+        with ``sample()``.
+
+        Args:
+            count (int): The number of values to draw
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            numpy.ndarray: ``count`` values
+
+            list: ``count`` values if NumPy is not installed
+        """
+        numpy = _get_numpy()
+        if numpy is None:
+            return [self.sample(rng) for i in range(count)]
+        if is_random_stream(rng):
+            draw = rng.random_many
+        else:
+            draw = numpy_generator(rng).random
+        results = numpy.empty(count)
+        # Work in blocks small enough for the intermediate arrays
+        # to stay in cache
+        for start in range(0, count, _BATCH_BLOCK_SIZE):
+            size = min(_BATCH_BLOCK_SIZE, count - start)
+            results[start:start + size] = self._inverse_array(draw(size))
+        return results
+
+
+class PiecewiseLinearDistribution(ContinuousDistribution):
+    """
+    A continuous distribution compiled from a piecewise-linear weight curve.
+
+    The curve is built once from a list of ``(outcome, strength)`` weights.
+    The area under each linear segment is precomputed so that drawing a
+    value costs a single uniform roll, a bisection over the cumulative
+    segment areas, and a closed-form inversion within the chosen segment,
+    regardless of the shape of the curve.
+
+    Parts of the curve with negative strengths are treated as having zero
+    probability, exactly as ``weighted_rand()`` always has.
+
+    The exact ``mean``, ``variance``, ``mode`` and ``support`` of the
+    distribution are available without sampling it, along with the
+    ``total_area`` under the curve.
+
+    Example:
+        >>> distribution = PiecewiseLinearDistribution([(0, 0), (10, 1)])
+        >>> distribution.total_area
+        5.0
+        >>> distribution.sample()                              # doctest: +SKIP
+        7.512603289427862
+    """
+
+    def __init__(self, weights):
+        """
+        Args:
+            weights (list or WeightArrays): the list of weights where each
+                weight is a tuple of form ``(float, float)`` corresponding
+                to ``(outcome, strength)``. The list does not need to be
+                sorted. If multiple weights share an outcome, the curve
+                jumps vertically between them.
+
+        Raises:
+            ProbabilityUndefinedError: if the area under the curve is not
+                greater than ``0``
+        """
+        if isinstance(weights, WeightArrays) and _get_numpy() is not None:
+            self._build_segments_from_arrays(weights.outcomes,
+                                             weights.strengths)
+            return
+        points = sorted(weights, key=lambda w: w[0])
+        # Segment tables, keeping only segments with a positive area
+        self._x_starts = []
+        self._y_starts = []
+        self._slopes = []
+        self._widths = []
+        self._area_starts = []
+        total_area = 0
+        for (x_a, y_a), (x_b, y_b) in zip(points, points[1:]):
+            if x_b <= x_a or (y_a <= 0 and y_b <= 0):
+                continue
+            # Clip the segment where it crosses zero strength
+            if y_a < 0:
+                x_a = x_a + (-y_a * (x_b - x_a) / (y_b - y_a))
+                y_a = 0
+            elif y_b < 0:
+                x_b = x_a + (y_a * (x_b - x_a) / (y_a - y_b))
+                y_b = 0
+            width = x_b - x_a
+            area = (y_a + y_b) * width / 2
+            if area <= 0:
+                continue
+            self._x_starts.append(x_a)
+            self._y_starts.append(y_a)
+            self._slopes.append((y_b - y_a) / width)
+            self._widths.append(width)
+            self._area_starts.append(total_area)
+            total_area += area
+        if total_area <= 0:
+            raise ProbabilityUndefinedError(
+                'The area under the weight curve must be greater than 0.')
+        self.total_area = total_area
+        self._curve = None
+        self._summary = None
+        self._batch = None
+        self._rounded = None
+
+    def _build_segments_from_arrays(self, outcomes, strengths):
+        """
+        Build the segment tables from outcome and strength sequences.
+
+        This is the vectorized counterpart of the loop in ``__init__()``,
+        producing exactly the same tables with NumPy.
+        """
+        numpy = _import_numpy()
+        x_values = numpy.asarray(outcomes, dtype=float)
+        y_values = numpy.asarray(strengths, dtype=float)
+        # A stable sort keeps weights sharing an outcome in their order
+        order = numpy.argsort(x_values, kind='mergesort')
+        x_values = x_values.take(order)
+        y_values = y_values.take(order)
+        x_a, x_b = x_values[:-1], x_values[1:]
+        y_a, y_b = y_values[:-1], y_values[1:]
+        kept = (x_b > x_a) & ((y_a > 0) | (y_b > 0))
+        x_a, x_b, y_a, y_b = x_a[kept], x_b[kept], y_a[kept], y_b[kept]
+        # Clip segments where they cross zero strength
+        clip_start = y_a < 0
+        clip_end = ~clip_start & (y_b < 0)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            x_a, x_b = (
+                numpy.where(clip_start,
+                            x_a + (-y_a * (x_b - x_a) / (y_b - y_a)), x_a),
+                numpy.where(clip_end,
+                            x_a + (y_a * (x_b - x_a) / (y_a - y_b)), x_b))
+        y_a = numpy.where(clip_start, 0, y_a)
+        y_b = numpy.where(clip_end, 0, y_b)
+        widths = x_b - x_a
+        areas = (y_a + y_b) * widths / 2
+        kept = areas > 0
+        x_a, y_a, y_b = x_a[kept], y_a[kept], y_b[kept]
+        widths, areas = widths[kept], areas[kept]
+        if not len(areas):
+            raise ProbabilityUndefinedError(
+                'The area under the weight curve must be greater than 0.')
+        area_ends = numpy.cumsum(areas)
+        self._x_starts = x_a.tolist()
+        self._y_starts = y_a.tolist()
+        self._slopes = ((y_b - y_a) / widths).tolist()
+        self._widths = widths.tolist()
+        self._area_starts = [0] + area_ends[:-1].tolist()
+        self.total_area = float(area_ends[-1])
+        self._curve = None
+        self._summary = None
+        self._batch = None
+        self._rounded = None
+
+    def _curve_tables(self):
+        """
+        Get the segment tables as NumPy arrays, building them if needed.
+
+        Returns:
+            tuple(numpy.ndarray): The start outcomes, start strengths,
+            slopes, widths and cumulative start areas of every segment.
+        """
+        if self._curve is None:
+            numpy = _import_numpy()
+            self._curve = tuple(
+                numpy.array(table, dtype=float)
+                for table in (self._x_starts, self._y_starts, self._slopes,
+                              self._widths, self._area_starts))
+        return self._curve
+
+    def _batch_tables(self):
+        """
+        Get the NumPy tables used by ``sample_many()``, building if needed.
+
+        Segments are picked with an alias table over their areas. Within a
+        segment, the outcome at a fraction ``f`` of its area is
+        ``x_start + (c * f) / (y_start + sqrt(a + b * f))``, so ``a``, ``b``
+        and ``c`` are precomputed for every segment.
+
+        Returns:
+            tuple(numpy.ndarray): The alias probabilities, alias indices,
+            start outcomes, start strengths, and ``a``, ``b`` and ``c``
+            coefficients of every segment.
+        """
+        if self._batch is None:
+            numpy = _import_numpy()
+            x_starts, y_starts, slopes, widths, area_starts = (
+                self._curve_tables())
+            areas = numpy.diff(area_starts, append=self.total_area)
+            segments = DiscreteDistribution(list(enumerate(areas)))
+            # Every segment has a positive area, so the alias table
+            # indices line up with the segment indices
+            self._batch = (
+                numpy.array(segments._probabilities, dtype=float),
+                numpy.array(segments._aliases, dtype=numpy.intp),
+                x_starts,
+                y_starts,
+                y_starts ** 2,
+                2 * slopes * areas,
+                2 * areas)
+        return self._batch
+
+    def _inverse(self, fraction):
+        """
+        Find the outcome below which ``fraction`` of the area lies.
+
+        Args:
+            fraction (float): A value between ``0`` and ``1``
+
+        Returns:
+            float: The outcome dividing the area under the curve
+            at ``fraction``
+
+        Example:
+            >>> distribution = PiecewiseLinearDistribution([(0, 0), (2, 2)])
+            >>> distribution._inverse(0.25)
+            1.0
+        """
+        target = fraction * self.total_area
+        index = bisect.bisect_right(self._area_starts, target) - 1
+        if index < 0:
+            index = 0
+        area = target - self._area_starts[index]
+        y_start = self._y_starts[index]
+        # Solve ``y_start * dx + (slope / 2) * dx ** 2 == area`` for dx
+        # in a form which stays stable as the slope approaches 0
+        root = math.sqrt(max(
+            y_start ** 2 + (2 * self._slopes[index] * area), 0))
+        if y_start + root > 0:
+            offset = (2 * area) / (y_start + root)
+        else:
+            offset = 0
+        return self._x_starts[index] + min(offset, self._widths[index])
+
+    def _inverse_array(self, fractions):
+        """Vectorized version of ``_inverse()`` over a NumPy array."""
+        numpy = _import_numpy()
+        x_starts, y_starts, slopes, widths, area_starts = self._curve_tables()
+        targets = numpy.asarray(fractions, dtype=float) * self.total_area
+        indices = numpy.maximum(
+            numpy.searchsorted(area_starts, targets, side='right') - 1, 0)
+        areas = targets - area_starts.take(indices)
+        y_starts = y_starts.take(indices)
+        roots = numpy.sqrt(numpy.maximum(
+            y_starts ** 2 + (2 * slopes.take(indices) * areas), 0))
+        denominators = y_starts + roots
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            offsets = numpy.where(denominators > 0,
+                                  (2 * areas) / denominators, 0)
+        return x_starts.take(indices) + numpy.minimum(offsets,
+                                                      widths.take(indices))
+
+    def _density(self, outcome):
+        """Find the probability density at a single outcome."""
+        index = bisect.bisect_right(self._x_starts, outcome) - 1
+        if index < 0:
+            return 0.0
+        offset = outcome - self._x_starts[index]
+        if offset > self._widths[index]:
+            return 0.0
+        strength = self._y_starts[index] + (self._slopes[index] * offset)
+        return max(strength, 0) / self.total_area
+
+    def _density_array(self, outcomes):
+        """Vectorized version of ``_density()`` over a NumPy array."""
+        numpy = _import_numpy()
+        x_starts, y_starts, slopes, widths, area_starts = self._curve_tables()
+        outcomes = numpy.asarray(outcomes, dtype=float)
+        indices = numpy.searchsorted(x_starts, outcomes, side='right') - 1
+        clipped = numpy.maximum(indices, 0)
+        offsets = outcomes - x_starts.take(clipped)
+        strengths = y_starts.take(clipped) + (slopes.take(clipped) * offsets)
+        inside = (indices >= 0) & (offsets <= widths.take(clipped))
+        return numpy.where(inside, numpy.maximum(strengths, 0),
+                           0) / self.total_area
+
+    def _cumulative(self, outcome):
+        """Find the fraction of the probability at or below an outcome."""
+        index = bisect.bisect_right(self._x_starts, outcome) - 1
+        if index < 0:
+            return 0.0
+        offset = min(outcome - self._x_starts[index], self._widths[index])
+        area = offset * (self._y_starts[index] +
+                         (self._slopes[index] * offset / 2))
+        return min((self._area_starts[index] + area) / self.total_area, 1.0)
+
+    def _cumulative_array(self, outcomes):
+        """Vectorized version of ``_cumulative()`` over a NumPy array."""
+        numpy = _import_numpy()
+        x_starts, y_starts, slopes, widths, area_starts = self._curve_tables()
+        outcomes = numpy.asarray(outcomes, dtype=float)
+        indices = numpy.searchsorted(x_starts, outcomes, side='right') - 1
+        clipped = numpy.maximum(indices, 0)
+        offsets = numpy.minimum(outcomes - x_starts.take(clipped),
+                                widths.take(clipped))
+        areas = offsets * (y_starts.take(clipped) +
+                           (slopes.take(clipped) * offsets / 2))
+        fractions = numpy.minimum(
+            (area_starts.take(clipped) + areas) / self.total_area, 1.0)
+        return numpy.where(indices >= 0, fractions, 0.0)
+
+    def pdf(self, outcomes):
+        """
+        Find the probability density of the distribution at given outcomes.
+
+        The density is the strength of the weight curve, scaled so that
+        the total area under it is ``1``.
+
+        Args:
+            outcomes (float or list or numpy.ndarray): One or many outcomes
+
+        Returns:
+            float: The density at a single outcome
+
+            numpy.ndarray: The densities at a sequence of outcomes
+
+            list: The densities at a sequence of outcomes
+            if NumPy is not installed
+
+        Example:
+            >>> distribution = PiecewiseLinearDistribution([(0, 0), (2, 2)])
+            >>> distribution.pdf(1)
+            0.5
+        """
+        return _map_values(outcomes, self._density, self._density_array)
+
+    def cdf(self, outcomes):
+        """
+        Find the fraction of the probability at or below given outcomes.
+
+        Args:
+            outcomes (float or list or numpy.ndarray): One or many outcomes
+
+        Returns:
+            float: The cumulative probability of a single outcome
+
+            numpy.ndarray: The cumulative probabilities
+            of a sequence of outcomes
+
+            list: The cumulative probabilities of a sequence of outcomes
+            if NumPy is not installed
+
+        Example:
+            >>> distribution = PiecewiseLinearDistribution([(0, 0), (2, 2)])
+            >>> distribution.cdf(1)
+            0.25
+        """
+        return _map_values(outcomes, self._cumulative,
+                           self._cumulative_array)
+
+    def _summarize(self):
+        """
+        Compute the summary statistics of the curve, if not done already.
+
+        Every statistic is found in a single pass over the segments.
+        The mean and variance of each segment are found in closed form
+        relative to its start, then merged into the running totals with
+        the pairwise update of Chan, Golub and LeVeque, which stays
+        accurate for curves far from ``0``.
+
+        Returns:
+            tuple: The mean, variance and mode of the distribution
+        """
+        if self._summary is None:
+            mass = 0
+            mean = 0
+            squared_deviations = 0
+            mode = None
+            peak = -1
+            for x_start, y_start, slope, width, area_start in zip(
+                    self._x_starts, self._y_starts, self._slopes,
+                    self._widths, self._area_starts):
+                y_end = y_start + (slope * width)
+                area = (y_start + y_end) * width / 2
+                # Moments of the segment about its start
+                first = ((y_start * width ** 2 / 2) +
+                         (slope * width ** 3 / 3)) / area
+                second = ((y_start * width ** 3 / 3) +
+                          (slope * width ** 4 / 4)) / area
+                segment_mean = x_start + first
+                delta = segment_mean - mean
+                merged_mass = mass + area
+                mean += delta * area / merged_mass
+                squared_deviations += ((area * (second - first ** 2)) +
+                                       (delta ** 2 * mass * area /
+                                        merged_mass))
+                mass = merged_mass
+                if y_start > peak:
+                    mode, peak = x_start, y_start
+                if y_end > peak:
+                    mode, peak = x_start + width, y_end
+            self._summary = (mean, max(squared_deviations / mass, 0), mode)
+        return self._summary
+
+    @property
+    def mean(self):
+        """float: The exact mean of the distribution"""
+        return self._summarize()[0]
+
+    @property
+    def variance(self):
+        """float: The exact variance of the distribution"""
+        return self._summarize()[1]
+
+    @property
+    def mode(self):
+        """
+        float: The most likely outcome of the distribution. If several
+        outcomes are equally likely, the lowest of them.
+        """
+        return self._summarize()[2]
+
+    @property
+    def support(self):
+        """
+        tuple (float, float): The lowest and highest outcomes
+        the distribution can produce
+        """
+        return (self._x_starts[0], self._x_starts[-1] + self._widths[-1])
+
+    def rounded(self):
+        """
+        Get the distribution of outcomes rounded to the nearest ``int``.
+
+        The probability of every ``int`` ``k`` is the area under the curve
+        between ``k - 0.5`` and ``k + 0.5``, found exactly from the
+        cumulative area. The result is an alias table over these
+        ``int`` values, so drawing a rounded value costs a single uniform
+        roll, and is distributed exactly like rounding a drawn value.
+        Compiled on first use.
+
+        Returns:
+            DiscreteDistribution: A distribution of ``int`` outcomes
+
+        Raises:
+            ValueError: if the curve spans more than
+                ``_MAX_ROUNDED_WIDTH`` integers
+
+        Example:
+            >>> curve = PiecewiseLinearDistribution([(0, 0), (2, 1)])
+            >>> curve.rounded().pmf(1)
+            0.5
+        """
+        if self._rounded is None:
+            low, high = self.support
+            if high - low > _MAX_ROUNDED_WIDTH:
+                raise ValueError(
+                    'Curve spans too many integers to compile '
+                    'its rounded distribution.')
+            first = int(math.floor(low + 0.5))
+            last = int(math.floor(high + 0.5))
+            integers = list(range(first, last + 1))
+            cumulative = self.cdf([k + 0.5 for k in integers])
+            if hasattr(cumulative, 'tolist'):
+                cumulative = cumulative.tolist()
+            masses = [cumulative[0]] + [
+                upper - lower
+                for lower, upper in zip(cumulative, cumulative[1:])]
+            self._rounded = DiscreteDistribution(
+                WeightArrays(integers, masses))
+        return self._rounded
+
+    def sample_rounded(self, rng=None):
+        """
+        Draw a value from the distribution rounded to the nearest ``int``.
+
+        A single value is drawn and rounded half up, as ``rounded()``
+        does, so the values are distributed exactly like ``rounded()``
+        without compiling it, and the same ``rng`` always gives
+        the same value.
+
+        Args:
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            int
+
+        Example:
+            >>> curve = PiecewiseLinearDistribution([(0, 1), (3, 1)])
+            >>> curve.sample_rounded() in (0, 1, 2, 3)
+            True
+        """
+        return int(math.floor(self.sample(rng) + 0.5))
+
+    def sample_many(self, count, rng=None):
+        """
+        Draw many values from the distribution at once.
+
+        If NumPy is installed, the values are drawn in a vectorized pass
+        from a NumPy ``Generator``. Otherwise they are drawn one at a time
+        with ``sample()``.
+
+        Args:
+            count (int): The number of values to draw
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            numpy.ndarray: ``count`` weighted random numbers
+
+            list: ``count`` weighted random numbers if NumPy is
+            not installed
+        """
+        numpy = _get_numpy()
+        if numpy is None:
+            return [self.sample(rng) for i in range(count)]
+        if is_random_stream(rng):
+            # Invert one value per result, exactly as sample() does
+            return super(PiecewiseLinearDistribution, self).sample_many(
+                count, rng)
+        (probabilities, aliases, x_starts, y_starts,
+         a_coefficients, b_coefficients, c_coefficients) = self._batch_tables()
+        generator = numpy_generator(rng)
+        results = numpy.empty(count)
+        # Work in blocks small enough for the intermediate arrays
+        # to stay in cache
+        for start in range(0, count, _BATCH_BLOCK_SIZE):
+            size = min(_BATCH_BLOCK_SIZE, count - start)
+            columns = generator.integers(0, len(probabilities), size)
+            kept = generator.random(size) < probabilities.take(columns)
+            indices = numpy.where(kept, columns, aliases.take(columns))
+            fractions = generator.random(size)
+            denominators = (a_coefficients.take(indices) +
+                            b_coefficients.take(indices) * fractions)
+            # Guard against rounding error below 0 at the ends of segments
+            numpy.maximum(denominators, 0, out=denominators)
+            numpy.sqrt(denominators, out=denominators)
+            denominators += y_starts.take(indices)
+            offsets = c_coefficients.take(indices) * fractions
+            numpy.divide(offsets, denominators, out=offsets,
+                         where=denominators > 0)
+            results[start:start + size] = offsets + x_starts.take(indices)
+        return results
+
+
+class DiscreteDistribution(object):
+    """
+    A discrete distribution over weighted options using an alias table.
+
+    The table is built once with Vose's alias method in ``O(n)`` time,
+    after which every draw costs a single uniform roll regardless of
+    the number of options.
+
+    Options with strength ``0`` or less have no chance to be drawn.
+
+    The exact ``mean``, ``variance``, ``mode`` and ``support`` of the
+    distribution are available without sampling it, along with the
+    ``total_strength`` of its options.
+
+    Example:
+        >>> distribution = DiscreteDistribution([('choice one', 10),
+        ...                                      ('choice two', 3)])
+        >>> distribution.sample()                              # doctest: +SKIP
+        'choice one'
+        >>> distribution.sample(as_index_and_value_tuple=True) # doctest: +SKIP
+        (0, 'choice one')
+    """
+
+    def __init__(self, weights):
+        """
+        Args:
+            weights (list or WeightArrays): a list of options where each
+                option is a tuple of form ``(Any, float)`` corresponding to
+                ``(outcome, strength)``. Outcome values may be of any type.
+
+        Raises:
+            ValueError: if ``weights`` is empty
+            ProbabilityUndefinedError: if no strength in ``weights``
+                is greater than ``0``
+        """
+        if not len(weights):
+            raise ValueError(
+                'List passed to DiscreteDistribution() cannot be empty.')
+        self.outcomes, strengths = _weight_columns(weights)
+        if hasattr(strengths, 'tolist'):
+            strengths = strengths.tolist()
+        # Only options with positive strength take part in the table
+        self._indices = [i for i, s in enumerate(strengths) if s > 0]
+        prob_sum = sum(strengths[i] for i in self._indices)
+        if prob_sum <= 0:
+            raise ProbabilityUndefinedError(
+                'No item weights in DiscreteDistribution() are greater '
+                'than 0. Probability distribution is undefined.')
+        self.total_strength = prob_sum
+        self._masses = [strengths[i] / prob_sum for i in self._indices]
+        count = len(self._indices)
+        scaled = [strengths[i] * count / prob_sum for i in self._indices]
+        self._probabilities = [1] * count
+        self._aliases = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self._probabilities[less] = scaled[less]
+            self._aliases[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+        # Anything left over is only off from 1 by rounding error,
+        # and keeps its default probability of 1
+        self._batch = None
+        self._outcome_column = None
+        self._outcome_table = None
+        self._outcome_arrays = None
+        self._summary = None
+
+    def _outcome_tables(self):
+        """
+        Get the distinct outcomes in increasing order, building if needed.
+
+        Equal outcomes are merged, adding their probabilities together.
+
+        Returns:
+            tuple(list): The distinct outcomes with any chance to be drawn,
+            the probability of each, and the cumulative probability
+            at or below each.
+        """
+        if self._outcome_table is None:
+            order = sorted(range(len(self._indices)),
+                           key=lambda i: self.outcomes[self._indices[i]])
+            outcomes = []
+            masses = []
+            for i in order:
+                outcome = self.outcomes[self._indices[i]]
+                if outcomes and outcomes[-1] == outcome:
+                    masses[-1] += self._masses[i]
+                else:
+                    outcomes.append(outcome)
+                    masses.append(self._masses[i])
+            cumulative = []
+            total = 0
+            for mass in masses:
+                total += mass
+                cumulative.append(total)
+            self._outcome_table = (outcomes, masses, cumulative)
+        return self._outcome_table
+
+    def _outcome_table_arrays(self):
+        """NumPy arrays of ``_outcome_tables()``, built on first use."""
+        if self._outcome_arrays is None:
+            numpy = _import_numpy()
+            outcomes, masses, cumulative = self._outcome_tables()
+            self._outcome_arrays = (_outcome_array(outcomes),
+                                    numpy.array(masses, dtype=float),
+                                    numpy.array(cumulative, dtype=float))
+        return self._outcome_arrays
+
+    def _mass(self, outcome):
+        """Find the probability of drawing a single outcome."""
+        outcomes, masses, cumulative = self._outcome_tables()
+        index = bisect.bisect_left(outcomes, outcome)
+        if index < len(outcomes) and outcomes[index] == outcome:
+            return masses[index]
+        return 0.0
+
+    def _mass_array(self, outcomes):
+        """Vectorized version of ``_mass()`` over a NumPy array."""
+        numpy = _import_numpy()
+        table_outcomes, masses, cumulative = self._outcome_table_arrays()
+        indices = numpy.minimum(
+            numpy.searchsorted(table_outcomes, outcomes, side='left'),
+            len(table_outcomes) - 1)
+        found = table_outcomes.take(indices) == outcomes
+        return numpy.where(found, masses.take(indices), 0.0)
+
+    def _cumulative(self, outcome):
+        """Find the probability of drawing an outcome at or below one."""
+        outcomes, masses, cumulative = self._outcome_tables()
+        index = bisect.bisect_right(outcomes, outcome)
+        if index == 0:
+            return 0.0
+        return min(cumulative[index - 1], 1.0)
+
+    def _cumulative_array(self, outcomes):
+        """Vectorized version of ``_cumulative()`` over a NumPy array."""
+        numpy = _import_numpy()
+        table_outcomes, masses, cumulative = self._outcome_table_arrays()
+        indices = numpy.searchsorted(table_outcomes, outcomes, side='right')
+        fractions = numpy.minimum(
+            cumulative.take(numpy.maximum(indices - 1, 0)), 1.0)
+        return numpy.where(indices > 0, fractions, 0.0)
+
+    def _quantile(self, fraction):
+        """Find the lowest outcome whose cumulative probability is enough."""
+        if not 0 <= fraction <= 1:
+            raise ValueError('fractions must be between 0 and 1')
+        outcomes, masses, cumulative = self._outcome_tables()
+        index = bisect.bisect_left(cumulative, fraction)
+        return outcomes[min(index, len(outcomes) - 1)]
+
+    def _quantile_array(self, fractions):
+        """Vectorized version of ``_quantile()`` over a NumPy array."""
+        numpy = _import_numpy()
+        fractions = fractions.astype(float)
+        if ((fractions < 0) | (fractions > 1)).any():
+            raise ValueError('fractions must be between 0 and 1')
+        table_outcomes, masses, cumulative = self._outcome_table_arrays()
+        indices = numpy.minimum(
+            numpy.searchsorted(cumulative, fractions, side='left'),
+            len(table_outcomes) - 1)
+        return table_outcomes.take(indices)
+
+    def pmf(self, outcomes):
+        """
+        Find the probability of drawing given outcomes.
+
+        If several options share an outcome, their probabilities are
+        added together. Outcomes must be comparable with each other.
+
+        Args:
+            outcomes (Any or list or numpy.ndarray): One or many outcomes
+
+        Returns:
+            float: The probability of a single outcome
+
+            numpy.ndarray: The probabilities of a sequence of outcomes
+
+            list: The probabilities of a sequence of outcomes
+            if NumPy is not installed
+
+        Example:
+            >>> distribution = DiscreteDistribution([('a', 1), ('b', 3)])
+            >>> distribution.pmf('b')
+            0.75
+        """
+        return _map_values(outcomes, self._mass, self._mass_array)
+
+    def cdf(self, outcomes):
+        """
+        Find the probability of drawing an outcome at or below given ones.
+
+        Outcomes must be comparable with each other.
+
+        Args:
+            outcomes (Any or list or numpy.ndarray): One or many outcomes
+
+        Returns:
+            float: The cumulative probability of a single outcome
+
+            numpy.ndarray: The cumulative probabilities
+            of a sequence of outcomes
+
+            list: The cumulative probabilities of a sequence of outcomes
+            if NumPy is not installed
+
+        Example:
+            >>> distribution = DiscreteDistribution([(1, 1), (2, 1), (3, 2)])
+            >>> distribution.cdf(2.5)
+            0.5
+        """
+        return _map_values(outcomes, self._cumulative,
+                           self._cumulative_array)
+
+    def ppf(self, fractions):
+        """
+        Find the lowest outcomes whose cumulative probability
+        reaches given fractions.
+
+        This is the percent point function (or quantile function),
+        the inverse of ``cdf()``. Outcomes must be comparable
+        with each other.
+
+        Args:
+            fractions (float or list or numpy.ndarray): One or many values
+                between ``0`` and ``1``
+
+        Returns:
+            Any: The outcome for a single fraction
+
+            numpy.ndarray: The outcomes for a sequence of fractions
+
+            list: The outcomes for a sequence of fractions
+            if NumPy is not installed
+
+        Raises:
+            ValueError: if any fraction is not between ``0`` and ``1``
+
+        Example:
+            >>> distribution = DiscreteDistribution([(1, 1), (2, 1), (3, 2)])
+            >>> distribution.ppf([0.1, 0.5, 0.9])              # doctest: +SKIP
+            array([1, 2, 3])
+        """
+        return _map_values(fractions, self._quantile, self._quantile_array)
+
+    def _summarize(self):
+        """
+        Compute the mean and variance of the outcomes, if not done already.
+
+        Both are found in a single pass with Welford's update, which stays
+        accurate for outcomes far from ``0``.
+
+        Returns:
+            tuple: The mean and variance of the distribution
+        """
+        if self._summary is None:
+            mass = 0
+            mean = 0
+            squared_deviations = 0
+            for index, option_mass in zip(self._indices, self._masses):
+                delta = self.outcomes[index] - mean
+                mass += option_mass
+                mean += delta * option_mass / mass
+                squared_deviations += (option_mass * delta *
+                                       (self.outcomes[index] - mean))
+            self._summary = (mean, max(squared_deviations / mass, 0))
+        return self._summary
+
+    @property
+    def mean(self):
+        """
+        float: The exact mean of the distribution.
+        Outcomes must be numbers.
+        """
+        return self._summarize()[0]
+
+    @property
+    def variance(self):
+        """
+        float: The exact variance of the distribution.
+        Outcomes must be numbers.
+        """
+        return self._summarize()[1]
+
+    @property
+    def mode(self):
+        """
+        Any: The most likely outcome of the distribution. If several
+        outcomes are equally likely, the lowest of them. Outcomes must be
+        comparable with each other.
+        """
+        outcomes, masses, cumulative = self._outcome_tables()
+        return outcomes[masses.index(max(masses))]
+
+    @property
+    def support(self):
+        """
+        list: Every distinct outcome the distribution can produce,
+        in increasing order. Outcomes must be comparable with each other.
+        """
+        return list(self._outcome_tables()[0])
+
+    def sample_index(self, rng=None):
+        """
+        Draw the index of an option in the distribution.
+
+        Args:
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            int: the index of the picked option in the original weights
+        """
+        count = len(self._indices)
+        roll = random_value(rng) * count
+        column = min(int(roll), count - 1)
+        if (roll - column) < self._probabilities[column]:
+            return self._indices[column]
+        else:
+            return self._indices[self._aliases[column]]
+
+    def sample(self, as_index_and_value_tuple=False, rng=None):
+        """
+        Draw an option from the distribution.
+
+        Args:
+            as_index_and_value_tuple (bool): Option to return an
+                ``(index, value)`` tuple instead of just a single ``value``,
+                as in ``weighted_choice()``.
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            Any: If ``as_index_and_value_tuple is False``, any one of the
+            outcomes of the distribution
+
+            tuple (int, Any): If ``as_index_and_value_tuple is True``,
+            a 2-tuple of form ``(int, Any)`` corresponding to
+            ``(index, value)``.
+        """
+        index = self.sample_index(rng)
+        if as_index_and_value_tuple:
+            return (index, self.outcomes[index])
+        else:
+            return self.outcomes[index]
+
+    def sample_many(self, count, as_indices=False, rng=None):
+        """
+        Draw many options from the distribution at once.
+
+        If NumPy is installed, the options are drawn in a vectorized pass
+        from a NumPy ``Generator``. Otherwise they are drawn one at a time
+        with ``sample()``.
+
+        Args:
+            count (int): The number of options to draw
+            as_indices (bool): Option to return the indices of the picked
+                options instead of the options themselves.
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            numpy.ndarray: ``count`` picked outcomes,
+            or their indices if ``as_indices is True``
+
+            list: ``count`` picked outcomes or indices
+            if NumPy is not installed
+        """
+        numpy = _get_numpy()
+        if numpy is None:
+            indices = [self.sample_index(rng) for i in range(count)]
+            if as_indices:
+                return indices
+            else:
+                return [self.outcomes[i] for i in indices]
+        if self._batch is None:
+            self._batch = (numpy.array(self._probabilities, dtype=float),
+                           numpy.array(self._aliases, dtype=numpy.intp),
+                           numpy.array(self._indices, dtype=numpy.intp))
+        probabilities, aliases, option_indices = self._batch
+        if is_random_stream(rng):
+            # Split one value per result, exactly as sample_index() does
+            rolls = rng.random_many(count) * len(probabilities)
+            columns = numpy.minimum(rolls.astype(numpy.intp),
+                                    len(probabilities) - 1)
+            kept = (rolls - columns) < probabilities.take(columns)
+        else:
+            generator = numpy_generator(rng)
+            columns = generator.integers(0, len(probabilities), count)
+            kept = generator.random(count) < probabilities.take(columns)
+        indices = option_indices.take(
+            numpy.where(kept, columns, aliases.take(columns)))
+        if as_indices:
+            return indices
+        if self._outcome_column is None:
+            self._outcome_column = _outcome_array(self.outcomes)
+        return self._outcome_column.take(indices)
+
+
+class GridDistribution(object):
+    """
+    A distribution of points over a 2-dimensional grid of weights.
+
+    Each cell of the grid has a chance to be drawn proportional to its
+    strength, so a grid of brightness values or a heat map can be used as
+    a density map for placing points. Cells with strength ``0`` or less
+    have no chance to be drawn.
+
+    The cumulative strengths of the cells are computed once with NumPy, so
+    drawing a point costs a single uniform roll and a binary search over
+    the cells. Large batches of points are drawn in vectorized passes.
+
+    Points are ``(x, y)`` pairs, where ``x`` is the column and ``y``
+    is the row of a cell in the grid. With ``jitter=True`` the point is
+    spread uniformly over its cell, between ``x`` and ``x + 1``
+    and ``y`` and ``y + 1``.
+
+    Requires NumPy.
+
+    Example:
+        >>> distribution = GridDistribution(  # doctest: +REQUIRES_NUMPY
+        ...     [[0, 1, 0],
+        ...      [0, 5, 2]])
+        >>> distribution.sample()                              # doctest: +SKIP
+        (1, 1)
+        >>> distribution.sample(jitter=True)                   # doctest: +SKIP
+        (2.4173950271911357, 1.8366286185437815)
+        >>> distribution.sample_many(3)                        # doctest: +SKIP
+        array([[1, 1],
+               [2, 1],
+               [1, 0]])
+    """
+
+    def __init__(self, grid):
+        """
+        Args:
+            grid (numpy.ndarray or list): A 2-dimensional array of cell
+                strengths, indexed by row and then column
+
+        Raises:
+            ValueError: if ``grid`` is not 2-dimensional
+            ProbabilityUndefinedError: if no cell strength in ``grid``
+                is greater than ``0``
+            ImportError: if NumPy is not installed
+        """
+        numpy = _import_numpy()
+        grid = numpy.asarray(grid, dtype=float)
+        if grid.ndim != 2:
+            raise ValueError('grid must be 2-dimensional')
+        self.shape = grid.shape
+        self._cumulative = numpy.cumsum(numpy.maximum(grid.ravel(), 0))
+        self.total_strength = (float(self._cumulative[-1])
+                               if self._cumulative.size else 0)
+        if not self.total_strength > 0:
+            raise ProbabilityUndefinedError(
+                'No cell strengths in GridDistribution() are greater '
+                'than 0. Probability distribution is undefined.')
+
+    def _points(self, rolls, jitter):
+        """
+        Convert uniform rolls into points.
+
+        Args:
+            rolls (numpy.ndarray): One row of rolls for every point,
+                the first picking the cell and, if ``jitter is True``,
+                the next two spreading the point over it.
+            jitter (bool): Whether to spread points over their cells
+
+        Returns:
+            numpy.ndarray: One ``(x, y)`` row for every row of ``rolls``
+        """
+        numpy = _import_numpy()
+        targets = rolls[:, 0] * self.total_strength
+        # Searching in sorted order walks the cumulative strengths
+        # forward, which is much friendlier to the cache on large grids.
+        # Cells with no strength share their cumulative value with the
+        # cell before them, and are skipped by searching to the right
+        order = numpy.argsort(targets)
+        cells = numpy.empty(len(targets), dtype=numpy.intp)
+        cells[order] = numpy.searchsorted(self._cumulative,
+                                          targets.take(order), side='right')
+        numpy.minimum(cells, self._cumulative.size - 1, out=cells)
+        rows, columns = numpy.divmod(cells, self.shape[1])
+        if not jitter:
+            return numpy.stack((columns, rows), axis=1)
+        return numpy.stack((columns + rolls[:, 1], rows + rolls[:, 2]),
+                           axis=1)
+
+    def sample(self, jitter=False, rng=None):
+        """
+        Draw a point from the distribution.
+
+        Args:
+            jitter (bool): Whether to spread the point uniformly
+                over its cell
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            tuple (int, int): The ``(x, y)`` position of a cell
+
+            tuple (float, float): The ``(x, y)`` position of a point in
+            a cell if ``jitter is True``
+        """
+        numpy = _import_numpy()
+        rolls = [random_value(rng) for i in range(3 if jitter else 1)]
+        x, y = self._points(numpy.array([rolls]), jitter)[0].tolist()
+        return (x, y)
+
+    def sample_many(self, count, jitter=False, rng=None):
+        """
+        Draw many points from the distribution at once.
+
+        Args:
+            count (int): The number of points to draw
+            jitter (bool): Whether to spread the points uniformly
+                over their cells
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            numpy.ndarray: An array of shape ``(count, 2)`` holding the
+            ``(x, y)`` position of every point, of ``int`` type unless
+            ``jitter is True``
+        """
+        numpy = _import_numpy()
+        width = 3 if jitter else 1
+        if is_random_stream(rng):
+            # Draw exactly the rolls sample() would, in the same order
+            rolls = numpy.asarray(rng.random_many(count * width))
+            rolls = rolls.reshape(count, width)
+        else:
+            rolls = numpy_generator(rng).random((count, width))
+        return self._points(rolls, jitter)
+
+
+class DynamicDistribution(object):
+    """
+    A discrete distribution over weighted options which can be changed.
+
+    The strengths of the options are kept in a Fenwick tree, a binary
+    tree of partial sums stored in a flat list, so that changing the
+    strength of an option, adding an option, removing an option and
+    drawing an option each take ``O(log n)`` time. Unlike
+    ``DiscreteDistribution``, whose table must be rebuilt from scratch
+    after any change, this suits options which are re-weighted
+    between nearly every draw.
+
+    Every option keeps its index for as long as it is in the
+    distribution. The indices of removed options are reused by
+    options inserted later.
+
+    Options with strength ``0`` or less have no chance to be drawn.
+
+    Example:
+        >>> distribution = DynamicDistribution([('rain', 1), ('sun', 3)])
+        >>> distribution.sample()                              # doctest: +SKIP
+        'sun'
+        >>> distribution.update(0, 10)
+        >>> snow = distribution.insert('snow', 2)
+        >>> distribution.remove(1)
+        >>> distribution.total_strength
+        12.0
+        >>> distribution.sample()                              # doctest: +SKIP
+        'rain'
+    """
+
+    def __init__(self, weights=()):
+        """
+        Args:
+            weights (list or WeightArrays): a list of options where each
+                option is a tuple of form ``(Any, float)`` corresponding to
+                ``(outcome, strength)``. Outcome values may be of any type.
+                Defaults to no options.
+        """
+        outcomes, strengths = _weight_columns(weights)
+        if hasattr(strengths, 'tolist'):
+            strengths = strengths.tolist()
+        self.outcomes = list(outcomes)
+        self._strengths = list(strengths)
+        # Indices of removed options, free to be reused
+        self._free = []
+        self._rebuild()
+
+    def _rebuild(self):
+        """
+        Build the Fenwick tree from the option strengths in ``O(n)``.
+
+        Rebuilding also clears the rounding error which builds up in the
+        tree's partial sums as strengths are changed, so the tree is
+        rebuilt after every ``n`` changes, which keeps the amortized cost
+        of a change at ``O(log n)``.
+        """
+        # The tree is 1-based: self._tree[i] holds the total strength
+        # of options i - (i & -i) to i - 1, and self._tree[0] is unused
+        self._tree = [0.0] + [float(max(s, 0)) for s in self._strengths]
+        for i in range(1, len(self._tree)):
+            parent = i + (i & -i)
+            if parent < len(self._tree):
+                self._tree[parent] += self._tree[i]
+        self._positive_count = sum(1 for s in self._strengths if s > 0)
+        self._changes = 0
+
+    def _prefix_sum(self, count):
+        """Find the total strength of the first ``count`` options."""
+        total = 0.0
+        while count > 0:
+            total += self._tree[count]
+            count -= count & -count
+        return total
+
+    def _add(self, index, difference):
+        """Add ``difference`` to the tree at an option's ``index``."""
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += difference
+            i += i & -i
+
+    def _check_index(self, index):
+        """Raise an ``IndexError`` if no option has ``index``."""
+        if (not 0 <= index < len(self.outcomes) or
+                self.outcomes[index] is _REMOVED):
+            raise IndexError(
+                'No option in DynamicDistribution has index {}'.format(index))
+
+    def __len__(self):
+        return len(self.outcomes) - len(self._free)
+
+    def __getitem__(self, index):
+        """
+        Get the option at ``index`` as an ``(outcome, strength)`` tuple.
+
+        Raises:
+            IndexError: if no option has ``index``
+        """
+        self._check_index(index)
+        return (self.outcomes[index], self._strengths[index])
+
+    @property
+    def total_strength(self):
+        """float: The total strength of all options with positive strength"""
+        return self._prefix_sum(len(self.outcomes))
+
+    def update(self, index, strength):
+        """
+        Change the strength of an option in ``O(log n)`` time.
+
+        Args:
+            index (int): The index of the option
+            strength (float): The new strength of the option
+
+        Raises:
+            IndexError: if no option has ``index``
+        """
+        self._check_index(index)
+        old_strength = self._strengths[index]
+        self._strengths[index] = strength
+        self._positive_count += (strength > 0) - (old_strength > 0)
+        difference = max(strength, 0) - max(old_strength, 0)
+        self._add(index, difference)
+        self._changes += 1
+        # Removing more strength than is left cancels most of the digits
+        # of the partial sums, so they are summed again from scratch
+        if (self._changes > len(self.outcomes) or
+                -difference > self.total_strength):
+            self._rebuild()
+
+    def insert(self, outcome, strength):
+        """
+        Add an option in ``O(log n)`` time.
+
+        The option takes the index of the earliest removed option if there
+        is one, or else the index after every other option.
+
+        Args:
+            outcome (Any): The outcome of the option
+            strength (float): The strength of the option
+
+        Returns:
+            int: The index of the new option
+        """
+        if self._free:
+            index = heapq.heappop(self._free)
+            self.outcomes[index] = outcome
+            self._strengths[index] = 0
+            self.update(index, strength)
+            return index
+        index = len(self.outcomes)
+        self.outcomes.append(outcome)
+        self._strengths.append(strength)
+        # The new node holds its own strength plus the strengths of the
+        # options it covers, which all come before it
+        i = index + 1
+        self._tree.append(max(strength, 0) + self._prefix_sum(i - 1) -
+                          self._prefix_sum(i - (i & -i)))
+        self._positive_count += strength > 0
+        return index
+
+    def remove(self, index):
+        """
+        Remove an option in ``O(log n)`` time.
+
+        The indices of every other option are unchanged.
+
+        Args:
+            index (int): The index of the option
+
+        Raises:
+            IndexError: if no option has ``index``
+        """
+        self.update(index, 0)
+        self.outcomes[index] = _REMOVED
+        heapq.heappush(self._free, index)
+
+    def _find(self, target):
+        """
+        Find the option in which a cumulative strength falls.
+
+        Walks down the Fenwick tree from its largest power of two node,
+        in ``O(log n)`` time.
+
+        Args:
+            target (float): A cumulative strength between ``0`` and
+                ``total_strength``
+
+        Returns:
+            int: The index of the option whose span of cumulative
+            strengths holds ``target``
+        """
+        index = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            node = index + step
+            if node < len(self._tree) and self._tree[node] <= target:
+                index = node
+                target -= self._tree[node]
+            step >>= 1
+        return index
+
+    def sample_index(self, rng=None):
+        """
+        Draw the index of an option in the distribution.
+
+        Args:
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            int: the index of the picked option
+
+        Raises:
+            ProbabilityUndefinedError: if no option has a strength
+                greater than ``0``
+        """
+        if self._positive_count <= 0:
+            raise ProbabilityUndefinedError(
+                'No item weights in DynamicDistribution are greater '
+                'than 0. Probability distribution is undefined.')
+        if self.total_strength <= 0:
+            self._rebuild()
+        while True:
+            index = self._find(random_value(rng) * self.total_strength)
+            # Rounding error in the tree's partial sums can rarely land a
+            # roll just past the last option or on an option with no
+            # strength, in which case the tree is rebuilt without the
+            # error and the roll is taken again
+            if (index < len(self.outcomes) and
+                    self._strengths[index] > 0 and
+                    self.outcomes[index] is not _REMOVED):
+                return index
+            self._rebuild()
+
+    def sample(self, as_index_and_value_tuple=False, rng=None):
+        """
+        Draw an option from the distribution.
+
+        Args:
+            as_index_and_value_tuple (bool): Option to return an
+                ``(index, value)`` tuple instead of just a single ``value``,
+                as in ``weighted_choice()``.
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            Any: If ``as_index_and_value_tuple is False``, any one of the
+            outcomes of the distribution
+
+            tuple (int, Any): If ``as_index_and_value_tuple is True``,
+            a 2-tuple of form ``(int, Any)`` corresponding to
+            ``(index, value)``.
+
+        Raises:
+            ProbabilityUndefinedError: if no option has a strength
+                greater than ``0``
+        """
+        index = self.sample_index(rng)
+        if as_index_and_value_tuple:
+            return (index, self.outcomes[index])
+        else:
+            return self.outcomes[index]
+
+    def sample_many(self, count, as_indices=False, rng=None):
+        """
+        Draw many options from the distribution at once.
+
+        If NumPy is installed, the cumulative strengths of the options are
+        computed once in ``O(n)`` time and searched for every roll in a
+        vectorized pass. Otherwise the options are drawn one at a time
+        with ``sample()``.
+
+        Args:
+            count (int): The number of options to draw
+            as_indices (bool): Option to return the indices of the picked
+                options instead of the options themselves.
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            numpy.ndarray: ``count`` picked outcomes,
+            or their indices if ``as_indices is True``
+
+            list: ``count`` picked outcomes or indices
+            if NumPy is not installed
+
+        Raises:
+            ProbabilityUndefinedError: if no option has a strength
+                greater than ``0``
+        """
+        numpy = _get_numpy()
+        if numpy is None:
+            indices = [self.sample_index(rng) for i in range(count)]
+            if as_indices:
+                return indices
+            else:
+                return [self.outcomes[i] for i in indices]
+        if self._positive_count <= 0:
+            raise ProbabilityUndefinedError(
+                'No item weights in DynamicDistribution are greater '
+                'than 0. Probability distribution is undefined.')
+        cumulative = numpy.cumsum(
+            numpy.maximum(numpy.array(self._strengths, dtype=float), 0))
+        if is_random_stream(rng):
+            rolls = numpy.asarray(rng.random_many(count))
+        else:
+            rolls = numpy_generator(rng).random(count)
+        # Options with no strength share their cumulative strength with
+        # the option before them, and are skipped by searching right
+        indices = numpy.searchsorted(cumulative, rolls * cumulative[-1],
+                                     side='right')
+        numpy.minimum(indices, numpy.flatnonzero(cumulative <
+                                                 cumulative[-1]).size,
+                      out=indices)
+        if as_indices:
+            return indices
+        else:
+            return _outcome_array(self.outcomes).take(indices)
+
+
+class NormalDistribution(ContinuousDistribution):
+    """
+    An exact normal distribution, optionally truncated to bounds.
+
+    Unlike ``normal_distribution()``, which approximates the curve with a
+    list of weights, this samples the true distribution directly by
+    inverting its cumulative distribution function. Values outside of
+    ``minimum`` and ``maximum`` are never drawn, and the distribution
+    within them keeps its shape.
+
+    Example:
+        >>> distribution = NormalDistribution(10, 3, minimum=0, maximum=20)
+        >>> distribution.sample()                              # doctest: +SKIP
+        9.412093415829166
+        >>> distribution.sample_many(3)                        # doctest: +SKIP
+        array([ 8.76161245, 12.42186087, 10.07327455])
+    """
+
+    def __init__(self, mean, variance, minimum=None, maximum=None):
+        """
+        Args:
+            mean (float): The mean of the distribution
+            variance (float): The variance of the distribution
+            minimum (float): The minimum outcome possible to
+                bound the distribution to
+            maximum (float): The maximum outcome possible to
+                bound the distribution to
+
+        Raises:
+            ValueError: if ``variance <= 0`` or ``maximum < minimum``
+            ProbabilityUndefinedError: if the bounds lie so far in a tail
+                of the distribution that it has no probability between them
+        """
+        if variance <= 0:
+            raise ValueError('variance must be greater than 0')
+        if (minimum is not None and maximum is not None and
+                maximum < minimum):
+            raise ValueError('maximum cannot be less than minimum')
+        self.mean = mean
+        self.variance = variance
+        self.minimum = minimum
+        self.maximum = maximum
+        self.standard_deviation = math.sqrt(variance)
+        # Standardized bounds
+        if minimum is None:
+            lower = float('-inf')
+        else:
+            lower = (minimum - mean) / self.standard_deviation
+        if maximum is None:
+            upper = float('inf')
+        else:
+            upper = (maximum - mean) / self.standard_deviation
+        # The cumulative distribution function loses precision in the
+        # upper tail, so bounds entirely above the mean are mirrored
+        # into the lower tail
+        self._mirrored = lower > 0
+        if self._mirrored:
+            lower, upper = -upper, -lower
+        self._lower = lower
+        self._upper = upper
+        self._cdf_lower = _standard_normal_cdf(lower)
+        self._cdf_upper = _standard_normal_cdf(upper)
+        if self._cdf_upper <= self._cdf_lower:
+            raise ProbabilityUndefinedError(
+                'The normal distribution has no probability between '
+                'minimum and maximum.')
+
+    def _inverse(self, fraction):
+        """Find the outcome below which ``fraction`` of the area lies."""
+        p = self._cdf_lower + ((self._cdf_upper - self._cdf_lower) * fraction)
+        # Keep p strictly between 0 and 1
+        p = min(max(p, _MIN_PROBABILITY), _MAX_PROBABILITY)
+        z = min(max(_standard_normal_ppf(p), self._lower), self._upper)
+        if self._mirrored:
+            z = -z
+        return self.mean + (self.standard_deviation * z)
+
+    def _inverse_array(self, fractions):
+        """Vectorized version of ``_inverse()`` over a NumPy array."""
+        numpy = _import_numpy()
+        p = self._cdf_lower + ((self._cdf_upper - self._cdf_lower) *
+                               numpy.asarray(fractions, dtype=float))
+        numpy.clip(p, _MIN_PROBABILITY, _MAX_PROBABILITY, out=p)
+        z = _standard_normal_ppf_array(p)
+        numpy.clip(z, self._lower, self._upper, out=z)
+        if self._mirrored:
+            z = -z
+        return self.mean + (self.standard_deviation * z)
+
+    def sample_many(self, count, rng=None):
+        """
+        Draw many values from the distribution at once.
+
+        If NumPy is installed, the values are drawn in a vectorized pass
+        from a NumPy ``Generator``. Otherwise they are drawn one at a time
+        with ``sample()``.
+
+        Args:
+            count (int): The number of values to draw
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
+
+        Returns:
+            numpy.ndarray: ``count`` values
+
+            list: ``count`` values if NumPy is not installed
+        """
+        if (self.minimum is None and self.maximum is None and
+                _get_numpy() is not None and not is_random_stream(rng)):
+            # Without bounds, NumPy can draw the values directly
+            return numpy_generator(rng).normal(
+                self.mean, self.standard_deviation, count)
+        return super(NormalDistribution, self).sample_many(count, rng)
+
+
+class WeightTable(tuple):
+    """
+    An immutable, pre-validated tuple of ``(outcome, strength)`` weights.
+
+    A ``WeightTable`` is validated once when it is created, and compiles
+    the samplers for its weights the first time they are needed.
+    Every function in ``rand`` which takes a list of weights also accepts
+    a ``WeightTable``, reusing its compiled samplers instead of
+    validating, sorting, and scanning the weights again on every call.
+    ``SoftObject`` 's given a ``WeightTable`` likewise skip re-checking it.
+
+    Because it is a ``tuple``, a ``WeightTable`` can be indexed and iterated
+    over exactly like the list of weights it was made from.
+
+    Example:
+        >>> table = WeightTable([(0, 1), (10, 5)])
+        >>> table
+        WeightTable([(0, 1), (10, 5)])
+        >>> table.is_numerical
+        True
+        >>> weighted_rand(table)                               # doctest: +SKIP
+        7.267261962714532
+    """
+
+    def __new__(cls, weights):
+        """
+        Args:
+            weights (list): a list of weights where each weight
+                is a tuple of form ``(Any, float or int)`` corresponding to
+                ``(outcome, strength)``.
+
+        Raises:
+            ValueError: if ``weights`` is empty
+            TypeError: if ``weights`` are not 2-tuples of form
+                ``(Any, float or int)``
+        """
+        if isinstance(weights, WeightTable):
+            return weights
+        weights = tuple(weights)
+        if not weights:
+            raise ValueError('WeightTable cannot be empty')
+        # Any real strength is accepted, including NumPy scalars
+        if not all(isinstance(w, tuple) and
+                   len(w) == 2 and
+                   isinstance(w[1], numbers.Real)
+                   for w in weights):
+            raise TypeError('WeightTable must be made of '
+                            '2-tuples of form (Any, int or float)')
+        table = tuple.__new__(cls, weights)
+        table.is_numerical = all(isinstance(w[0], numbers.Real)
+                                 for w in weights)
+        table._continuous = None
+        table._discrete = None
+        return table
+
+    def __repr__(self):
+        return 'WeightTable({})'.format(list(self))
+
+    def __getnewargs__(self):
+        return (tuple(self),)
+
+    @property
+    def continuous(self):
+        """
+        PiecewiseLinearDistribution: The distribution of the weights
+        treated as a weight curve, as used by ``weighted_rand()``.
+        Compiled on first use.
+
+        Raises:
+            TypeError: if the table's outcomes are not all numbers
+            ProbabilityUndefinedError: if the area under the curve
+                is not greater than ``0``
+        """
+        if self._continuous is None:
+            if not self.is_numerical:
+                raise TypeError('WeightTable outcomes must all be numbers '
+                                'to be used as a weight curve')
+            self._continuous = PiecewiseLinearDistribution(self)
+        return self._continuous
+
+    @property
+    def discrete(self):
+        """
+        DiscreteDistribution: The distribution of the weights treated as
+        discrete options, as used by ``weighted_choice()``.
+        Compiled on first use.
+
+        Raises:
+            ProbabilityUndefinedError: if no strength in the table
+                is greater than ``0``
+        """
+        if self._discrete is None:
+            self._discrete = DiscreteDistribution(self)
+        return self._discrete
+
+
+class WeightArrays(object):
+    """
+    Weights stored as two parallel sequences of outcomes and strengths.
+
+    Building a list of ``(outcome, strength)`` tuples can be a large part
+    of the cost of working with big distributions. Every function in
+    ``rand`` which takes a list of weights also accepts a ``WeightArrays``,
+    compiling its samplers straight from the two sequences, which may be
+    lists or NumPy arrays, without creating a tuple for every weight.
+
+    Indexing or iterating over a ``WeightArrays`` still gives
+    ``(outcome, strength)`` tuples, so it can stand in for a list
+    of weights anywhere.
+
+    Example:
+        >>> weights = WeightArrays([0, 5, 10], [1, 3, 0])
+        >>> len(weights)
+        3
+        >>> weights[1]
+        (5, 3)
+        >>> weighted_rand(weights)                             # doctest: +SKIP
+        4.152807319463227
+    """
+
+    def __init__(self, outcomes, strengths):
+        """
+        Args:
+            outcomes (list or numpy.ndarray): The outcome of every weight.
+                Outcome values may be of any type, though they must be
+                numbers for the weights to be used as a weight curve.
+            strengths (list or numpy.ndarray): The strength of every weight
+
+        Raises:
+            ValueError: if ``outcomes`` and ``strengths`` differ in length
+        """
+        if len(outcomes) != len(strengths):
+            raise ValueError(
+                'outcomes and strengths must be the same length')
+        self.outcomes = outcomes
+        self.strengths = strengths
+
+    def __len__(self):
+        return len(self.strengths)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return WeightArrays(self.outcomes[index], self.strengths[index])
+        return (self.outcomes[index], self.strengths[index])
+
+    def __iter__(self):
+        return iter(zip(self.outcomes, self.strengths))
+
+    def __repr__(self):
+        return 'WeightArrays({!r}, {!r})'.format(self.outcomes,
+                                                 self.strengths)
+
+
+###############################################################################
+# Methods
+###############################################################################
+# Weight lists built by normal_distribution(), keyed on its arguments
+_normal_distribution_cache = _LRUCache(128)
+
+# Marks weights in the _sampler_cache which have been seen once,
+# but not yet compiled
+_UNCOMPILED = object()
+
+# Compiled samplers built by weighted_rand() and weighted_choice(),
+# keyed on the content of the weights they were built from
+_sampler_cache = _LRUCache(256, placeholder=_UNCOMPILED)
+
+
+class _CacheKey(tuple):
+    """
+    A ``_sampler_cache`` key which hashes its content only once.
+
+    Keys of long weight lists are slow to hash, and a lookup followed by
+    an insertion would otherwise hash them several times.
+    """
+
+    def __new__(cls, items):
+        key = tuple.__new__(cls, items)
+        key._hash = tuple.__hash__(key)
+        return key
+
+    def __hash__(self):
+        return self._hash
+
+
+def _sampler_cache_key(kind, weights):
+    """
+    Build a ``_sampler_cache`` key from the content of a weight list.
+
+    Discrete samplers pick indices rather than outcomes, so they are
+    built from, and keyed on, the strengths of their options. Numerical
+    NumPy strengths are keyed on their raw bytes, like the columns of a
+    ``WeightArrays``.
+
+    Returns:
+        _CacheKey: A hashable key, or ``None`` if ``weights``
+        cannot be keyed
+    """
+    if kind == 'discrete':
+        items = (kind, _column_key(weights))
+    elif isinstance(weights, WeightArrays):
+        items = (kind, _column_key(weights.outcomes),
+                 _column_key(weights.strengths))
+    else:
+        items = (kind, tuple([(weight[0], weight[1]) for weight in weights]))
+    try:
+        return _CacheKey(items)
+    except TypeError:
+        return None
+
+
+def _cached_sampler(kind, weights, build, compile_now):
+    """
+    Look up a compiled sampler for weights in the ``_sampler_cache``.
+
+    Compiling a sampler only pays off if it is used more than once, so
+    weights seen for the first time are only remembered, and a sampler is
+    compiled and cached when the same weights are seen again.
+
+    Args:
+        kind (str): ``'continuous'`` or ``'discrete'``
+        weights (list or WeightArrays): The weights to compile, or the
+            strengths of options for ``'discrete'`` samplers
+        build (callable): Compiles a sampler from ``weights``
+        compile_now (bool): Whether to compile a sampler for weights seen
+            for the first time, as when it will draw many values at once
+
+    Returns:
+        The compiled sampler, or ``None`` if the weights should be used
+        directly instead
+    """
+    if not _sampler_cache.maxsize:
+        return build(weights) if compile_now else None
+    key = _sampler_cache_key(kind, weights)
+    if key is None:
+        return build(weights) if compile_now else None
+    sampler = _sampler_cache.get(key)
+    if sampler is None and not compile_now:
+        _sampler_cache.put(key, _UNCOMPILED)
+        return None
+    if sampler is None or sampler is _UNCOMPILED:
+        sampler = build(weights)
+        _sampler_cache.put(key, sampler)
+    return sampler
+
+
+def _compile_continuous(weights):
+    """
+    Get a ``PiecewiseLinearDistribution`` for a list of weights.
+
+    ``WeightTable`` 's reuse their own compiled distribution, and other
+    weight lists reuse any distribution in the ``_sampler_cache``.
+    Drawing from weights needs the curve built either way, so weights
+    seen for the first time are compiled and cached straight away.
+
+    Returns:
+        PiecewiseLinearDistribution: The compiled distribution
+    """
+    if isinstance(weights, WeightTable):
+        return weights.continuous
+    return _cached_sampler('continuous', weights,
+                           PiecewiseLinearDistribution, True)
+
+
+def _choice_strengths(weights):
+    """
+    Get the strengths of a list of options.
+
+    Numerical NumPy strengths are returned as-is, so that they can be
+    keyed in the ``_sampler_cache`` without converting every strength.
+    Use ``_strength_list()`` to convert them when they are scanned.
+
+    Args:
+        weights (list or WeightArrays): The options
+
+    Returns:
+        list or numpy.ndarray
+    """
+    if not isinstance(weights, WeightArrays):
+        return [weight[1] for weight in weights]
+    dtype = getattr(weights.strengths, 'dtype', None)
+    if dtype is not None and dtype.kind in 'biuf':
+        return weights.strengths
+    return _strength_list(weights.strengths)
+
+
+def _strength_list(strengths):
+    """Get a sequence of strengths, which may be a NumPy array, as a list."""
+    if isinstance(strengths, list):
+        return strengths
+    if hasattr(strengths, 'tolist'):
+        return strengths.tolist()
+    return list(strengths)
+
+
+def _positive_sum(strengths):
+    """
+    Sum the strengths of options which are greater than 0.
+
+    Raises:
+        ProbabilityUndefinedError: if no strength is greater than ``0``
+    """
+    if strengths and min(strengths) >= 0:
+        prob_sum = sum(strengths)
+    else:
+        prob_sum = sum([strength for strength in strengths if strength > 0])
+    if prob_sum <= 0:
+        raise ProbabilityUndefinedError(
+            'No item weights in weighted_choice() are greater than 0. '
+            'Probability distribution is undefined.')
+    return prob_sum
+
+
+def _choice_table(strengths):
+    """
+    Compile the running totals of the positive strengths of options.
+
+    Picking from the table with ``bisect`` picks the same option as
+    ``_scan_choice_index()`` does for the same roll.
+
+    Args:
+        strengths (list or numpy.ndarray): The strengths of the options
+
+    Returns:
+        tuple: The sum of the positive strengths, the running total at
+        every option, and the index of the last option with a positive
+        strength
+    """
+    strengths = _strength_list(strengths)
+    prob_sum = _positive_sum(strengths)
+    totals = []
+    total = 0
+    for index, strength in enumerate(strengths):
+        if strength > 0:
+            total += strength
+            last_index = index
+        totals.append(total)
+    return prob_sum, totals, last_index
+
+
+def _scan_choice_index(strengths, rng):
+    """
+    Pick the index of a weighted option with a single linear scan.
+
+    This is cheaper than compiling a ``_choice_table()`` for options
+    which are only picked from once.
+
+    Args:
+        strengths (list or numpy.ndarray): The strengths of the options
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness
+
+    Raises:
+        ProbabilityUndefinedError: if no strength is greater than ``0``
+    """
+    strengths = _strength_list(strengths)
+    target = random_value(rng) * _positive_sum(strengths)
+    total = 0
+    for index, strength in enumerate(strengths):
+        if strength > 0:
+            total += strength
+            if total > target:
+                return index
+    # Rounding error can leave a sliver past the last option
+    for index in range(len(strengths) - 1, -1, -1):
+        if strengths[index] > 0:
+            return index
+
+
+def _compile_rounded(distribution):
+    """
+    Get ``distribution.rounded()`` if it is narrow enough to compile.
+
+    Returns:
+        DiscreteDistribution: The rounded distribution, or ``None`` if
+        the curve spans more than ``_MAX_ROUNDED_WIDTH`` integers, in
+        which case drawn values should be rounded one at a time.
+    """
+    low, high = distribution.support
+    if high - low > _MAX_ROUNDED_WIDTH:
+        return None
+    return distribution.rounded()
+
+
+def sampler_cache_info():
+    """
+    Get statistics about the cache of compiled samplers.
+
+    ``weighted_rand()``, ``weighted_rand_many()`` and ``weighted_choice()``
+    keep the samplers they compile in a bounded cache, keyed on the
+    content of the weights they were given, and calling them again with
+    an equal list of weights reuses the cached sampler. ``weighted_choice()``
+    only compiles a sampler once the same options are seen a second time,
+    scanning them directly the first time.
+
+    Returns:
+        dict: A dict with the keys ``'hits'`` and ``'misses'``, the number
+        of lookups which did and did not find a compiled sampler (so
+        weights seen only once are always misses),
+        ``'maxsize'``, the most samplers the cache will hold,
+        and ``'currsize'``, the number it holds now.
+
+    Example:
+        >>> clear_sampler_cache()
+        >>> for i in range(3):
+        ...     value = weighted_rand([(0, 1), (5, 3)])
+        >>> sampler_cache_info()
+        {'hits': 2, 'misses': 1, 'maxsize': 256, 'currsize': 1}
+    """
+    return {'hits': _sampler_cache.hits,
+            'misses': _sampler_cache.misses,
+            'maxsize': _sampler_cache.maxsize,
+            'currsize': len(_sampler_cache)}
+
+
+def set_sampler_cache_size(maxsize):
+    """
+    Set the most compiled samplers kept by the sampler cache.
+
+    If the cache holds more than ``maxsize`` samplers,
+    the least recently used ones are discarded.
+
+    Args:
+        maxsize (int): The most samplers to cache.
+            ``0`` disables the cache.
+
+    Returns: None
+
+    Raises:
+        ValueError: if ``maxsize < 0``
+    """
+    if maxsize < 0:
+        raise ValueError('maxsize cannot be negative')
+    _sampler_cache.resize(maxsize)
+
 
+def clear_sampler_cache():
+    """
+    Discard every cached sampler and reset the hit and miss counts.
 
-def _is_valid_numerical_weights_list(value):
-    '''Check whether ``values`` is a valid argument for ``weighted_rand``.'''
-    return ((isinstance(value, list)) and
-            len(value) > 1 and
-            (all(isinstance(opt, tuple) and
-                 len(opt) == 2 and
-                 isinstance(opt[0], (int, float)) and
-                 isinstance(opt[1], (int, float))
-                 for opt in value)))
+    Returns: None
+    """
+    _sampler_cache.clear()
 
 
-###############################################################################
-# Methods
-###############################################################################
 def bound_weights(weights, minimum=None, maximum=None):
     """
     Bound a weight list so that all outcomes fit within specified bounds.
@@ -201,8 +2862,9 @@ def bound_weights(weights, minimum=None, maximum=None):
     than ``maximum``.
 
     Args:
-        weights (list): the list of weights where each weight
-            is a ``tuple`` of form ``(float, float)`` corresponding to
+        weights (list or WeightTable or WeightArrays): the list of
+            weights where each weight is a ``tuple`` of form
+            ``(float, float)`` corresponding to
             ``(outcome, weight)``. Must be sorted in increasing order
             of outcomes
         minimum (float): Lowest allowed outcome for the weight list
@@ -221,7 +2883,7 @@ def bound_weights(weights, minimum=None, maximum=None):
         [(1, 1), (2, 2), (3, 1)]
     """
     # Copy weights to avoid side-effects
-    bounded_weights = weights[:]
+    bounded_weights = list(weights)
     # Remove weights outside of minimum and maximum
     if minimum is not None and maximum is not None:
         if maximum < minimum:
@@ -240,12 +2902,13 @@ def bound_weights(weights, minimum=None, maximum=None):
         return bounded_weights
     # If weights were removed, attach new endpoints where they would have
     # appeared in the original curve
+    interpolator = _CurveInterpolator(weights)
     if (bounded_weights[0][0] > weights[0][0] and
             bounded_weights[0][0] != minimum):
-        bounded_weights.insert(0, (minimum, _linear_interp(weights, minimum)))
+        bounded_weights.insert(0, (minimum, interpolator(minimum)))
     if (bounded_weights[-1][0] < weights[-1][0] and
             bounded_weights[-1][0] != maximum):
-        bounded_weights.append((maximum, _linear_interp(weights, maximum)))
+        bounded_weights.append((maximum, interpolator(maximum)))
     return bounded_weights
 
 
@@ -254,6 +2917,10 @@ def normal_distribution(mean, variance,
     """
     Return a list of weights approximating a normal distribution.
 
+    Results are cached for the most recently used arguments, so repeated
+    calls with the same arguments only copy the cached list. To sample
+    the exact normal distribution, use ``NormalDistribution`` instead.
+
     Args:
         mean (float): The mean of the distribution
         variance (float): The variance of the distribution
@@ -281,6 +2948,11 @@ def normal_distribution(mean, variance,
         >>> rounded_weights
         [(1.34, 0.0), (4.8, 0.0), (8.27, 0.14), (11.73, 0.14), (15.2, 0.0)]
     """
+    key = (mean, variance, minimum, maximum, weight_count)
+    cached_weights = _normal_distribution_cache.get(key)
+    if cached_weights is not None:
+        # Copy the cached list so callers can safely modify it
+        return list(cached_weights)
     # Pin 0 to +- 5 sigma as bounds, or minimum and maximum
     # if they cross +/- sigma
     standard_deviation = math.sqrt(variance)
@@ -295,12 +2967,12 @@ def normal_distribution(mean, variance,
         )
         current_x += step
     if minimum is not None or maximum is not None:
-        return bound_weights(weights, minimum, maximum)
-    else:
-        return weights
+        weights = bound_weights(weights, minimum, maximum)
+    _normal_distribution_cache.put(key, weights)
+    return list(weights)
 
 
-def prob_bool(probability):
+def prob_bool(probability, rng=None):
     """
     Return ``True`` or ``False`` depending on ``probability``.
 
@@ -308,6 +2980,9 @@ def prob_bool(probability):
         probability (float): Probability between ``0`` and ``1``
             to return ``True`` where ``0`` is guaranteed to return
             ``False`` and ``1`` is guaranteed to return ``True``.
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
 
     Returns:
         bool: ``True`` or ``False`` depending on ``probability``.
@@ -320,15 +2995,18 @@ def prob_bool(probability):
         # Usually will be...
         False
     """
-    return random.uniform(0, 1) < probability
+    return random_value(rng) < probability
 
 
-def percent_possible(percent):
+def percent_possible(percent, rng=None):
     """
     Return True ``percent`` / 100 times.
 
     Args:
         percent (int or float): percent possibility to return True
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
 
     Returns:
         bool: Either ``True`` or ``False`` depending on ``percent``
@@ -341,10 +3019,10 @@ def percent_possible(percent):
         # Usually will be...
         False
     """
-    return random.uniform(0, 100) < percent
+    return uniform_value(0, 100, rng) < percent
 
 
-def pos_or_neg(value, prob_pos=0.5):
+def pos_or_neg(value, prob_pos=0.5, rng=None):
     """
     Return either positive or negative ``value`` based on ``prob_pos``.
 
@@ -356,6 +3034,9 @@ def pos_or_neg(value, prob_pos=0.5):
             where ``prob_pos = 0`` is guaranteed to return negative and
             ``prob_pos = 1`` is guaranteed to return positive.
             Default value is ``0.5``.
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
 
     Returns:
         int or float: ``value`` either positive or negative
@@ -368,10 +3049,10 @@ def pos_or_neg(value, prob_pos=0.5):
         # Usually will be...
         -42
     """
-    return abs(value) * pos_or_neg_1(prob_pos)
+    return abs(value) * pos_or_neg_1(prob_pos, rng)
 
 
-def pos_or_neg_1(prob_pos=0.5):
+def pos_or_neg_1(prob_pos=0.5, rng=None):
     """
     Return either ``1`` with probability of ``prob_pos``, otherwise ``-1``.
 
@@ -380,6 +3061,9 @@ def pos_or_neg_1(prob_pos=0.5):
             where ``prob_pos = 0`` is guaranteed to return negative and
             ``prob_pos = 1`` is guaranteed to return positive.
             Default value is ``0.5``.
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
 
     Returns:
         int: either ``1`` or ``-1``
@@ -392,31 +3076,335 @@ def pos_or_neg_1(prob_pos=0.5):
         # Usually will be...
         -1
     """
-    if random.uniform(0, 1) < prob_pos:
+    if random_value(rng) < prob_pos:
         return 1
     else:
         return -1
 
 
-def weighted_rand(weights, round_result=False):
+def _nested_shape(values):
+    """
+    Find the shape of nested lists or tuples, as ``numpy.shape()`` would.
+
+    Every list is assumed to hold lists of the same shape, so only the
+    first item at each level is checked.
+
+    Returns:
+        tuple(int): The length of each level of nesting
+    """
+    shape = ()
+    while isinstance(values, (list, tuple)):
+        shape += (len(values),)
+        if not values:
+            break
+        values = values[0]
+    return shape
+
+
+def _map_nested(values, function):
+    """Apply a function to every value in nested lists."""
+    if isinstance(values, list):
+        return [_map_nested(value, function) for value in values]
+    return function(values)
+
+
+def _bernoulli_nested(probability, shape, rng, scale):
+    """
+    Roll nested lists of ``bool`` values without NumPy.
+
+    This is the pure Python counterpart of ``_bernoulli_many()``.
+    Nested lists of thresholds are matched against the last axes of
+    ``shape``, and repeated along the others.
+
+    Args:
+        probability (float or list): The threshold, or nested lists of
+            thresholds, to compare rolls against
+        shape (tuple(int)): The shape of the values to roll
+        rng: A source of randomness. If ``None``,
+            the global ``random`` module is used.
+        scale (float): The scale of the rolls
+
+    Returns:
+        bool: The rolled value, if ``shape`` is empty
+
+        list: Nested lists of rolled values
+
+    Raises:
+        ValueError: if ``probability`` cannot be matched against ``shape``
+    """
+    depth = len(_nested_shape(probability))
+    if depth > len(shape):
+        raise ValueError('probability cannot be broadcast to count')
+    if not shape:
+        return random_value(rng) * scale < probability
+    if depth < len(shape):
+        return [_bernoulli_nested(probability, shape[1:], rng, scale)
+                for i in range(shape[0])]
+    if len(probability) != shape[0]:
+        raise ValueError('probability cannot be broadcast to count')
+    return [_bernoulli_nested(value, shape[1:], rng, scale)
+            for value in probability]
+
+
+def _bernoulli_many(probability, count, packed, rng, scale=1):
+    """
+    Roll many ``bool`` values, each ``True`` if a roll is below a threshold.
+
+    Every value takes one uniform roll, multiplied by ``scale`` and compared
+    against its entry in ``probability``, exactly as the single-value
+    functions compare a single roll.
+
+    Args:
+        probability (float or list or numpy.ndarray): The threshold, or
+            an array of thresholds, to compare rolls against
+        count (int or tuple(int)): The number or shape of values to roll.
+            If ``None``, the shape of ``probability`` is used.
+        packed (bool): Whether to pack the values into bits
+        rng: A source of randomness. If ``None``,
+            the global ``random`` module is used.
+        scale (float): The scale of the rolls
+
+    Returns:
+        numpy.ndarray: The rolled values
+
+        list: Nested lists of the rolled values if NumPy is not installed
+
+        bool: The rolled value if ``count is None`` and ``probability``
+        is a single value
+
+    Raises:
+        ValueError: if ``probability`` cannot be broadcast to ``count``
+        ImportError: if ``packed is True`` and NumPy is not installed
+    """
+    numpy = _get_numpy()
+    if numpy is None:
+        if packed:
+            _import_numpy()
+        if count is None:
+            shape = _nested_shape(probability)
+        elif isinstance(count, (list, tuple)):
+            shape = tuple(count)
+        else:
+            shape = (count,)
+        return _bernoulli_nested(probability, shape, rng, scale)
+    probabilities = numpy.asarray(probability, dtype=float)
+    if count is None:
+        shape = probabilities.shape
+    else:
+        shape = tuple(numpy.atleast_1d(count))
+    if probabilities.ndim:
+        probabilities = numpy.broadcast_to(probabilities, shape).reshape(-1)
+    if is_random_stream(rng):
+        draw = rng.random_many
+    else:
+        draw = numpy_generator(rng).random
+    width = shape[-1] if shape else 1
+    total = int(numpy.prod(shape, dtype=numpy.int64))
+    if packed:
+        # Pack each row of values into bytes along the last axis, a block
+        # of rows at a time so the rolls never take more than a block
+        row_count = total // width if width else 0
+        results = numpy.empty((row_count, -(-width // 8)), dtype=numpy.uint8)
+        block_rows = max(1, _BATCH_BLOCK_SIZE // max(width, 1))
+        for start in range(0, row_count, block_rows):
+            rows = min(block_rows, row_count - start)
+            thresholds = probabilities
+            if probabilities.ndim:
+                thresholds = probabilities[start * width:
+                                           (start + rows) * width]
+            mask = numpy.asarray(draw(rows * width)) * scale < thresholds
+            results[start:start + rows] = numpy.packbits(
+                mask.reshape(rows, width), axis=1)
+        return results.reshape(shape[:-1] + (results.shape[1],))
+    results = numpy.empty(total, dtype=bool)
+    for start in range(0, total, _BATCH_BLOCK_SIZE):
+        size = min(_BATCH_BLOCK_SIZE, total - start)
+        thresholds = probabilities
+        if probabilities.ndim:
+            thresholds = probabilities[start:start + size]
+        results[start:start + size] = (
+            numpy.asarray(draw(size)) * scale < thresholds)
+    if not shape:
+        return bool(results[0])
+    return results.reshape(shape)
+
+
+def prob_bool_many(probability, count=None, packed=False, rng=None):
+    """
+    Return many ``True`` or ``False`` values depending on ``probability``.
+
+    This is the batch counterpart of ``prob_bool()``, useful for rolling a
+    value for every cell of a grid or every member of a population at
+    once. ``probability`` may be a single probability shared by every
+    value, or an array holding a probability for each value.
+
+    If NumPy is installed, the values are rolled in vectorized passes and
+    returned as a boolean array. With ``packed=True``, they are packed
+    eight to a byte along the last axis with ``numpy.packbits()``, using an
+    eighth of the memory. Otherwise they are returned in a list.
+
+    Args:
+        probability (float or list or numpy.ndarray): Probability between
+            ``0`` and ``1`` for each value to be ``True``, or an array of
+            probabilities broadcastable to ``count``.
+        count (int or tuple(int)): The number of values, or the shape of
+            the array of values, to return. Defaults to the shape of
+            ``probability``.
+        packed (bool): Option to pack the values into bits of a ``uint8``
+            array, whose last axis has ``ceil(n / 8)`` bytes for ``n``
+            values. They can be unpacked again with
+            ``numpy.unpackbits(packed_values, axis=-1, count=n)``.
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        numpy.ndarray: A ``bool`` array of values, or a ``uint8`` array of
+        their bits if ``packed is True``
+
+        list: The values, in nested lists for a ``tuple`` ``count``,
+        if NumPy is not installed
+
+        bool: A single value if ``count is None`` and ``probability`` is a
+        single value
+
+    Raises:
+        ValueError: if ``probability`` cannot be broadcast to ``count``
+        ImportError: if ``packed is True`` and NumPy is not installed
+
+    Example:
+        >>> prob_bool_many(0.5, 6)                             # doctest: +SKIP
+        array([ True, False, False,  True,  True, False])
+        >>> prob_bool_many([0, 0.5, 1])                        # doctest: +SKIP
+        array([False,  True,  True])
+        >>> prob_bool_many(0.5, (2, 10), packed=True)          # doctest: +SKIP
+        array([[109,  64],
+               [ 22, 128]], dtype=uint8)
+    """
+    return _bernoulli_many(probability, count, packed, rng)
+
+
+def percent_possible_many(percent, count=None, packed=False, rng=None):
+    """
+    Return many values, each ``True`` ``percent`` / 100 times.
+
+    This is the batch counterpart of ``percent_possible()``,
+    and otherwise works exactly like ``prob_bool_many()``.
+
+    Args:
+        percent (int or float or list or numpy.ndarray): percent
+            possibility for each value to be ``True``, or an array of
+            percents broadcastable to ``count``.
+        count (int or tuple(int)): The number of values, or the shape of
+            the array of values, to return. Defaults to the shape of
+            ``percent``.
+        packed (bool): Option to pack the values into bits of a ``uint8``
+            array as in ``prob_bool_many()``.
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        numpy.ndarray: A ``bool`` array of values, or a ``uint8`` array of
+        their bits if ``packed is True``
+
+        list: The values, in nested lists for a ``tuple`` ``count``,
+        if NumPy is not installed
+
+        bool: A single value if ``count is None`` and ``percent`` is a
+        single value
+
+    Raises:
+        ValueError: if ``percent`` cannot be broadcast to ``count``
+        ImportError: if ``packed is True`` and NumPy is not installed
+
+    Example:
+        >>> percent_possible_many(90, 4)                       # doctest: +SKIP
+        array([ True,  True, False,  True])
+    """
+    return _bernoulli_many(percent, count, packed, rng, scale=100)
+
+
+def pos_or_neg_1_many(prob_pos=0.5, count=None, rng=None):
+    """
+    Return many values, each ``1`` with probability of ``prob_pos``,
+    otherwise ``-1``.
+
+    This is the batch counterpart of ``pos_or_neg_1()``. If NumPy is
+    installed, the values are rolled in vectorized passes and returned
+    as an ``int8`` array, ready to multiply other arrays by.
+    Otherwise they are returned in a list.
+
+    Args:
+        prob_pos (float or list or numpy.ndarray): The probability for
+            each value to be positive ``1``, or an array of probabilities
+            broadcastable to ``count``. Default value is ``0.5``.
+        count (int or tuple(int)): The number of values, or the shape of
+            the array of values, to return. Defaults to the shape of
+            ``prob_pos``.
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        numpy.ndarray: An ``int8`` array of ``1`` and ``-1`` values
+
+        list: The values, in nested lists for a ``tuple`` ``count``,
+        if NumPy is not installed
+
+        int: A single value if ``count is None`` and ``prob_pos`` is a
+        single value
+
+    Raises:
+        ValueError: if ``prob_pos`` cannot be broadcast to ``count``
+
+    Example:
+        >>> pos_or_neg_1_many(0.5, 5)                          # doctest: +SKIP
+        array([ 1, -1, -1,  1, -1], dtype=int8)
+    """
+    positive = _bernoulli_many(prob_pos, count, False, rng)
+    numpy = _get_numpy()
+    if isinstance(positive, bool):
+        return 1 if positive else -1
+    if numpy is None:
+        return _map_nested(positive, lambda value: 1 if value else -1)
+    signs = positive.astype(numpy.int8)
+    signs *= 2
+    signs -= 1
+    return signs
+
+
+def weighted_rand(weights, round_result=False, rng=None):
     """
     Generate a non-uniform random value based on a list of weight tuples.
 
     Treats weights as coordinates for a probability distribution curve and
     rolls accordingly. Constructs a piece-wise linear curve according to
-    coordinates given in ``weights`` and rolls random values in the
-    curve's bounding box until a value is found under the curve
+    coordinates given in ``weights`` and draws a value from it by inverting
+    the cumulative area under the curve.
 
     Weight tuples should be of the form: (outcome, strength).
 
+    The compiled curve is kept in a bounded cache (see
+    ``sampler_cache_info()``), so calling this again with an equal list
+    of weights skips sorting and validating them.
+    When drawing many values from the same weights, building a
+    ``PiecewiseLinearDistribution`` once and calling its ``sample()``
+    method is faster still.
+
     Args:
-        weights: (list): the list of weights where each weight
-            is a tuple of form ``(float, float)`` corresponding to
+        weights (list or WeightTable or WeightArrays): the list of
+            weights where each weight is a tuple of form
+            ``(float, float)`` corresponding to
             ``(outcome, strength)``.
             Weights with strength ``0`` or less will have no chance to be
             rolled. The list must be sorted in increasing order of outcomes.
         round_result (bool): Whether or not to round the resulting value
-            to the nearest integer.
+            to the nearest integer. Rounded values are drawn with
+            ``PiecewiseLinearDistribution.sample_rounded()``.
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
 
     Returns:
         float: A weighted random number
@@ -433,44 +3421,98 @@ def weighted_rand(weights, round_result=False):
     if len(weights) == 1:
         return weights[0][0]
 
-    # Is there a way to do this more efficiently? Maybe even require that
-    # ``weights`` already be sorted?
-    weights = sorted(weights, key=lambda w: w[0])
-
-    x_min = weights[0][0]
-    x_max = weights[-1][0]
-    y_min = 0
-    y_max = max([point[1] for point in weights])
-
-    # Roll random numbers until a valid one is found
-    attempt_count = 0
-    while attempt_count < 500000:
-        # Get sample point
-        sample = (random.uniform(x_min, x_max), random.uniform(y_min, y_max))
-        if _point_under_curve(weights, sample):
-            # The sample point is under the curve
-            if round_result:
-                return int(round(sample[0]))
-            else:
-                return sample[0]
-        attempt_count += 1
-    else:
+    try:
+        distribution = _compile_continuous(weights)
+    except ProbabilityUndefinedError:
         warnings.warn(
-             'Point not being found in weighted_rand() after 500000 '
-             'attempts, defaulting to a random weight point. '
+             'No area found under the curve passed to weighted_rand(), '
+             'defaulting to a random weight point. '
              'If this happens often, it is probably a bug.')
-        return random.choice(weights)[0]
+        return random_item(weights, rng)[0]
+    if round_result:
+        return distribution.sample_rounded(rng)
+    return distribution.sample(rng)
+
+
+def weighted_rand_many(weights, count, round_result=False, rng=None):
+    """
+    Generate many non-uniform random values from one list of weight tuples.
+
+    This is the batch counterpart of ``weighted_rand()``. If NumPy is
+    installed, every value is drawn in a single vectorized pass. Otherwise
+    the values are drawn one at a time and returned in a list.
+
+    Args:
+        weights (list or WeightTable or WeightArrays): the list of
+            weights where each weight is a tuple of form
+            ``(float, float)`` corresponding to
+            ``(outcome, strength)``.
+            Weights with strength ``0`` or less will have no chance to be
+            rolled.
+        count (int): The number of values to generate
+        round_result (bool): Whether or not to round the resulting values
+            to the nearest integer. Rounded values are drawn directly from
+            the curve's compiled distribution of rounded values (see
+            ``PiecewiseLinearDistribution.rounded()``).
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        numpy.ndarray: ``count`` weighted random numbers, of ``int``
+        type if ``round_result is True``
+
+        list: ``count`` weighted random numbers if NumPy is not installed
+
+    Raises:
+        ProbabilityUndefinedError: if the area under the curve defined
+            by ``weights`` is not greater than ``0``
+
+    Example:
+        >>> weighted_rand_many([(-3, 4), (0, 10), (5, 1)], 3)  # doctest: +SKIP
+        array([-0.65061227,  1.46123101, -2.19804339])
+        >>> weighted_rand_many([(-3, 4), (0, 10), (5, 1)], 3,
+        ...                    round_result=True)              # doctest: +SKIP
+        array([-1,  0,  2])
+    """
+    numpy = _get_numpy()
+    # If just one weight is passed, every value is the weight's name
+    if len(weights) == 1:
+        if numpy is None:
+            return [weights[0][0]] * count
+        return numpy.full(count, weights[0][0])
+    distribution = _compile_continuous(weights)
+    if round_result:
+        rounded = _compile_rounded(distribution)
+        if rounded is not None:
+            return rounded.sample_many(count, rng=rng)
+    results = distribution.sample_many(count, rng)
+    if not round_result:
+        return results
+    elif numpy is None:
+        return [int(math.floor(result + 0.5)) for result in results]
+    else:
+        return numpy.floor(results + 0.5).astype(int)
 
 
-def weighted_choice(weights, as_index_and_value_tuple=False):
+def weighted_choice(weights, as_index_and_value_tuple=False, rng=None):
     """
     Generate a non-uniform random choice based on a list of option tuples.
 
     Treats each outcome as a discreet unit with a chance to occur.
 
+    Options are picked with a single linear scan. For the same long list
+    of options drawn from repeatedly, the running totals of its strengths
+    are kept in a bounded cache (see ``sampler_cache_info()``), so later
+    calls with them pick with a binary search. Both pick the same option
+    for the same ``rng``. When picking many times from the same options,
+    building a ``DiscreteDistribution`` once and calling its ``sample()``
+    method is faster still.
+
     Args:
-        weights (list): a list of options where each option
-            is a tuple of form ``(Any, float)`` corresponding to
+        weights (list or WeightTable or WeightArrays): a list of
+            options where each option is a tuple of form
+            ``(Any, float)`` corresponding to
             ``(outcome, strength)``. Outcome values may be of any type.
             Options with strength ``0`` or less will have no chance to be
             chosen.
@@ -478,6 +3520,9 @@ def weighted_choice(weights, as_index_and_value_tuple=False):
             tuple instead of just a single ``value``. This is useful when
             multiple outcomes in ``weights`` are the same and you need to know
             exactly which one was picked.
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
 
     Returns:
         Any: If ``as_index_and_value_tuple is False``, any one of the items in
@@ -499,39 +3544,136 @@ def weighted_choice(weights, as_index_and_value_tuple=False):
     """
     if not len(weights):
         raise ValueError('List passed to weighted_choice() cannot be empty.')
-    # Construct a line segment where each weight outcome is
-    # allotted a length equal to the outcome's weight,
-    # pick a uniformally random point along the line, and take
-    # the outcome that point corresponds to
-    prob_sum = sum(w[1] for w in weights)
+    if isinstance(weights, WeightTable):
+        return weights.discrete.sample(as_index_and_value_tuple, rng)
+    strengths = _choice_strengths(weights)
+    # Tables from the cache may belong to another equally weighted
+    # list, so only take the index from them
+    table = None
+    if len(strengths) >= _MIN_CACHED_CHOICES:
+        table = _cached_sampler('discrete', strengths, _choice_table, False)
+    if table is None:
+        index = _scan_choice_index(strengths, rng)
+    else:
+        prob_sum, totals, last_index = table
+        index = min(bisect.bisect_right(totals, random_value(rng) * prob_sum),
+                    last_index)
+    if as_index_and_value_tuple:
+        return (index, weights[index][0])
+    else:
+        return weights[index][0]
+
+
+def weighted_choice_many(weights, count, as_indices=False, rng=None):
+    """
+    Generate many non-uniform random choices from one list of option tuples.
+
+    This is the batch counterpart of ``weighted_choice()``, picking every
+    option with a single cumulative sum of the strengths and a binary
+    search for each choice. If NumPy is installed, the searches are done
+    in a single vectorized pass. Otherwise the choices are returned
+    in a list.
+
+    Args:
+        weights (list or WeightTable or WeightArrays): a list of
+            options where each option is a tuple of form
+            ``(Any, float)`` corresponding to
+            ``(outcome, strength)``. Outcome values may be of any type.
+            Options with strength ``0`` or less will have no chance to be
+            chosen.
+        count (int): The number of choices to make
+        as_indices (bool): Option to return the indices of the picked
+            options in ``weights`` instead of their outcomes. This is useful
+            when multiple outcomes in ``weights`` are the same and you need
+            to know exactly which ones were picked.
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        numpy.ndarray: ``count`` outcomes of ``weights``,
+        or their indices if ``as_indices is True``
+
+        list: ``count`` outcomes or indices if NumPy is not installed
+
+    Raises:
+        ValueError: if ``weights`` is empty
+        ProbabilityUndefinedError: if no strength in ``weights``
+            is greater than ``0``
+
+    Example:
+        >>> choices = [('choice one', 10), ('choice two', 3)]
+        >>> weighted_choice_many(choices, 3)                   # doctest: +SKIP
+        array(['choice one', 'choice two', 'choice one'], dtype='<U10')
+        >>> weighted_choice_many(choices, 3,
+        ...                      as_indices=True)              # doctest: +SKIP
+        array([0, 0, 1])
+    """
+    if not len(weights):
+        raise ValueError(
+            'List passed to weighted_choice_many() cannot be empty.')
+    if isinstance(weights, WeightTable):
+        return weights.discrete.sample_many(count, as_indices, rng)
+    outcomes, strengths = _weight_columns(weights)
+    numpy = _get_numpy()
+    if numpy is None:
+        cumulative = []
+        prob_sum = 0
+        for strength in strengths:
+            prob_sum += max(strength, 0)
+            cumulative.append(prob_sum)
+    else:
+        strengths = numpy.asarray(strengths, dtype=float)
+        cumulative = numpy.cumsum(numpy.maximum(strengths, 0))
+        prob_sum = cumulative[-1]
     if prob_sum <= 0:
         raise ProbabilityUndefinedError(
-            'No item weights in weighted_choice() are greater than 0. '
+            'No item weights in weighted_choice_many() are greater than 0. '
             'Probability distribution is undefined.')
-    sample = random.uniform(0, prob_sum)
-    current_pos = 0
-    i = 0
-    while i < len(weights):
-        if current_pos <= sample <= (current_pos + weights[i][1]):
-            if as_index_and_value_tuple:
-                return (i, weights[i][0])
-            else:
-                return weights[i][0]
-        current_pos += weights[i][1]
-        i += 1
+    # Options with no strength share their cumulative value with the
+    # option before them, and are skipped by searching to the right.
+    # Rounding error can leave a sliver past the last option with
+    # any strength, which is picked instead.
+    if numpy is None:
+        last_index = bisect.bisect_left(cumulative, prob_sum)
+        indices = [min(bisect.bisect_right(cumulative,
+                                           random_value(rng) * prob_sum),
+                       last_index)
+                   for i in range(count)]
+        if as_indices:
+            return indices
+        else:
+            return [outcomes[i] for i in indices]
+    if is_random_stream(rng):
+        samples = rng.random_many(count) * prob_sum
+    else:
+        samples = numpy_generator(rng).random(count) * prob_sum
+    indices = numpy.searchsorted(cumulative, samples, side='right')
+    numpy.minimum(indices, numpy.flatnonzero(cumulative < prob_sum).size,
+                  out=indices)
+    if as_indices:
+        return indices
     else:
-        raise AssertionError('Something went wrong in weighted_choice(). '
-                             'Please submit a bug report!')
+        return _outcome_array(outcomes).take(indices)
 
 
-def weighted_order(weights):
+def weighted_order(weights, rng=None):
     """
     Non-uniformally order a list according to weighted priorities.
 
     ``weights`` is a list of tuples of form ``(Any, float or int)``
-    corresponding to ``(item, strength)``. The output list is constructed
-    by repeatedly calling ``weighted_choice()`` on the weights, adding items
-    to the end of the list as they are picked.
+    corresponding to ``(item, strength)``. The output list is distributed
+    as if it were constructed by repeatedly calling ``weighted_choice()``
+    on the remaining weights, adding items to the end of the list as they
+    are picked.
+
+    Rather than actually picking items one at a time, every item is given
+    an exponentially distributed random key scaled by its strength, and
+    the items are sorted by their keys (the Efraimidis-Spirakis method).
+    This takes ``O(n log n)`` time instead of ``O(n ** 2)``. If NumPy is
+    installed, the keys are drawn and sorted in a single vectorized pass.
+    To pick only the first few items, ``weighted_sample()`` is faster
+    still.
 
     Higher strength weights will have a higher chance of appearing near the
     beginning of the output list.
@@ -545,11 +3687,12 @@ def weighted_order(weights):
     Passing an empty list will return an empty list.
 
     Args:
-        weights (list): a list of tuples of form ``(Any, float or int)``
-            corresponding to ``(item, strength)``. The output list is
-            constructed by repeatedly calling ``weighted_choice()`` on
-            the weights, appending items to the output list
-            as they are picked.
+        weights (list or WeightTable or WeightArrays): a list of tuples
+            of form ``(Any, float or int)`` corresponding to
+            ``(item, strength)``.
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
 
     Returns:
         list: the newly ordered list
@@ -566,14 +3709,394 @@ def weighted_order(weights):
     """
     if not len(weights):
         return []
-    if any(w[1] <= 0 for w in weights):
+    outcomes, strengths = _weight_columns(weights)
+    numpy = _get_numpy()
+    if numpy is not None:
+        strengths = numpy.asarray(strengths, dtype=float)
+        if (strengths <= 0).any():
+            raise ProbabilityUndefinedError(
+                'All weight values must be greater than 0.')
+        if is_random_stream(rng):
+            rolls = numpy.asarray(rng.random_many(len(strengths)))
+        else:
+            rolls = numpy_generator(rng).random(len(strengths))
+        keys = -numpy.log1p(-rolls) / strengths
+        return _outcome_array(outcomes).take(numpy.argsort(keys)).tolist()
+    if any(strength <= 0 for strength in strengths):
+        raise ProbabilityUndefinedError(
+            'All weight values must be greater than 0.')
+    # The item with the lowest key is distributed exactly like a
+    # weighted_choice() pick, and so on for the remaining items
+    keys = [_rng_expovariate(rng, strength) for strength in strengths]
+    order = sorted(range(len(weights)), key=keys.__getitem__)
+    return [outcomes[i] for i in order]
+
+
+def weighted_sample(weights, k, rng=None):
+    """
+    Pick ``k`` distinct items from a list according to weighted priorities.
+
+    The picked items are distributed exactly like the first ``k`` items of
+    ``weighted_order()`` on the same weights, as if each were picked by
+    calling ``weighted_choice()`` on the weights not yet picked.
+
+    Every item is given an exponentially distributed random key scaled by
+    its strength, as in ``weighted_order()``, but rather than sorting every
+    key, the keys are heapified in ``O(n)`` time and only the ``k`` lowest
+    are popped, taking ``O(n + k log n)`` time in all.
+
+    If any weight strengths are ``<= 0``, a ``ProbabilityUndefinedError``
+    is raised.
+
+    Args:
+        weights (list or WeightTable or WeightArrays): a list of tuples
+            of form ``(Any, float or int)`` corresponding to
+            ``(item, strength)``.
+        k (int): The number of items to pick
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        list: The picked items, in the order they were picked. If ``k`` is
+        greater than the number of items, every item is returned.
+
+    Raises:
+        ValueError: if ``k < 0``
+        ProbabilityUndefinedError: if any weight's strength is below 0.
+
+    Example:
+        >>> weights = [('red', 10), ('green', 5), ('blue', 1), ('grey', 1)]
+        >>> weighted_sample(weights, 2)                        # doctest: +SKIP
+        ['red', 'blue']
+    """
+    if k < 0:
+        raise ValueError('k cannot be negative')
+    if not len(weights):
+        return []
+    outcomes, strengths = _weight_columns(weights)
+    if any(strength <= 0 for strength in strengths):
+        raise ProbabilityUndefinedError(
+            'All weight values must be greater than 0.')
+    keys = [(_rng_expovariate(rng, strength), i)
+            for i, strength in enumerate(strengths)]
+    heapq.heapify(keys)
+    return [outcomes[heapq.heappop(keys)[1]]
+            for i in range(min(k, len(keys)))]
+
+
+def weighted_sample_many(weights, k, count, as_indices=False, rng=None):
+    """
+    Pick many independent sets of ``k`` distinct weighted items at once.
+
+    This is the batch counterpart of ``weighted_sample()``. If NumPy is
+    installed, the keys of every set are rolled at once, and the ``k``
+    lowest keys of each set are found by partitioning rather than sorting,
+    in vectorized passes over blocks of sets. Otherwise the sets are picked
+    one at a time with ``weighted_sample()``.
+
+    Args:
+        weights (list or WeightTable or WeightArrays): a list of tuples
+            of form ``(Any, float or int)`` corresponding to
+            ``(item, strength)``.
+        k (int): The number of items in each set
+        count (int): The number of sets to pick
+        as_indices (bool): Option to return the indices of the picked
+            items in ``weights`` instead of the items themselves.
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        numpy.ndarray: An array of shape ``(count, k)`` holding one set of
+        picked items, or their indices if ``as_indices is True``, in every
+        row. If ``k`` is greater than the number of items, every row holds
+        every item.
+
+        list: ``count`` lists of picked items or indices
+        if NumPy is not installed
+
+    Raises:
+        ValueError: if ``k < 0``
+        ProbabilityUndefinedError: if any weight's strength is below 0.
+
+    Example:
+        >>> weights = [('red', 10), ('green', 5), ('blue', 1), ('grey', 1)]
+        >>> weighted_sample_many(weights, 2, 3)                # doctest: +SKIP
+        array([['red', 'green'],
+               ['green', 'red'],
+               ['red', 'grey']], dtype='<U5')
+    """
+    if k < 0:
+        raise ValueError('k cannot be negative')
+    outcomes, strengths = _weight_columns(weights)
+    numpy = _get_numpy()
+    if numpy is None:
+        if as_indices:
+            indexed = list(zip(range(len(strengths)), strengths))
+            return [weighted_sample(indexed, k, rng) for i in range(count)]
+        return [weighted_sample(weights, k, rng) for i in range(count)]
+    strengths = numpy.asarray(strengths, dtype=float)
+    if (strengths <= 0).any():
         raise ProbabilityUndefinedError(
             'All weight values must be greater than 0.')
-    working_list = weights[:]
-    output_list = []
-    while working_list:
-        picked_item = weighted_choice(working_list,
-                                      as_index_and_value_tuple=True)
-        output_list.append(picked_item[1])
-        del working_list[picked_item[0]]
-    return output_list
+    item_count = len(strengths)
+    k = min(k, item_count)
+    indices = numpy.empty((count, k), dtype=numpy.intp)
+    if is_random_stream(rng):
+        draw = rng.random_many
+    else:
+        draw = numpy_generator(rng).random
+    # Work in blocks of sets small enough for their keys to stay in cache
+    block_rows = max(1, _BATCH_BLOCK_SIZE // max(item_count, 1))
+    for start in range(0, count if k else 0, block_rows):
+        rows = min(block_rows, count - start)
+        rolls = numpy.asarray(draw(rows * item_count))
+        keys = -numpy.log1p(-rolls.reshape(rows, item_count)) / strengths
+        if k < item_count:
+            lowest = numpy.argpartition(keys, k - 1, axis=1)[:, :k]
+        else:
+            lowest = numpy.broadcast_to(numpy.arange(item_count),
+                                        (rows, item_count))
+        order = numpy.argsort(numpy.take_along_axis(keys, lowest, axis=1),
+                              axis=1)
+        indices[start:start + rows] = numpy.take_along_axis(
+            lowest, order, axis=1)
+    if as_indices:
+        return indices
+    else:
+        return _outcome_array(outcomes).take(indices)
+
+
+def weighted_choice_stream(iterable, k=1, rng=None):
+    """
+    Pick up to ``k`` weighted items from an iterable in a single pass.
+
+    The iterable may be of any length, including unknown lengths such as
+    generators, files and database cursors. It is read exactly once,
+    and only the ``k`` items picked so far are held in memory.
+
+    Like ``weighted_order()``, every item is given an exponentially
+    distributed random key scaled by its strength, and the items with the
+    ``k`` lowest keys are kept (the A-Res algorithm of Efraimidis and
+    Spirakis). Once ``k`` items are kept, rather than rolling a key for
+    every item, the total strength of items to skip before one beats the
+    kept keys is rolled directly (their A-ExpJ variant), so only
+    ``O(k log(n / k))`` random numbers are rolled over ``n`` items.
+
+    The picked items are distributed exactly like the first ``k`` items of
+    ``weighted_order()`` on the same weights, so ``k=1`` picks an item
+    exactly like ``weighted_choice()``.
+
+    Items with strength ``0`` or less have no chance to be picked.
+
+    Args:
+        iterable (iterable): the weights to pick from, where each weight
+            is a tuple of form ``(Any, float or int)`` corresponding to
+            ``(outcome, strength)``.
+        k (int): The most items to pick
+        rng (random.Random or numpy.random.Generator): An optional
+            source of randomness to use instead of the global
+            ``random`` module.
+
+    Returns:
+        list: The outcomes of the picked items, in the order they would
+        appear in ``weighted_order()``. If fewer than ``k`` items have
+        a strength above ``0``, every one of them is returned.
+
+    Raises:
+        ValueError: if ``k < 0``
+
+    Example:
+        >>> lines = (('line {}'.format(i), i % 7) for i in range(10000))
+        >>> weighted_choice_stream(lines, k=3)                 # doctest: +SKIP
+        ['line 1308', 'line 4326', 'line 5766']
+    """
+    if k < 0:
+        raise ValueError('k cannot be negative')
+    if k == 0:
+        return []
+    # A heap of the kept items as (-key, index, outcome),
+    # with the highest kept key on top
+    reservoir = []
+    # The strength left to skip before the next item is kept
+    skip = 0
+    for index, (outcome, strength) in enumerate(iterable):
+        if strength <= 0:
+            continue
+        if len(reservoir) < k:
+            key = _rng_expovariate(rng, strength)
+            heapq.heappush(reservoir, (-key, index, outcome))
+        else:
+            skip -= strength
+            if skip > 0:
+                continue
+            # Roll a key for the item, given that it beats the threshold
+            threshold = -reservoir[0][0]
+            key = -math.log1p(random_value(rng) *
+                              math.expm1(-strength * threshold)) / strength
+            heapq.heapreplace(reservoir, (-key, index, outcome))
+        if len(reservoir) == k:
+            threshold = -reservoir[0][0]
+            if threshold > 0:
+                skip = _rng_expovariate(rng, threshold)
+            else:
+                skip = float('inf')
+    return [outcome for key, index, outcome in sorted(reservoir,
+                                                      reverse=True)]
+
+
+def fit(samples, bins=None, method='histogram', bandwidth=None,
+        return_weights=False):
+    """
+    Compile a distribution which draws values like a set of observations.
+
+    With ``method='histogram'``, the samples are counted into bins and the
+    compiled distribution draws uniformly within each bin, with a chance
+    proportional to its count. With ``method='kde'``, every sample is
+    smoothed into a normal curve of standard deviation ``bandwidth``
+    (a Gaussian kernel density estimate), and the curve is evaluated at
+    ``bins`` evenly spaced outcomes.
+
+    Both methods work in a single vectorized pass over the samples;
+    the kernel density estimate counts the samples onto its grid of
+    outcomes first and then smooths the counts, so its cost grows with
+    the number of samples plus the number of bins squared, not their
+    product.
+
+    The result is a ``PiecewiseLinearDistribution``, so it can be sampled,
+    evaluated and summarized like any other. Its weights can also be
+    returned as a list of ``(outcome, strength)`` tuples for use with
+    ``weighted_rand()``, ``SoftFloat`` and other functions taking
+    weights, where the strengths are probability densities.
+
+    Requires NumPy.
+
+    Args:
+        samples (numpy.ndarray or list): The observed values
+        bins (int or str or numpy.ndarray): With ``method='histogram'``,
+            the bins to count samples into, as accepted by
+            ``numpy.histogram()``: a number of bins, a sequence of bin
+            edges, or the name of a rule for choosing them. Defaults to
+            ``'auto'``. With ``method='kde'``, the number of outcomes to
+            evaluate the smoothed curve at. Defaults to ``256``.
+        method (str): ``'histogram'`` or ``'kde'``
+        bandwidth (float): The standard deviation of the normal curve
+            each sample is smoothed into with ``method='kde'``.
+            Defaults to Silverman's rule of thumb.
+        return_weights (bool): Whether to return the weights of the
+            distribution along with it
+
+    Returns:
+        PiecewiseLinearDistribution: The fitted distribution
+
+        tuple(PiecewiseLinearDistribution, list): The fitted distribution
+        and its weights if ``return_weights`` is ``True``
+
+    Raises:
+        ValueError: if there are no samples, any sample is not finite,
+            ``method`` is not known, ``bandwidth <= 0``, or no bandwidth
+            is given with ``method='kde'`` and every sample is equal
+        ImportError: if NumPy is not installed
+
+    Example:
+        >>> durations = [0.25, 0.25, 0.5, 0.25, 1, 0.5, 0.75, 0.25]
+        >>> distribution, weights = fit(  # doctest: +REQUIRES_NUMPY
+        ...     durations, bins=2, return_weights=True)
+        >>> [(outcome, round(strength, 2))
+        ...  for outcome, strength in weights]       # doctest: +REQUIRES_NUMPY
+        [(0.25, 2.0), (0.625, 2.0), (0.625, 0.67), (1.0, 0.67)]
+        >>> distribution.sample()                              # doctest: +SKIP
+        0.3914810227630391
+    """
+    numpy = _import_numpy()
+    samples = numpy.asarray(samples, dtype=float).ravel()
+    if not samples.size:
+        raise ValueError('samples cannot be empty')
+    if not numpy.isfinite(samples).all():
+        raise ValueError('samples must all be finite')
+    if method == 'histogram':
+        counts, edges = numpy.histogram(
+            samples, bins='auto' if bins is None else bins)
+        densities = counts / (samples.size * numpy.diff(edges))
+        # Hold each bin's density flat from one edge to the next
+        outcomes = numpy.column_stack((edges[:-1], edges[1:])).ravel()
+        strengths = numpy.repeat(densities, 2)
+    elif method == 'kde':
+        if bandwidth is None:
+            bandwidth = _silverman_bandwidth(samples)
+        elif bandwidth <= 0:
+            raise ValueError('bandwidth must be greater than 0')
+        outcomes, strengths = _kernel_density(
+            samples, 256 if bins is None else bins, bandwidth)
+    else:
+        raise ValueError(
+            "method must be 'histogram' or 'kde', not {!r}".format(method))
+    distribution = PiecewiseLinearDistribution(
+        WeightArrays(outcomes, strengths))
+    if return_weights:
+        return distribution, list(zip(outcomes.tolist(), strengths.tolist()))
+    return distribution
+
+
+def _silverman_bandwidth(samples):
+    """
+    Estimate a kernel bandwidth for samples with Silverman's rule of thumb.
+
+    Args:
+        samples (numpy.ndarray): The samples
+
+    Returns:
+        float
+
+    Raises:
+        ValueError: if the spread of the samples is ``0``
+    """
+    numpy = _import_numpy()
+    spread = numpy.std(samples, ddof=1) if samples.size > 1 else 0
+    upper, lower = numpy.percentile(samples, [75, 25])
+    if upper > lower:
+        spread = min(spread, (upper - lower) / 1.349)
+    if not spread > 0:
+        raise ValueError('A bandwidth cannot be estimated when every '
+                         'sample is equal, so one must be given.')
+    return float(0.9 * spread * samples.size ** -0.2)
+
+
+def _kernel_density(samples, bins, bandwidth):
+    """
+    Evaluate a Gaussian kernel density estimate on an even grid.
+
+    The grid spans the samples plus 4 bandwidths on either side. Samples
+    are first shared between their two nearest grid outcomes (linear
+    binning), then the counts are convolved with the kernel.
+
+    Args:
+        samples (numpy.ndarray): The samples
+        bins (int): The number of grid outcomes. Must be at least 2.
+        bandwidth (float): The standard deviation of the kernel
+
+    Returns:
+        tuple(numpy.ndarray): The grid outcomes and their densities
+
+    Raises:
+        ValueError: if ``bins < 2``
+    """
+    numpy = _import_numpy()
+    if bins < 2:
+        raise ValueError('bins must be at least 2')
+    padding = 4 * bandwidth
+    outcomes = numpy.linspace(samples.min() - padding,
+                              samples.max() + padding, bins)
+    step = outcomes[1] - outcomes[0]
+    positions = (samples - outcomes[0]) / step
+    lower = numpy.minimum(positions.astype(numpy.intp), bins - 2)
+    upper_share = positions - lower
+    counts = (numpy.bincount(lower, 1 - upper_share, bins) +
+              numpy.bincount(lower + 1, upper_share, bins))
+    reach = min(bins - 1, int(math.ceil(padding / step)))
+    offsets = numpy.arange(-reach, reach + 1) * (step / bandwidth)
+    kernel = numpy.exp(-0.5 * offsets ** 2)
+    densities = numpy.convolve(counts, kernel)[reach:reach + bins]
+    densities /= samples.size * bandwidth * math.sqrt(2 * math.pi)
+    return outcomes, densities
@@ -13,7 +13,7 @@ with the ``SoftObject`` 's ``get()`` method.
 1.30418962132812
 """
 
-import random
+from blur import noise as _noise
 from blur import rand
 
 
@@ -26,6 +26,10 @@ class SoftObject(object):
 
     Every SoftObject represents a stochastic blurry object whose value
     is determined with the ``get()`` method.
+
+    Every ``SoftObject`` draws from its own ``rng`` attribute, which may be
+    a ``random.Random``, a NumPy ``Generator``, or ``None`` to use
+    the global ``random`` module.
     """
 
     def __init__(self):
@@ -54,14 +58,17 @@ class SoftOptions(SoftObject):
 
     """
 
-    def __init__(self, options):
+    def __init__(self, options, rng=None):
         """
         Args:
-            options (list): a list of options where each option
-                is a ``tuple`` of form ``(Any, float)`` corresponding to
-                ``(outcome, weight)``. Outcome values may be of any
-                type. Weights ``0`` or less will have no chance
-                to be retrieved by ``get()``
+            options (list or rand.WeightTable or rand.WeightArrays): a
+                list of options where each option is a ``tuple`` of form
+                ``(Any, float)`` corresponding to ``(outcome, weight)``.
+                Outcome values may be of any type. Weights ``0`` or less
+                will have no chance to be retrieved by ``get()``
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
 
         Example:
             >>> options = SoftOptions([('option one', 2),
@@ -71,9 +78,10 @@ class SoftOptions(SoftObject):
             'option three'
         """
         self.options = options
+        self.rng = rng
 
     @classmethod
-    def with_uniform_weights(cls, options, weight=1):
+    def with_uniform_weights(cls, options, weight=1, rng=None):
         """
         Initialize from a list of options, assigning uniform weights.
 
@@ -86,6 +94,9 @@ class SoftOptions(SoftObject):
                 be ignored. The only case for explicitly setting this is if
                 you need to modify the weights after creation
                 with specific requirements.
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
 
         Returns:
             SoftOptions: A newly constructed instance
@@ -96,10 +107,10 @@ class SoftOptions(SoftObject):
             >>> blurry_object.options
             [('option one', 1), ('option two', 1), ('option three', 1)]
         """
-        return cls([(value, weight) for value in options])
+        return cls([(value, weight) for value in options], rng)
 
     @classmethod
-    def with_random_weights(cls, options):
+    def with_random_weights(cls, options, rng=None):
         """
         Initialize from a list of options with random weights.
 
@@ -109,25 +120,34 @@ class SoftOptions(SoftObject):
         Args:
             options (list): The list of options of any type this object
                 can return with the ``get()`` method.
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
 
         Returns:
             SoftOptions: A newly constructed instance
         """
-        return cls([(value, random.randint(1, len(options)))
-                    for value in options])
+        return cls([(value, rand.random_int(1, len(options), rng))
+                    for value in options], rng)
 
     @property
     def options(self):
-        """list: a list of options where each option
-            is a ``tuple`` of form ``(Any, float or int)`` corresponding to
-            ``(outcome, weight)``. Outcome values may be of any type.
-            Weights ``0`` or less will have no chance
+        """list or rand.WeightTable or rand.WeightArrays: a list of options
+            where each option is a ``tuple`` of form ``(Any, float or int)``
+            corresponding to ``(outcome, weight)``. Outcome values may be
+            of any type. Weights ``0`` or less will have no chance
             to be retrieved by ``get()``
+
+            A ``rand.WeightTable`` has already been validated, and is
+            used as-is, as is a ``rand.WeightArrays``.
         """
         return self._options
 
     @options.setter
     def options(self, value):
+        if isinstance(value, (rand.WeightTable, rand.WeightArrays)):
+            self._options = value
+            return
         if value == []:
             raise rand.ProbabilityUndefinedError(
                 'SoftOptions.options cannot be empty')
@@ -143,20 +163,24 @@ class SoftOptions(SoftObject):
         Returns:
             Any: An item from ``self.options``.
         """
-        return rand.weighted_choice(self.options)
+        return rand.weighted_choice(self.options, rng=self.rng)
 
 
 class SoftBool(SoftObject):
     """A stochastic ``bool`` defined by a probability to be ``True``."""
 
-    def __init__(self, prob_true):
+    def __init__(self, prob_true, rng=None):
         """
         Args:
             prob_true (float): The probability that ``get()`` returns ``True``
                 where ``prob_true <= 0`` is always ``False`` and
                 ``prob_true >= 1`` is always ``True``.
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
         """
         self.prob_true = prob_true
+        self.rng = rng
 
     @property
     def prob_true(self):
@@ -180,25 +204,38 @@ class SoftBool(SoftObject):
         Returns:
             bool: ``True`` or ``False`` depending on ``self.prob_true``.
         """
-        return random.uniform(0, 1) <= self.prob_true
+        return rand.random_value(self.rng) <= self.prob_true
 
 
 class SoftFloat(SoftObject):
-    """A stochastic float value defined by a list of weights."""
+    """
+    A stochastic float value defined by a list of weights.
+
+    In place of a list of weights, any compiled
+    ``rand.ContinuousDistribution`` may be used, such as those in
+    ``blur.dist``.
+    """
 
-    def __init__(self, weights):
+    def __init__(self, weights, rng=None):
         """
         Args:
-            weights (list): the list of weights where each weight
-                is a tuple of form ``(int or float, int or float)``
-                corresponding to ``(outcome, strength)``.
+            weights (list or rand.WeightTable or rand.WeightArrays or
+                rand.ContinuousDistribution): the list of weights where
+                each weight is a tuple of form
+                ``(int or float, int or float)`` corresponding to
+                ``(outcome, strength)``, or a distribution.
                 These weights represent the stochastic value of
                 this `SoftFloat`.
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
         """
         self.weights = weights
+        self.rng = rng
 
     @classmethod
-    def bounded_uniform(cls, lowest, highest, weight_interval=None):
+    def bounded_uniform(cls, lowest, highest, weight_interval=None,
+                        rng=None):
         """
         Initialize with a uniform distribution between two values.
 
@@ -212,6 +249,9 @@ class SoftFloat(SoftObject):
             lowest (float or int):
             highest (float or int):
             weight_interval (int):
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to use instead of the global
+                ``random`` module.
 
         Returns:
             SoftFloat: A newly constructed instance.
@@ -225,19 +265,36 @@ class SoftFloat(SoftObject):
                 weights.append((i, 1))
                 i += weight_interval
             weights.append((highest, 1))
-        return cls(weights)
+        return cls(weights, rng)
 
     @property
     def weights(self):
-        """list: the list of weights where each weight
-        is a tuple of form ``(int or float, int or float)`` corresponding to
-        ``(outcome, strength)``. These weights represent the
-        stochastic value of this `SoftFloat`.
+        """list or rand.WeightTable or rand.WeightArrays or
+        rand.ContinuousDistribution:
+        the list of weights where each weight is a tuple of form
+        ``(int or float, int or float)`` corresponding to
+        ``(outcome, strength)``, or a distribution. These weights represent
+        the stochastic value of this `SoftFloat`.
+
+        A ``rand.WeightTable`` has already been validated, and is used
+        as-is if its outcomes are all numbers. A ``rand.WeightArrays``
+        is used as-is.
         """
         return self._weights
 
     @weights.setter
     def weights(self, value):
+        if isinstance(value, (rand.ContinuousDistribution,
+                              rand.WeightArrays)):
+            self._weights = value
+            return
+        if isinstance(value, rand.WeightTable):
+            if not value.is_numerical:
+                raise TypeError('weights must be a WeightTable of '
+                                '2-tuples of form (int or float, '
+                                'int or float)')
+            self._weights = value
+            return
         if value == []:
             raise rand.ProbabilityUndefinedError(
                 'weights cannot be empty')
@@ -252,9 +309,13 @@ class SoftFloat(SoftObject):
 
         Returns:
             float: A value between the lowest and highest outcomes
+            in ``self.weights``, or drawn from the distribution
             in ``self.weights``
         """
-        return rand.weighted_rand(self.weights, round_result=False)
+        if isinstance(self.weights, rand.ContinuousDistribution):
+            return self.weights.sample(self.rng)
+        return rand.weighted_rand(self.weights, round_result=False,
+                                  rng=self.rng)
 
 
 class SoftInt(SoftFloat):
@@ -262,7 +323,10 @@ class SoftInt(SoftFloat):
     A stochastic ``int`` value defined by a list of weights.
 
     Has the exact same functionality as ``SoftFloat``,
-    except that ``get()`` returns ``int`` values
+    except that ``get()`` returns ``int`` values.
+
+    Values of a ``rand.PiecewiseLinearDistribution`` are drawn with its
+    ``sample_rounded()`` method.
     """
 
     def get(self):
@@ -271,7 +335,66 @@ class SoftInt(SoftFloat):
 
         Returns: int
         """
-        return rand.weighted_rand(self.weights, round_result=True)
+        if isinstance(self.weights, rand.PiecewiseLinearDistribution):
+            return self.weights.sample_rounded(self.rng)
+        if isinstance(self.weights, rand.ContinuousDistribution):
+            return int(round(self.weights.sample(self.rng)))
+        return rand.weighted_rand(self.weights, round_result=True,
+                                  rng=self.rng)
+
+
+class SoftNoise(SoftObject):
+    """
+    A stochastic float which drifts smoothly between bounds.
+
+    Unlike other soft objects, whose values are drawn independently on
+    every ``get()``, a ``SoftNoise`` walks through smooth noise, taking a
+    ``step`` through it on every ``get()``. Consecutive values are close
+    to each other, while values many steps apart are unrelated, which suits
+    slowly drifting parameters.
+
+    Example:
+        >>> drift = SoftNoise(0, 10, step=0.05)
+        >>> [round(drift.get(), 2) for i in range(5)]          # doctest: +SKIP
+        [6.12, 6.41, 6.63, 6.78, 6.86]
+    """
+
+    def __init__(self, lowest, highest, step=0.1, noise=None, rng=None):
+        """
+        Args:
+            lowest (float): The lowest value ``get()`` can return
+            highest (float): The highest value ``get()`` can return
+            step (float): How far through the noise each ``get()`` moves.
+                Larger steps drift more quickly.
+            noise (noise.Noise): The noise to walk through.
+                Defaults to a ``noise.GradientNoise`` seeded from ``rng``.
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness to seed the default noise from
+                instead of the global ``random`` module.
+        """
+        if noise is None:
+            noise = _noise.GradientNoise(rng=rng)
+        self.lowest = lowest
+        self.highest = highest
+        self.step = step
+        self.noise = noise
+        # Gradient noise is 0 at every integer position, so start at a
+        # random offset to keep whole-number steps off the lattice
+        self.position = rand.random_value(rng)
+        self.rng = rng
+
+    def get(self):
+        """
+        Get the next value of the drift.
+
+        Returns:
+            float: A value between ``self.lowest`` and ``self.highest``
+        """
+        value = self.noise(self.position)
+        self.position += self.step
+        # Noise lies between about -1 and 1
+        fraction = min(max((value + 1) / 2, 0), 1)
+        return self.lowest + (fraction * (self.highest - self.lowest))
 
 
 class SoftColor(SoftObject):
@@ -295,12 +418,16 @@ class SoftColor(SoftObject):
         '#EA7C20'
     """
 
-    def __init__(self, red, green, blue):
+    def __init__(self, red, green, blue, rng=None):
         """
         Args:
             red (int or SoftInt or tuple(args for SoftInt)):
             green (int or SoftInt or tuple(args for SoftInt)):
             blue (int or SoftInt or tuple(args for SoftInt)):
+            rng (random.Random or numpy.random.Generator): An optional
+                source of randomness for channels created here from
+                tuples of args. ``SoftInt`` channels passed in directly
+                keep their own ``rng``.
 
         Raises:
             TypeError: if invalid types are passed in args
@@ -320,6 +447,8 @@ class SoftColor(SoftObject):
         if isinstance(red, tuple):
             try:
                 self.red = SoftInt(*red)
+                if rng is not None:
+                    self.red.rng = rng
             except Exception as exception:
                 raise TypeError('Invalid tuple args for SoftInt in red, '
                                 'init error: {}'.format(exception))
@@ -328,6 +457,8 @@ class SoftColor(SoftObject):
         if isinstance(green, tuple):
             try:
                 self.green = SoftInt(*green)
+                if rng is not None:
+                    self.green.rng = rng
             except Exception as exception:
                 raise TypeError('Invalid tuple args for SoftInt in green, '
                                 'init error: {}'.format(exception))
@@ -336,11 +467,14 @@ class SoftColor(SoftObject):
         if isinstance(blue, tuple):
             try:
                 self.blue = SoftInt(*blue)
+                if rng is not None:
+                    self.blue.rng = rng
             except Exception as exception:
                 raise TypeError('Invalid tuple args for SoftInt in blue, '
                                 'init error: {}'.format(exception))
         else:
             self.blue = blue
+        self.rng = rng
 
     @property
     def red(self):
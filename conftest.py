@@ -0,0 +1,29 @@
+"""
+Doctest configuration for blur.
+
+Doctest examples which need NumPy are marked ``# doctest: +REQUIRES_NUMPY``.
+They are checked like any other example when NumPy is installed,
+and skipped when it is not.
+"""
+
+import doctest
+
+from _pytest.doctest import DoctestItem
+
+REQUIRES_NUMPY = doctest.register_optionflag('REQUIRES_NUMPY')
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def pytest_collection_modifyitems(config, items):
+    if numpy is not None:
+        return
+    for item in items:
+        if not isinstance(item, DoctestItem):
+            continue
+        for example in item.dtest.examples:
+            if example.options.get(REQUIRES_NUMPY):
+                example.options[doctest.SKIP] = True
@@ -32,6 +32,7 @@ import config
 
 import numpy
 
+from blur import algebra
 from blur import iching
 from blur import rand
 
@@ -84,7 +85,7 @@ for frequency in primary_osc_pitches:
     )
 
 # Initialize softer oscillators slightly out of tune with consonant pitches
-detune_weights = rand.normal_distribution(0, 20)
+detune_distribution = rand.NormalDistribution(0, 20)
 detune_base_pitches_weights = [(frequency_map[10], 50),
                                (frequency_map[0], 1),
                                (frequency_map[2], 30),
@@ -98,11 +99,13 @@ octave_choice_weights = [(1/8, 20),
                          (1, 5),
                          (2, 5),
                          (4, 5)]
-# Find detuned pitches
-pitches = [((rand.weighted_choice(detune_base_pitches_weights) +  # Base pitch
-             rand.weighted_rand(detune_weights)) *                # Detune
-            rand.weighted_choice(octave_choice_weights))          # Set Octave
-           for i in range(50)]
+# Find detuned pitches, combining the base pitch, detune and octave
+# into one distribution so each pitch takes a single draw
+pitch_distribution = algebra.multiply(
+    algebra.add(rand.DiscreteDistribution(detune_base_pitches_weights),
+                detune_distribution),
+    rand.DiscreteDistribution(octave_choice_weights))
+pitches = pitch_distribution.sample_many(50).tolist()
 amp_multiplier_weights = [(0.05, 10), (0.2, 2), (0.7, 1)]
 
 for pitch in pitches:
@@ -209,11 +212,13 @@ def build_chunk(oscillators):
                                                   config.MAX_AMPLITUDE)
         # Pick some of the offending oscillators (and some random others)
         # and lower their drift targets
-        avg_amp = (sum(osc.amplitude.value for osc in oscillators) /
-                   len(oscillators))
-        for osc in oscillators:
-            if (osc.amplitude.value > avg_amp and rand.prob_bool(0.1) or
-                    rand.prob_bool(0.01)):
+        amps = numpy.array([osc.amplitude.value for osc in oscillators])
+        # Offending oscillators have a 10% chance, plus the 1% chance
+        # every oscillator has: 1 - (0.9 * 0.99) = 0.109
+        picked = rand.prob_bool_many(
+            numpy.where(amps > amps.mean(), 0.109, 0.01))
+        for osc, is_picked in zip(oscillators, picked):
+            if is_picked:
                 osc.amplitude.drift_target = rand.weighted_rand(
                     [(-5, 1), (0, 10)])
                 osc.amplitude.change_rate = rand.weighted_rand(
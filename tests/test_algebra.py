@@ -0,0 +1,146 @@
+from __future__ import division
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from blur import algebra, dist
+from blur.rand import (ContinuousDistribution, DiscreteDistribution,
+                       PiecewiseLinearDistribution, ProbabilityUndefinedError)
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestAlgebra(unittest.TestCase):
+    def setUp(self):
+        self.dice = DiscreteDistribution([(i, 1) for i in range(1, 7)])
+        self.uniform = PiecewiseLinearDistribution([(0, 1), (1, 1)])
+        self.triangle = PiecewiseLinearDistribution([(-2, 0), (0, 1),
+                                                     (2, 0)])
+
+    def test_shift_and_scale_discrete(self):
+        shifted = algebra.shift(self.dice, 10)
+        self.assertIsInstance(shifted, DiscreteDistribution)
+        self.assertEqual(shifted.support, [11, 12, 13, 14, 15, 16])
+        scaled = algebra.scale(self.dice, -2)
+        self.assertEqual(scaled.support, [-12, -10, -8, -6, -4, -2])
+        self.assertAlmostEqual(scaled.mean, -7)
+
+    def test_shift_and_scale_curve(self):
+        ramp = PiecewiseLinearDistribution([(0, 0), (1, 1)])
+        shifted = algebra.shift(ramp, 10)
+        self.assertEqual(shifted.support, (10, 11))
+        self.assertAlmostEqual(shifted.mean, ramp.mean + 10)
+        scaled = algebra.scale(ramp, -2)
+        self.assertEqual(scaled.support, (-2, 0))
+        self.assertAlmostEqual(scaled.mean, ramp.mean * -2)
+        self.assertAlmostEqual(scaled.variance, ramp.variance * 4)
+        self.assertAlmostEqual(scaled.pdf(-1.5), 0.75)
+        with self.assertRaises(ValueError):
+            algebra.scale(ramp, 0)
+
+    def test_add_discrete_distributions(self):
+        total = algebra.add(self.dice, self.dice)
+        self.assertEqual(total.support, list(range(2, 13)))
+        self.assertAlmostEqual(total.pmf(7), 6 / 36)
+        self.assertAlmostEqual(total.pmf(2), 1 / 36)
+
+    def test_add_discrete_and_curve_is_exact(self):
+        base = DiscreteDistribution([(220, 1), (330, 2)])
+        for total in (algebra.add(base, self.triangle),
+                      algebra.add(self.triangle, base)):
+            self.assertIsInstance(total, PiecewiseLinearDistribution)
+            self.assertAlmostEqual(total.mean, base.mean)
+            self.assertAlmostEqual(total.variance,
+                                   base.variance + self.triangle.variance)
+            self.assertAlmostEqual(total.pdf(330), 2 / 3 * 0.5)
+            self.assertAlmostEqual(total.cdf(300), 1 / 3)
+
+    def test_add_curves_convolves(self):
+        total = algebra.add(self.uniform, self.uniform)
+        self.assertAlmostEqual(total.mean, 1)
+        self.assertAlmostEqual(total.variance, 1 / 6, places=5)
+        self.assertAlmostEqual(total.pdf(1), 1, places=2)
+        self.assertAlmostEqual(total.cdf(0.5), 0.125, places=4)
+
+    def test_add_curves_keeps_mean_and_variance(self):
+        wide = PiecewiseLinearDistribution([(0, 1), (1000, 1)])
+        narrow = PiecewiseLinearDistribution([(0, 1), (0.001, 1)])
+        total = algebra.add(wide, narrow)
+        self.assertAlmostEqual(total.mean, 500.0005, places=6)
+        self.assertAlmostEqual(total.variance / (1000 ** 2 / 12), 1,
+                               places=6)
+        total = algebra.add(self.triangle,
+                            PiecewiseLinearDistribution([(0, 1), (3, 1)]))
+        self.assertAlmostEqual(total.mean, self.triangle.mean + 1.5)
+        self.assertAlmostEqual(total.variance,
+                               self.triangle.variance + 0.75, places=4)
+
+    def test_add_approximates_other_distributions(self):
+        total = algebra.add(dist.NormalDistribution(0, 1),
+                            dist.NormalDistribution(3, 4))
+        self.assertAlmostEqual(total.mean, 3, places=4)
+        self.assertAlmostEqual(total.variance, 5, places=2)
+        self.assertAlmostEqual(algebra.shift(dist.Beta(2, 2), 1).mean,
+                               1.5, places=4)
+        with self.assertRaises(TypeError):
+            algebra.add(ContinuousDistribution(), self.uniform)
+
+    def test_multiply_discrete_and_curve_is_exact(self):
+        octave = DiscreteDistribution([(1, 3), (2, 1)])
+        product = algebra.multiply(self.uniform, octave)
+        self.assertEqual(product.support, (0, 2))
+        self.assertAlmostEqual(product.mean, 0.5 * 1.25)
+        self.assertAlmostEqual(product.pdf(0.5), 0.75 + 0.25 / 2)
+        self.assertAlmostEqual(product.pdf(1.5), 0.25 / 2)
+        discrete_product = algebra.multiply(self.dice, octave)
+        self.assertAlmostEqual(discrete_product.mean, 3.5 * 1.25)
+
+    def test_multiply_invalid_distributions_raises(self):
+        with self.assertRaises(TypeError):
+            algebra.multiply(self.uniform, self.triangle)
+        with self.assertRaises(ValueError):
+            algebra.multiply(DiscreteDistribution([(0, 1), (1, 1)]),
+                             self.uniform)
+        with self.assertRaises(TypeError):
+            algebra.multiply(DiscreteDistribution([('a', 1)]), self.uniform)
+
+    def test_mixture(self):
+        mixed = algebra.mixture([(self.uniform, 3),
+                                 (algebra.shift(self.uniform, 9), 1),
+                                 (self.triangle, 0)])
+        self.assertAlmostEqual(mixed.cdf(5), 0.75)
+        self.assertAlmostEqual(mixed.mean, 0.75 * 0.5 + 0.25 * 9.5)
+        self.assertAlmostEqual(mixed.pdf(0.5), 0.75)
+        overlapping = algebra.mixture([(self.uniform, 1),
+                                       (self.triangle, 1)])
+        self.assertAlmostEqual(overlapping.pdf(0.5), (1 + 0.375) / 2)
+        discrete = algebra.mixture([(self.dice, 1),
+                                    (DiscreteDistribution([(7, 1)]), 1)])
+        self.assertAlmostEqual(discrete.pmf(7), 0.5)
+        self.assertAlmostEqual(discrete.pmf(1), 1 / 12)
+
+    def test_mixture_invalid_weights_raise(self):
+        with self.assertRaises(TypeError):
+            algebra.mixture([(self.dice, 1), (self.uniform, 1)])
+        with self.assertRaises(ProbabilityUndefinedError):
+            algebra.mixture([(self.dice, 0)])
+
+    def test_combined_distribution_matches_combined_draws(self):
+        base = DiscreteDistribution([(220, 1), (330, 2)])
+        octave = DiscreteDistribution([(0.5, 1), (1, 2), (2, 1)])
+        pitch = algebra.multiply(algebra.add(base, self.triangle), octave)
+        rng = numpy.random.default_rng(8)
+        draws = ((base.sample_many(40000, rng=rng) +
+                  self.triangle.sample_many(40000, rng=rng)) *
+                 octave.sample_many(40000, rng=rng))
+        self.assertAlmostEqual(pitch.mean, draws.mean(), delta=3)
+        combined = pitch.sample_many(40000, rng=rng)
+        self.assertAlmostEqual(combined.mean(), draws.mean(), delta=5)
+        self.assertAlmostEqual(combined.std() / draws.std(), 1, delta=0.03)
+
+
+if __name__ == '__main__':
+    unittest.main()
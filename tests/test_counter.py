@@ -0,0 +1,144 @@
+from __future__ import division
+
+import unittest
+import random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from blur import rand, dist
+from blur.counter import CounterRandom, _philox
+
+
+class TestCounterRandom(unittest.TestCase):
+    def test_philox_known_answers(self):
+        # Known answer tests from the Random123 library
+        self.assertEqual(_philox((0, 0, 0, 0), (0, 0)),
+                         (0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8))
+        self.assertEqual(
+            _philox((0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344),
+                    (0xa4093822, 0x299f31d0)),
+            (0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1))
+
+    def test_random_values_are_in_range(self):
+        rng = CounterRandom(1)
+        values = [rng.random() for i in range(1000)]
+        self.assertTrue(all(0 <= value < 1 for value in values))
+        self.assertLess(abs(sum(values) / len(values) - 0.5), 0.05)
+        self.assertEqual(rng.position, 1000)
+
+    def test_random_access(self):
+        rng = CounterRandom(5, 'stream')
+        values = [rng.random() for i in range(10)]
+        self.assertEqual(rng.random_at(7), values[7])
+        rng.position = 3
+        self.assertEqual(rng.random(), values[3])
+        self.assertEqual(CounterRandom(5, 'stream', 9).random(), values[9])
+
+    def test_seeds_and_streams_are_independent(self):
+        values = set(CounterRandom(seed, stream).random()
+                     for seed in [0, 1] for stream in [0, 1, 'a', 'b'])
+        self.assertEqual(len(values), 8)
+        self.assertEqual(CounterRandom(0, 'a').random(),
+                         CounterRandom(0, u'a').random())
+
+    def test_getrandbits(self):
+        rng = CounterRandom(3)
+        self.assertLess(rng.getrandbits(10), 2 ** 10)
+        self.assertEqual(rng.position, 1)
+        rng.getrandbits(65)
+        self.assertEqual(rng.position, 3)
+
+    def test_seed_defaults_to_global_random(self):
+        random.seed(2)
+        first = CounterRandom().random()
+        random.seed(2)
+        self.assertEqual(CounterRandom().random(), first)
+
+    def test_usable_as_rng(self):
+        weights = [(-3, 4), (0, 10), (5, 1)]
+        for function in [rand.weighted_rand, rand.weighted_choice,
+                         rand.weighted_order]:
+            self.assertEqual(function(weights, rng=CounterRandom(8)),
+                             function(weights, rng=CounterRandom(8)))
+
+    def test_random_many_without_numpy(self):
+        original_numpy = rand._numpy
+        rand._numpy = False
+        try:
+            rng = CounterRandom(4)
+            values = rng.random_many(5)
+            self.assertIsInstance(values, list)
+            self.assertEqual(values, [CounterRandom(4).random_at(i)
+                                      for i in range(5)])
+        finally:
+            rand._numpy = original_numpy
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestCounterRandomBatches(unittest.TestCase):
+    def assert_split_invariant(self, draw, count=1000, split=377,
+                               values_per_result=1):
+        whole = draw(count, CounterRandom(11, 'test'))
+        first = draw(split, CounterRandom(11, 'test'))
+        second = draw(count - split,
+                      CounterRandom(11, 'test', split * values_per_result))
+        self.assertEqual(numpy.asarray(whole).tolist(),
+                         numpy.asarray(first).tolist() +
+                         numpy.asarray(second).tolist())
+
+    def test_random_many_matches_random(self):
+        for start in [0, 1, 2 ** 40 + 1]:
+            rng = CounterRandom(9, 'x', start)
+            values = rng.random_many(33)
+            self.assertEqual(rng.position, start + 33)
+            rng.position = start
+            self.assertEqual(list(values), [rng.random() for i in range(33)])
+
+    def test_batch_functions_are_split_invariant(self):
+        weights = [(-3, 4), (0, 10), (5, 1)]
+        options = [('a', 1), ('b', 3), ('c', 0), ('d', 2)]
+        self.assert_split_invariant(
+            lambda count, rng: rand.weighted_rand_many(weights, count,
+                                                       rng=rng))
+        self.assert_split_invariant(
+            lambda count, rng: rand.weighted_choice_many(options, count,
+                                                         rng=rng))
+        self.assert_split_invariant(
+            lambda count, rng: rand.DiscreteDistribution(
+                options).sample_many(count, rng=rng))
+        grid = rand.GridDistribution([[1, 2], [0, 3]])
+        self.assert_split_invariant(
+            lambda count, rng: grid.sample_many(count, jitter=True, rng=rng),
+            values_per_result=3)
+        self.assert_split_invariant(
+            lambda count, rng: rand.weighted_sample_many(
+                [('a', 1), ('b', 3), ('d', 2)], 2, count, rng=rng),
+            values_per_result=3)
+        self.assert_split_invariant(
+            lambda count, rng: rand.prob_bool_many(0.3, count, rng=rng))
+        self.assert_split_invariant(
+            lambda count, rng: rand.weighted_rand_many(
+                weights, count, round_result=True, rng=rng))
+        for distribution in [rand.NormalDistribution(0, 1),
+                             rand.NormalDistribution(0, 1, minimum=1),
+                             dist.Exponential(2)]:
+            self.assert_split_invariant(distribution.sample_many)
+
+    def test_batches_match_single_draws(self):
+        curve = rand.PiecewiseLinearDistribution([(-3, 4), (0, 10), (5, 1)])
+        options = rand.DiscreteDistribution([('a', 1), ('b', 3), ('d', 2)])
+        rng = CounterRandom(6)
+        self.assertEqual(list(curve.sample_many(500, CounterRandom(6))),
+                         [curve.sample(rng) for i in range(500)])
+        rng = CounterRandom(6)
+        self.assertEqual(
+            list(options.sample_many(500, rng=CounterRandom(6))),
+            [options.sample(rng=rng) for i in range(500)])
+        grid = rand.GridDistribution([[1, 2], [0, 3]])
+        rng = CounterRandom(6)
+        self.assertEqual(
+            grid.sample_many(50, jitter=True, rng=CounterRandom(6)).tolist(),
+            [list(grid.sample(jitter=True, rng=rng)) for i in range(50)])
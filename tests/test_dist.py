@@ -0,0 +1,139 @@
+"""
+Tests for the distributions in the ``dist`` module.
+
+Due to the stochastic nature of these distributions,
+this is not absolute proof that they are working as expected.
+False failures, while highly unlikely, are possible.
+"""
+
+from __future__ import division
+
+import unittest
+import math
+import random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from blur import dist, soft
+
+
+def _mean_and_variance(samples):
+    mean = sum(samples) / len(samples)
+    variance = sum((s - mean) ** 2 for s in samples) / len(samples)
+    return mean, variance
+
+
+class TestDistributions(unittest.TestCase):
+    SAMPLE_COUNT = 20000
+
+    def assert_matches_moments(self, distribution, mean, variance,
+                               variance_tolerance=0.1):
+        samples = [distribution.sample() for i in range(self.SAMPLE_COUNT)]
+        samples_mean, samples_variance = _mean_and_variance(samples)
+        standard_error = math.sqrt(variance / self.SAMPLE_COUNT)
+        self.assertLess(abs(samples_mean - mean), 5 * standard_error)
+        self.assertLess(abs(samples_variance - variance),
+                        variance * variance_tolerance)
+
+    def test_exponential(self):
+        self.assert_matches_moments(dist.Exponential(2), 0.5, 0.25)
+        self.assertAlmostEqual(dist.Exponential(2)._inverse(0.5),
+                               math.log(2) / 2)
+
+    def test_triangular(self):
+        distribution = dist.Triangular(0, 10, mode=2)
+        self.assert_matches_moments(distribution, 4, (100 + 4 - 20) / 18)
+        self.assertAlmostEqual(distribution._inverse(0.2), 2)
+        self.assertEqual(dist.Triangular(0, 4).mode, 2)
+
+    def test_lognormal(self):
+        mean = math.exp(0.125)
+        variance = (math.exp(0.25) - 1) * math.exp(0.25)
+        self.assert_matches_moments(dist.LogNormal(0, 0.5), mean, variance)
+        self.assertAlmostEqual(dist.LogNormal(1, 2)._inverse(0.5), math.e)
+
+    def test_pareto(self):
+        distribution = dist.Pareto(10, scale=2)
+        # Sample variances of heavy tails converge slowly
+        self.assert_matches_moments(distribution, 20 / 9, 40 / 648,
+                                    variance_tolerance=0.3)
+        self.assertAlmostEqual(distribution._inverse(0), 2)
+
+    def test_beta(self):
+        self.assert_matches_moments(dist.Beta(2, 5), 2 / 7, 10 / 392)
+        # Shapes below 1 take a different path when drawing gamma variates
+        self.assert_matches_moments(dist.Beta(0.5, 0.5), 0.5, 1 / 8)
+
+    def test_beta_with_tiny_shapes(self):
+        distribution = dist.Beta(0.001, 0.001)
+        samples = [distribution.sample() for i in range(5000)]
+        self.assertTrue(all(0 <= sample <= 1 for sample in samples))
+        # Nearly every value is at one of the ends, each half the time
+        self.assertLess(abs(sum(samples) / 5000 - 0.5), 0.05)
+
+    def test_beta_ppf(self):
+        self.assertAlmostEqual(dist.Beta(2, 2).ppf(0.5), 0.5)
+        # Beta(1, 3) has a closed-form inverse
+        self.assertAlmostEqual(dist.Beta(1, 3).ppf(0.4),
+                               1 - (0.6 ** (1 / 3)))
+        # As does the arcsine distribution, Beta(0.5, 0.5)
+        self.assertAlmostEqual(dist.Beta(0.5, 0.5).ppf(0.3),
+                               math.sin(math.pi * 0.15) ** 2)
+        self.assertEqual(list(dist.Beta(2, 5).ppf([0, 1])), [0, 1])
+        for alpha, beta in [(2, 5), (0.2, 0.3), (50, 0.7), (1000, 1000)]:
+            distribution = dist.Beta(alpha, beta)
+            for fraction in [1e-9, 0.01, 0.5, 0.99]:
+                self.assertAlmostEqual(
+                    distribution._cdf(distribution.ppf(fraction)) /
+                    fraction, 1, places=9)
+
+    def test_invalid_parameters_raise(self):
+        with self.assertRaises(ValueError):
+            dist.Exponential(0)
+        with self.assertRaises(ValueError):
+            dist.Triangular(5, 1)
+        with self.assertRaises(ValueError):
+            dist.Triangular(0, 1, mode=2)
+        with self.assertRaises(ValueError):
+            dist.LogNormal(0, -1)
+        with self.assertRaises(ValueError):
+            dist.Pareto(0)
+        with self.assertRaises(ValueError):
+            dist.Beta(1, 0)
+
+    def test_samples_are_reproducible_with_rng(self):
+        for distribution in [dist.Exponential(1), dist.Triangular(0, 1),
+                             dist.LogNormal(0, 1), dist.Pareto(2),
+                             dist.Beta(2, 3)]:
+            self.assertEqual(distribution.sample(rng=random.Random(4)),
+                             distribution.sample(rng=random.Random(4)))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_inverse_array_matches_inverse(self):
+        fractions = numpy.array([0, 0.1, 0.5, 0.75, 0.999])
+        for distribution in [dist.Exponential(3), dist.Triangular(-1, 4, 0),
+                             dist.LogNormal(1, 0.3), dist.Pareto(1.5, 3),
+                             dist.Beta(2, 3), dist.Beta(0.2, 50)]:
+            results = distribution._inverse_array(fractions)
+            for result, fraction in zip(results, fractions):
+                self.assertAlmostEqual(result,
+                                       distribution._inverse(fraction))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_sample_many(self):
+        for distribution in [dist.Exponential(3), dist.Triangular(0, 1),
+                             dist.LogNormal(0, 1), dist.Pareto(2),
+                             dist.Beta(2, 3)]:
+            samples = distribution.sample_many(1000)
+            self.assertEqual(samples.shape, (1000,))
+            self.assertTrue((samples >= 0).all())
+
+    def test_soft_objects_accept_distributions(self):
+        soft_float = soft.SoftFloat(dist.Triangular(0, 10))
+        self.assertTrue(0 <= soft_float.get() <= 10)
+        soft_int = soft.SoftInt(dist.Pareto(2))
+        self.assertIsInstance(soft_int.get(), int)
+        self.assertGreaterEqual(soft_int.get(), 1)
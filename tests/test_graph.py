@@ -1,7 +1,9 @@
+import random
 import unittest
 
 from blur.markov.graph import Graph
 from blur.markov.node import Node, Link
+from blur.rand import ProbabilityUndefinedError
 
 
 class TestGraph(unittest.TestCase):
@@ -157,6 +159,33 @@ class TestGraph(unittest.TestCase):
         # Test that self.test_graph.current_node correctly updated
         self.assertEqual(self.test_graph.current_node, picked_node)
 
+    def test_pick_follows_link_weights(self):
+        self.node_1.link_list[0].weight = 0
+        for i in range(20):
+            self.assertIs(self.test_graph.pick(starting_node=self.node_1),
+                          self.node_1.link_list[1].target)
+        with self.assertRaises(ValueError):
+            self.test_graph.pick(starting_node=Node('Dead end'))
+
+    def test_pick_ignores_links_without_weight(self):
+        self.node_1.link_list[0].weight = -5
+        for i in range(20):
+            self.assertIs(self.test_graph.pick(starting_node=self.node_1),
+                          self.node_1.link_list[1].target)
+        self.node_1.link_list[1].weight = 0
+        with self.assertRaises(ProbabilityUndefinedError):
+            self.test_graph.pick(starting_node=self.node_1)
+
+    def test_pick_is_reproducible_with_rng(self):
+        source = 'i have nothing to say and i am saying it'
+
+        def walk(seed):
+            graph = Graph.from_string(source,
+                                      distance_weights={1: 2, 2: 1},
+                                      rng=random.Random(seed))
+            return [graph.pick().value for i in range(20)]
+        self.assertEqual(walk(5), walk(5))
+
     def test_from_string_with_defaults(self):
         source = ('I have <<nothing to say,.;!?:\\/\'"()[>>'
                   'and I am saying it and that is poetry.')
@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from blur import iching
@@ -23,6 +24,12 @@ class IChing(unittest.TestCase):
         self.assertIsInstance(gram, int)
         self.assertTrue(1 <= gram <= 64)
 
+    def test_get_hexagram_is_reproducible_with_rng(self):
+        for method in ['THREE COIN', 'YARROW', 'NAIVE']:
+            self.assertEqual(
+                iching.get_hexagram(method, rng=random.Random(3)),
+                iching.get_hexagram(method, rng=random.Random(3)))
+
     def test_get_hexagram_with_invalid_method(self):
         with self.assertRaises(ValueError):
             gram = iching.get_hexagram(method='invalid method name')
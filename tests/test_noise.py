@@ -0,0 +1,108 @@
+from __future__ import division
+
+import random
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from blur.noise import Noise, ValueNoise, GradientNoise
+
+
+class TestNoise(unittest.TestCase):
+    def test_noise_is_abstract(self):
+        noise = Noise(seed=1)
+        with self.assertRaises(NotImplementedError):
+            noise(0.5)
+
+    def test_octaves_below_1_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            GradientNoise(seed=1, octaves=0)
+
+    def test_z_without_y_raises_ValueError(self):
+        with self.assertRaises(ValueError):
+            GradientNoise(seed=1)(0.5, z=0.5)
+
+    def test_same_seed_gives_same_noise(self):
+        for noise_type in (ValueNoise, GradientNoise):
+            first = noise_type(seed=5, octaves=3)
+            second = noise_type(seed=5, octaves=3)
+            for x in (0.1, 2.7, -13.4):
+                self.assertEqual(first(x), second(x))
+                self.assertEqual(first(x, -x), second(x, -x))
+                self.assertEqual(first(x, 1, x), second(x, 1, x))
+
+    def test_different_seeds_give_different_noise(self):
+        first = GradientNoise(seed=1)
+        second = GradientNoise(seed=2)
+        self.assertNotEqual([first(x / 10, 0.5) for x in range(20)],
+                            [second(x / 10, 0.5) for x in range(20)])
+
+    def test_seed_rolled_from_rng_is_reproducible(self):
+        first = ValueNoise(rng=random.Random(8))
+        second = ValueNoise(rng=random.Random(8))
+        self.assertEqual(first.seed, second.seed)
+        self.assertEqual(first(3.5), second(3.5))
+
+    def test_gradient_noise_is_0_at_grid_points(self):
+        noise = GradientNoise(seed=4)
+        for point in range(-5, 5):
+            self.assertEqual(noise(point), 0)
+            self.assertEqual(noise(point, 2), 0)
+            self.assertEqual(noise(point, 2, -3), 0)
+
+    def test_noise_is_in_range(self):
+        rng = random.Random(2)
+        for noise in (ValueNoise(seed=3, octaves=2), GradientNoise(seed=3)):
+            for i in range(500):
+                coordinates = [rng.uniform(-50, 50)
+                               for d in range(rng.randint(1, 3))]
+                self.assertLessEqual(abs(noise(*coordinates)), 1.0001)
+
+    def test_noise_is_smooth(self):
+        for noise in (ValueNoise(seed=6), GradientNoise(seed=6)):
+            x = 0
+            while x < 10:
+                self.assertLess(abs(noise(x + 0.001) - noise(x)), 0.01)
+                x += 0.137
+
+    def test_frequency_scales_coordinates(self):
+        slow = GradientNoise(seed=9, frequency=0.25)
+        fast = GradientNoise(seed=9, frequency=1)
+        self.assertEqual(slow(4 * 1.3), fast(1.3))
+
+    def test_octaves_add_detail(self):
+        smooth = GradientNoise(seed=9)
+        detailed = GradientNoise(seed=9, octaves=4)
+        self.assertNotEqual(smooth(1.3), detailed(1.3))
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestNoiseArrays(unittest.TestCase):
+    def test_arrays_match_single_positions(self):
+        xs = numpy.linspace(-7.3, 7.3, 41)
+        for noise in (ValueNoise(seed=2, octaves=2),
+                      GradientNoise(seed=2, octaves=2)):
+            self.assertEqual(noise(xs).tolist(),
+                             [noise(x) for x in xs])
+            self.assertEqual(noise(xs, 0.25).tolist(),
+                             [noise(x, 0.25) for x in xs])
+            self.assertEqual(noise(xs, -xs, 1.5).tolist(),
+                             [noise(x, -x, 1.5) for x in xs])
+
+    def test_coordinates_are_broadcast(self):
+        noise = GradientNoise(seed=1)
+        grid = noise(numpy.arange(4)[:, None] + 0.5, numpy.arange(3) + 0.5)
+        self.assertEqual(grid.shape, (4, 3))
+        self.assertEqual(grid[2, 1], noise(2.5, 1.5))
+
+    def test_lists_are_accepted(self):
+        noise = ValueNoise(seed=1)
+        self.assertEqual(noise([0.5, 1.5]).tolist(),
+                         [noise(0.5), noise(1.5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
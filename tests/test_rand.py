@@ -13,11 +13,28 @@ from __future__ import division
 
 import unittest
 import math
+import subprocess
+import sys
 import random
+import warnings
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from blur import rand
 
 
+class _HighestRandom(object):
+    """A source of randomness which always rolls the top of its range."""
+    def random(self):
+        return 1.0
+
+    def random_many(self, count):
+        return numpy.ones(count)
+
+
 class TestRand(unittest.TestCase):
     """Tests for all methods in the ``rand`` module."""
     def test__linear_interp(self):
@@ -60,6 +77,43 @@ class TestRand(unittest.TestCase):
         with self.assertRaises(rand.ProbabilityUndefinedError):
             rand._linear_interp([(0, 0), (2, 2)], -1, round_result=False)
 
+    def test__curve_interpolator_values(self):
+        curve = [(-4, -1), (0, 0), (0, 3), (2, 2), (18, 7)]
+        interpolator = rand._CurveInterpolator(curve)
+        # (test_x, expected value, expected rounded value)
+        expected = [(-4, -1, -1), (-2.5, -0.625, -1), (0, 0, 0),
+                    (0.5, 2.75, 3), (2, 2, 2), (9, 4.1875, 4), (18, 7, 7)]
+        for test_x, value, rounded_value in expected:
+            self.assertEqual(interpolator(test_x), value)
+            self.assertEqual(interpolator(test_x, True), rounded_value)
+            self.assertEqual(rand._linear_interp(curve, test_x), value)
+            self.assertIsInstance(interpolator(test_x, True), int)
+
+    def test__curve_interpolator_uses_left_segment_at_duplicate_x(self):
+        interpolator = rand._CurveInterpolator([(0, 0), (1, 1), (1, 5),
+                                                (2, 5)])
+        self.assertEqual(interpolator(1), 1)
+        self.assertEqual(interpolator(1.5), 5)
+
+    def test__curve_interpolator_out_of_domain_raises(self):
+        interpolator = rand._CurveInterpolator([(0, 0), (2, 2)])
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            interpolator(-1)
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            interpolator(float('nan'))
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            interpolator.interpolate_many([1, 3])
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand._CurveInterpolator([(1, 1), (1, 2)])(1)
+
+    def test__curve_interpolator_interpolate_many(self):
+        interpolator = rand._CurveInterpolator([(0, 0), (2, 2), (18, 7)])
+        results = interpolator.interpolate_many([0, 1, 2, 10, 18])
+        for result, expected in zip(results, [0, 1, 2, 4.5, 7]):
+            self.assertAlmostEqual(result, expected)
+        rounded = interpolator.interpolate_many([1.4, 10], round_result=True)
+        self.assertEqual(list(rounded), [1, 4])
+
     def test__point_under_curve(self):
         # Build several random curves and test points below the minimum
         # and above the maximum
@@ -316,6 +370,53 @@ class TestRand(unittest.TestCase):
                 pos_count += 1
         self.assertTrue(300 <= pos_count <= 700)
 
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_prob_bool_many(self):
+        values = rand.prob_bool_many(0.2, (100, 50))
+        self.assertEqual(values.shape, (100, 50))
+        self.assertEqual(values.dtype, bool)
+        self.assertTrue(0.15 <= values.mean() <= 0.25)
+        self.assertEqual(rand.prob_bool_many([0, 1, -5, 5]).tolist(),
+                         [False, True, False, True])
+        # Probabilities are broadcast against the shape
+        values = rand.prob_bool_many(numpy.array([[0], [1]]), (2, 30))
+        self.assertEqual(values.sum(axis=1).tolist(), [0, 30])
+        with self.assertRaises(ValueError):
+            rand.prob_bool_many([0.5, 0.5], 3)
+        self.assertIs(rand.prob_bool_many(1), True)
+        self.assertIn(rand.pos_or_neg_1_many(), (1, -1))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_prob_bool_many_packed(self):
+        values = rand.prob_bool_many(0.3, (40, 21), rng=random.Random(3))
+        packed = rand.prob_bool_many(0.3, (40, 21), packed=True,
+                                     rng=random.Random(3))
+        self.assertEqual(packed.shape, (40, 3))
+        self.assertEqual(packed.dtype, numpy.uint8)
+        self.assertEqual(
+            numpy.unpackbits(packed, axis=-1, count=21).tolist(),
+            values.astype(numpy.uint8).tolist())
+        packed = rand.prob_bool_many(numpy.linspace(0, 1, 100) > 0.5,
+                                     packed=True)
+        self.assertEqual(numpy.unpackbits(packed, count=100).sum(), 50)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_percent_possible_many(self):
+        values = rand.percent_possible_many(20, 1000)
+        self.assertTrue(150 <= values.sum() <= 250)
+        self.assertEqual(
+            rand.percent_possible_many([0, 100, 1000, -10]).tolist(),
+            [False, True, True, False])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_pos_or_neg_1_many(self):
+        values = rand.pos_or_neg_1_many(count=1000)
+        self.assertEqual(values.dtype, numpy.int8)
+        self.assertEqual(set(values.tolist()), {-1, 1})
+        self.assertTrue(300 <= (values == 1).sum() <= 700)
+        self.assertEqual(rand.pos_or_neg_1_many([0, 1, 0]).tolist(),
+                         [-1, 1, -1])
+
     def test_weighted_choice(self):
         options = [(0, 1), (5, 2), (10, 5)]
         zero_count = 0
@@ -486,3 +587,1254 @@ class TestRand(unittest.TestCase):
 
     def test_weighted_order_with_empty_list_returns_empty_list(self):
         self.assertEqual(rand.weighted_order([]), [])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_order_of_numpy_weights(self):
+        weights = rand.WeightArrays(numpy.arange(1000),
+                                    numpy.linspace(1, 2, 1000))
+        order = rand.weighted_order(weights, rng=numpy.random.default_rng(2))
+        self.assertEqual(sorted(order), list(range(1000)))
+        self.assertEqual(
+            order,
+            rand.weighted_order(weights, rng=numpy.random.default_rng(2)))
+
+    def test_weighted_order_keeps_items_whole(self):
+        order = rand.weighted_order([((1, 2), 1), ('a', 2), (3, 1)])
+        self.assertEqual(sorted(order, key=repr), ['a', (1, 2), 3])
+
+    def test_piecewise_linear_distribution_inverse_on_ramp(self):
+        distribution = rand.PiecewiseLinearDistribution([(0, 0), (2, 2)])
+        self.assertAlmostEqual(distribution.total_area, 2)
+        self.assertAlmostEqual(distribution._inverse(0), 0)
+        self.assertAlmostEqual(distribution._inverse(0.25), 1)
+        self.assertAlmostEqual(distribution._inverse(1), 2)
+
+    def test_piecewise_linear_distribution_inverse_on_flat_curve(self):
+        distribution = rand.PiecewiseLinearDistribution([(-5, 3), (5, 3)])
+        self.assertAlmostEqual(distribution._inverse(0.5), 0)
+        self.assertAlmostEqual(distribution._inverse(0.1), -4)
+
+    def test_piecewise_linear_distribution_sorts_weights(self):
+        distribution = rand.PiecewiseLinearDistribution([(2, 2), (0, 0)])
+        self.assertAlmostEqual(distribution._inverse(0.25), 1)
+
+    def test_piecewise_linear_distribution_ignores_negative_strengths(self):
+        # The curve crosses zero strength at x = 1
+        distribution = rand.PiecewiseLinearDistribution([(0, -1), (2, 1)])
+        self.assertAlmostEqual(distribution.total_area, 0.5)
+        for i in range(100):
+            self.assertGreaterEqual(distribution.sample(), 1)
+
+    def test_piecewise_linear_distribution_with_no_area_raises(self):
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.PiecewiseLinearDistribution([(0, 0), (5, 0), (9, -2)])
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.PiecewiseLinearDistribution([(3, 5), (3, 8)])
+
+    def test_piecewise_linear_distribution_with_spiky_curve(self):
+        weights = [(0.00001, 12000), (0.0001, 100), (0.001, 10)]
+        distribution = rand.PiecewiseLinearDistribution(weights)
+        for i in range(1000):
+            self.assertTrue(0.00001 <= distribution.sample() <= 0.001)
+
+    def test_weighted_rand_with_no_area_warns(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            result = rand.weighted_rand([(1, 0), (2, 0)])
+        self.assertIn(result, [1, 2])
+        self.assertEqual(len(caught), 1)
+
+    def test_discrete_distribution_frequencies(self):
+        distribution = rand.DiscreteDistribution([(0, 1), (5, 2), (10, 5)])
+        counts = {0: 0, 5: 0, 10: 0}
+        for i in range(1000):
+            counts[distribution.sample()] += 1
+        self.assertTrue(25 <= counts[0] <= 250)
+        self.assertTrue(50 <= counts[5] <= 600)
+        self.assertTrue(300 <= counts[10] <= 900)
+
+    def test_discrete_distribution_as_tuple(self):
+        options = [('a', 0), ('b', -1), ('a', 5), ('c', 1)]
+        distribution = rand.DiscreteDistribution(options)
+        for i in range(50):
+            index, value = distribution.sample(as_index_and_value_tuple=True)
+            self.assertIn(index, [2, 3])
+            self.assertEqual(options[index][0], value)
+
+    def test_discrete_distribution_with_empty_list(self):
+        with self.assertRaises(ValueError):
+            rand.DiscreteDistribution([])
+
+    def test_discrete_distribution_with_all_non_pos_weights(self):
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.DiscreteDistribution([(1, 0), (5, -2), (10, 0)])
+
+    def test_discrete_distribution_with_one_weight(self):
+        distribution = rand.DiscreteDistribution([('The Only Weight', 2)])
+        self.assertEqual(distribution.sample(), 'The Only Weight')
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_rand_many_stays_in_bounds(self):
+        weights = [(-3, 4), (0, 10), (5, 1)]
+        results = rand.weighted_rand_many(weights, 10000)
+        self.assertEqual(results.shape, (10000,))
+        self.assertTrue(((-3 <= results) & (results <= 5)).all())
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_rand_many_matches_curve_mean(self):
+        # The mean of a ramp from (0, 0) to (3, 3) is 2
+        results = rand.weighted_rand_many([(0, 0), (3, 3)], 100000)
+        self.assertLess(abs(results.mean() - 2), 0.05)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_rand_many_ignores_negative_strengths(self):
+        results = rand.weighted_rand_many([(0, -1), (2, 1)], 1000)
+        self.assertTrue((results >= 1).all())
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_rand_many_with_round_result(self):
+        results = rand.weighted_rand_many([(0, 1), (10, 1)], 1000,
+                                          round_result=True)
+        self.assertTrue(numpy.issubdtype(results.dtype, numpy.integer))
+        self.assertTrue(((0 <= results) & (results <= 10)).all())
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_rand_many_with_one_weight(self):
+        results = rand.weighted_rand_many([(7, 2)], 5)
+        self.assertEqual(list(results), [7] * 5)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_rand_many_with_no_area_raises(self):
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.weighted_rand_many([(0, 0), (1, 0)], 5)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_choice_many_frequencies(self):
+        results = rand.weighted_choice_many([(0, 1), (5, 2), (10, 5)], 8000)
+        counts = {value: (results == value).sum() for value in (0, 5, 10)}
+        self.assertLess(abs(counts[0] - 1000), 200)
+        self.assertLess(abs(counts[5] - 2000), 300)
+        self.assertLess(abs(counts[10] - 5000), 400)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_choice_many_as_indices_skips_non_pos_weights(self):
+        options = [(1, 0), (5, -1), (10, 5), (19, 1), (20, 0)]
+        indices = rand.weighted_choice_many(options, 1000, as_indices=True)
+        self.assertTrue(numpy.isin(indices, [2, 3]).all())
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_choice_many_never_picks_trailing_non_pos_weights(self):
+        options = [(1, 0), (10, 5), (19, 1), (20, 0), (21, -1)]
+        indices = rand.weighted_choice_many(options, 5, as_indices=True,
+                                            rng=_HighestRandom())
+        self.assertEqual(indices.tolist(), [2] * 5)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_choice_many_keeps_tuple_outcomes_whole(self):
+        options = [((0, 0), 1), ((1, 1), 1)]
+        results = rand.weighted_choice_many(options, 10)
+        self.assertEqual(results.shape, (10,))
+        for result in results:
+            self.assertIn(result, [(0, 0), (1, 1)])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_choice_many_keeps_mixed_str_and_int_types(self):
+        results = rand.weighted_choice_many([('a', 1), (2, 1)], 50)
+        self.assertEqual({(type(x), x) for x in results},
+                         {(str, 'a'), (int, 2)})
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_choice_many_keeps_mixed_int_and_float_types(self):
+        results = rand.weighted_choice_many([(1, 1), (2.5, 1)], 50)
+        self.assertEqual({(type(x), x) for x in results},
+                         {(int, 1), (float, 2.5)})
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_discrete_distribution_sample_many_keeps_mixed_types(self):
+        distribution = rand.DiscreteDistribution([('a', 1), (2, 1)])
+        results = distribution.sample_many(50)
+        self.assertEqual({type(x) for x in results}, {str, int})
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_sample_many_keeps_dtype_of_numpy_outcomes(self):
+        outcomes = numpy.arange(10, dtype=numpy.int16)
+        weights = rand.WeightArrays(outcomes, numpy.ones(10))
+        distribution = rand.DiscreteDistribution(weights)
+        self.assertEqual(distribution.sample_many(50).dtype, outcomes.dtype)
+        self.assertEqual(rand.weighted_choice_many(weights, 50).dtype,
+                         outcomes.dtype)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_choice_many_with_invalid_weights(self):
+        with self.assertRaises(ValueError):
+            rand.weighted_choice_many([], 5)
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.weighted_choice_many([(1, 0), (5, 0)], 5)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_discrete_distribution_sample_many(self):
+        options = [('a', 0), ('b', 1), ('c', 3)]
+        distribution = rand.DiscreteDistribution(options)
+        indices = distribution.sample_many(4000, as_indices=True)
+        self.assertTrue(numpy.isin(indices, [1, 2]).all())
+        self.assertLess(abs((indices == 2).sum() - 3000), 250)
+        values = distribution.sample_many(10)
+        self.assertTrue(numpy.isin(values, ['b', 'c']).all())
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_sample_many_reuses_the_outcome_array(self):
+        distribution = rand.DiscreteDistribution([('a', 1), ('b', 2)])
+        distribution.sample_many(10)
+        outcome_column = distribution._outcome_column
+        distribution.sample_many(10)
+        self.assertIs(distribution._outcome_column, outcome_column)
+        self.assertEqual(list(outcome_column), ['a', 'b'])
+
+    def test_weighted_order_matches_sequential_picking(self):
+        # Picking sequentially without replacement, 'c' comes first
+        # with probability 3/6 and 'a' comes last with probability
+        # 3/6 * 2/3 + 2/6 * 3/4 = 7/12
+        weights = [('a', 1), ('b', 2), ('c', 3)]
+        TRIALS = 6000
+        c_first_count = 0
+        a_last_count = 0
+        for i in range(TRIALS):
+            order = rand.weighted_order(weights)
+            if order[0] == 'c':
+                c_first_count += 1
+            if order[-1] == 'a':
+                a_last_count += 1
+        self.assertLess(abs(c_first_count - TRIALS / 2), TRIALS / 20)
+        self.assertLess(abs(a_last_count - TRIALS * 7 / 12), TRIALS / 20)
+
+    def test_functions_are_reproducible_with_rng(self):
+        weights = [(-3, 4), (0, 10), (5, 1)]
+
+        def roll(rng):
+            return (rand.prob_bool(0.5, rng=rng),
+                    rand.percent_possible(50, rng=rng),
+                    rand.pos_or_neg(3, rng=rng),
+                    rand.pos_or_neg_1(rng=rng),
+                    rand.weighted_rand(weights, rng=rng),
+                    rand.weighted_choice(weights, rng=rng),
+                    rand.weighted_order(weights, rng=rng))
+        self.assertEqual(roll(random.Random(42)), roll(random.Random(42)))
+
+    def test_rng_does_not_touch_global_random_state(self):
+        random.seed(7)
+        expected = random.random()
+        random.seed(7)
+        rand.weighted_rand([(0, 1), (1, 1)], rng=random.Random(1))
+        rand.weighted_choice([(0, 1), (1, 1)], rng=random.Random(1))
+        self.assertEqual(random.random(), expected)
+
+    def test_rng_helpers_are_reproducible_and_in_range(self):
+        def roll(rng):
+            return (rand.random_value(rng),
+                    rand.uniform_value(-2, 2, rng),
+                    rand.random_int(1, 6, rng),
+                    rand.random_item('abc', rng),
+                    rand.random_seed(rng))
+        values = roll(random.Random(11))
+        self.assertEqual(values, roll(random.Random(11)))
+        self.assertTrue(0 <= values[0] < 1)
+        self.assertTrue(-2 <= values[1] <= 2)
+        self.assertIn(values[2], range(1, 7))
+        self.assertIn(values[3], 'abc')
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_functions_accept_numpy_generator_as_rng(self):
+        weights = [(-3, 4), (0, 10), (5, 1)]
+
+        def roll(rng):
+            return (rand.weighted_rand(weights, rng=rng),
+                    rand.weighted_choice(weights, rng=rng),
+                    list(rand.weighted_rand_many(weights, 5, rng=rng)),
+                    list(rand.weighted_choice_many(weights, 5, rng=rng)))
+        self.assertEqual(roll(numpy.random.default_rng(3)),
+                         roll(numpy.random.default_rng(3)))
+
+
+class TestWeightedSample(unittest.TestCase):
+    weights = [('a', 10), ('b', 5), ('c', 1), ('d', 1)]
+
+    def assert_matches_weighted_order(self, picks, k):
+        rng = random.Random(11)
+        expected = {}
+        for i in range(len(picks)):
+            prefix = tuple(rand.weighted_order(self.weights, rng)[:k])
+            expected[prefix] = expected.get(prefix, 0) + 1
+        counts = {}
+        for pick in picks:
+            counts[tuple(pick)] = counts.get(tuple(pick), 0) + 1
+        self.assertEqual(set(counts), set(expected))
+        for prefix, count in expected.items():
+            self.assertLess(abs(counts[prefix] - count) / len(picks), 0.015)
+
+    def test_matches_weighted_order_prefix(self):
+        rng = random.Random(2)
+        picks = [rand.weighted_sample(self.weights, 2, rng)
+                 for i in range(20000)]
+        self.assertTrue(all(len(set(pick)) == 2 for pick in picks))
+        self.assert_matches_weighted_order(picks, 2)
+
+    def test_k_beyond_length_returns_every_item(self):
+        picks = rand.weighted_sample(self.weights, 10)
+        self.assertEqual(sorted(picks), ['a', 'b', 'c', 'd'])
+        self.assertEqual(rand.weighted_sample([], 3), [])
+        self.assertEqual(rand.weighted_sample(self.weights, 0), [])
+
+    def test_invalid_arguments_raise(self):
+        with self.assertRaises(ValueError):
+            rand.weighted_sample(self.weights, -1)
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.weighted_sample([('a', 1), ('b', 0)], 1)
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.weighted_sample_many([('a', 1), ('b', 0)], 1, 5)
+
+    def test_is_reproducible_with_rng(self):
+        self.assertEqual(
+            rand.weighted_sample(self.weights, 3, random.Random(4)),
+            rand.weighted_sample(self.weights, 3, random.Random(4)))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_sample_many_matches_weighted_order_prefix(self):
+        picks = rand.weighted_sample_many(self.weights, 2, 20000)
+        self.assertEqual(picks.shape, (20000, 2))
+        self.assertTrue((picks[:, 0] != picks[:, 1]).all())
+        self.assert_matches_weighted_order(picks.tolist(), 2)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_sample_many_as_indices(self):
+        indices = rand.weighted_sample_many(
+            rand.WeightArrays(numpy.array(['a', 'b', 'c']),
+                              numpy.array([1., 2., 3.])),
+            5, 10, as_indices=True)
+        self.assertEqual(indices.shape, (10, 3))
+        self.assertTrue((numpy.sort(indices, axis=1) == [0, 1, 2]).all())
+        self.assertEqual(
+            rand.weighted_sample_many(self.weights, 0, 4).shape, (4, 0))
+
+    def test_sample_many_without_numpy_returns_lists(self):
+        original_numpy = rand._numpy
+        rand._numpy = False
+        try:
+            picks = rand.weighted_sample_many(self.weights, 3, 10)
+            indices = rand.weighted_sample_many(self.weights, 3, 10,
+                                                as_indices=True)
+        finally:
+            rand._numpy = original_numpy
+        self.assertEqual(len(picks), 10)
+        self.assertTrue(all(len(set(pick)) == 3 for pick in picks))
+        self.assertTrue(all(set(row) <= {0, 1, 2, 3} for row in indices))
+
+
+class TestWeightedChoiceStream(unittest.TestCase):
+    def test_k_1_frequencies_match_weights(self):
+        options = [('a', 1), ('b', 3), ('c', 0), ('d', 4), ('e', -2)]
+        counts = {'a': 0, 'b': 0, 'd': 0}
+        for i in range(8000):
+            picked = rand.weighted_choice_stream(iter(options))
+            self.assertEqual(len(picked), 1)
+            counts[picked[0]] += 1
+        self.assertLess(abs(counts['a'] / 8000 - 1 / 8), 0.02)
+        self.assertLess(abs(counts['b'] / 8000 - 3 / 8), 0.02)
+        self.assertLess(abs(counts['d'] / 8000 - 4 / 8), 0.02)
+
+    def test_order_matches_weighted_order(self):
+        # The probability that 'b' is picked first and 'a' second
+        # when picking from weighted_order() one item at a time
+        options = [('a', 1), ('b', 2), ('c', 3)]
+        expected = (2 / 6) * (1 / 4)
+        hits = sum(rand.weighted_choice_stream(options, k=2) == ['b', 'a']
+                   for i in range(20000))
+        self.assertLess(abs(hits / 20000 - expected), 0.015)
+
+    def test_reads_generators_once(self):
+        consumed = []
+
+        def items():
+            for i in range(1000):
+                consumed.append(i)
+                yield (i, 1 + i % 3)
+        picked = rand.weighted_choice_stream(items(), k=10)
+        self.assertEqual(len(set(picked)), 10)
+        self.assertEqual(consumed, list(range(1000)))
+
+    def test_fewer_items_than_k(self):
+        picked = rand.weighted_choice_stream([('a', 1), ('b', 0), ('c', 2)],
+                                             k=5)
+        self.assertEqual(sorted(picked), ['a', 'c'])
+        self.assertEqual(rand.weighted_choice_stream([], k=3), [])
+        self.assertEqual(rand.weighted_choice_stream([('a', 1)], k=0), [])
+
+    def test_negative_k_raises(self):
+        with self.assertRaises(ValueError):
+            rand.weighted_choice_stream([('a', 1)], k=-1)
+
+    def test_is_reproducible_with_rng(self):
+        options = [(i, i % 5) for i in range(500)]
+        self.assertEqual(
+            rand.weighted_choice_stream(options, 7, rng=random.Random(3)),
+            rand.weighted_choice_stream(options, 7, rng=random.Random(3)))
+
+
+class TestRandWithoutNumpy(unittest.TestCase):
+    """Tests for batch functions with the pure Python fallback."""
+    def setUp(self):
+        self.original_numpy = rand._numpy
+        rand._numpy = False
+
+    def tearDown(self):
+        rand._numpy = self.original_numpy
+
+    def test_bernoulli_batches_return_lists(self):
+        self.assertEqual(rand.prob_bool_many(1, 3), [True] * 3)
+        self.assertEqual(rand.prob_bool_many([0, 1]), [False, True])
+        self.assertEqual(rand.percent_possible_many(0, 2), [False] * 2)
+        self.assertEqual(rand.pos_or_neg_1_many([1, 0]), [1, -1])
+        with self.assertRaises(ValueError):
+            rand.prob_bool_many([0.5, 0.5], 3)
+        with self.assertRaises(ImportError):
+            rand.prob_bool_many(0.5, 8, packed=True)
+
+    def test_bernoulli_batches_with_shapes(self):
+        values = rand.prob_bool_many(0.5, (2, 3))
+        self.assertEqual(len(values), 2)
+        self.assertTrue(all(len(row) == 3 for row in values))
+        self.assertEqual(rand.prob_bool_many([0, 1], (3, 2)),
+                         [[False, True]] * 3)
+        self.assertEqual(rand.prob_bool_many([[0, 1], [1, 1]]),
+                         [[False, True], [True, True]])
+        self.assertEqual(rand.pos_or_neg_1_many([[1], [0]]), [[1], [-1]])
+        with self.assertRaises(ValueError):
+            rand.prob_bool_many([[0.5, 0.5]], (2, 2))
+
+    def test_bernoulli_batches_with_scalars(self):
+        self.assertIs(rand.prob_bool_many(1), True)
+        self.assertIs(rand.percent_possible_many(0), False)
+        self.assertIn(rand.pos_or_neg_1_many(), (1, -1))
+
+    def test_weighted_rand_many_returns_list(self):
+        results = rand.weighted_rand_many([(0, 1), (10, 1)], 100)
+        self.assertIsInstance(results, list)
+        self.assertEqual(len(results), 100)
+        self.assertTrue(all(0 <= r <= 10 for r in results))
+
+    def test_weighted_rand_many_with_round_result(self):
+        results = rand.weighted_rand_many([(0, 1), (10, 1)], 100,
+                                          round_result=True)
+        self.assertTrue(all(isinstance(r, int) for r in results))
+
+    def test_weighted_choice_many_returns_list(self):
+        options = [(1, 0), (5, -1), (10, 5), (19, 1), (20, 0)]
+        results = rand.weighted_choice_many(options, 100)
+        self.assertIsInstance(results, list)
+        self.assertTrue(all(r in [10, 19] for r in results))
+        indices = rand.weighted_choice_many(options, 100, as_indices=True)
+        self.assertTrue(all(i in [2, 3] for i in indices))
+        # Rolls at the very top never reach the trailing zero strength
+        self.assertEqual(
+            rand.weighted_choice_many(options, 3, rng=_HighestRandom()),
+            [19] * 3)
+
+    def test_dynamic_distribution_sample_many_returns_list(self):
+        distribution = rand.DynamicDistribution([('a', 1), ('b', 0)])
+        self.assertEqual(distribution.sample_many(5), ['a'] * 5)
+        self.assertEqual(distribution.sample_many(5, as_indices=True),
+                         [0] * 5)
+
+    def test_discrete_distribution_sample_many_returns_list(self):
+        distribution = rand.DiscreteDistribution([('a', 1), ('b', 0)])
+        self.assertEqual(distribution.sample_many(3), ['a', 'a', 'a'])
+        self.assertEqual(distribution.sample_many(3, as_indices=True),
+                         [0, 0, 0])
+
+    def test_batch_functions_are_reproducible_with_rng(self):
+        weights = [(-3, 4), (0, 10), (5, 1)]
+        self.assertEqual(
+            rand.weighted_rand_many(weights, 10, rng=random.Random(1)),
+            rand.weighted_rand_many(weights, 10, rng=random.Random(1)))
+
+    def test_weight_arrays_use_list_fallback(self):
+        weights = rand.WeightArrays([0, 5, 10], [0, 1, 0])
+        self.assertTrue(0 <= rand.weighted_rand(weights) <= 10)
+        self.assertEqual(rand.weighted_choice_many(weights, 2), [5, 5])
+
+    def test_importing_rand_does_not_import_numpy(self):
+        script = 'import sys, blur.rand; print("numpy" in sys.modules)'
+        output = subprocess.check_output([sys.executable, '-c', script])
+        self.assertEqual(output.strip(), b'False')
+
+
+class TestWeightTable(unittest.TestCase):
+    def test_behaves_like_tuple_of_weights(self):
+        weights = [('a', 1), ('b', 2)]
+        table = rand.WeightTable(weights)
+        self.assertEqual(list(table), weights)
+        self.assertEqual(table[1], ('b', 2))
+        self.assertEqual(len(table), 2)
+        self.assertFalse(table.is_numerical)
+
+    def test_wrapping_a_table_returns_it(self):
+        table = rand.WeightTable([(0, 1), (1, 1)])
+        self.assertIs(rand.WeightTable(table), table)
+
+    def test_invalid_weights_raise(self):
+        with self.assertRaises(ValueError):
+            rand.WeightTable([])
+        with self.assertRaises(TypeError):
+            rand.WeightTable([('a', 'not a number')])
+        with self.assertRaises(TypeError):
+            rand.WeightTable([('a', 1, 2)])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_accepts_numpy_scalars(self):
+        table = rand.WeightTable([(numpy.int64(0), numpy.float64(1)),
+                                  (numpy.int64(10), numpy.int64(5))])
+        self.assertTrue(table.is_numerical)
+        self.assertTrue(0 <= rand.weighted_rand(table) <= 10)
+
+    def test_is_immutable(self):
+        table = rand.WeightTable([(0, 1), (1, 1)])
+        with self.assertRaises(TypeError):
+            table[0] = (5, 5)
+
+    def test_compiled_distributions_are_reused(self):
+        table = rand.WeightTable([(3, 1), (0, 1)])
+        self.assertIs(table.continuous, table.continuous)
+        self.assertIs(table.discrete, table.discrete)
+
+    def test_non_numerical_table_has_no_continuous_distribution(self):
+        with self.assertRaises(TypeError):
+            rand.WeightTable([('a', 1), ('b', 1)]).continuous
+
+    def test_rand_functions_accept_table(self):
+        table = rand.WeightTable([(5, 1), (0, 0), (10, 1)])
+        self.assertTrue(0 <= rand.weighted_rand(table) <= 10)
+        self.assertIn(rand.weighted_choice(table), [5, 10])
+        self.assertIn(rand.weighted_choice(table, True), [(0, 5), (2, 10)])
+        self.assertEqual(
+            rand.bound_weights(rand.WeightTable([(0, 0), (10, 10)]), 2, 10),
+            [(2, 2), (10, 10)])
+        self.assertEqual(len(rand.weighted_choice_many(table, 5)), 5)
+        self.assertEqual(len(rand.weighted_rand_many(table, 5)), 5)
+
+    def test_weighted_choice_with_all_zero_table_raises(self):
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.weighted_choice(rand.WeightTable([('a', 0), ('b', 0)]))
+
+
+class TestWeightArrays(unittest.TestCase):
+    def test_behaves_like_list_of_weights(self):
+        weights = rand.WeightArrays(['a', 'b', 'c'], [1, 2, 3])
+        self.assertEqual(len(weights), 3)
+        self.assertEqual(weights[1], ('b', 2))
+        self.assertEqual(list(weights), [('a', 1), ('b', 2), ('c', 3)])
+        self.assertEqual(list(weights[1:]), [('b', 2), ('c', 3)])
+        self.assertEqual(rand.WeightTable(weights),
+                         (('a', 1), ('b', 2), ('c', 3)))
+
+    def test_mismatched_lengths_raise(self):
+        with self.assertRaises(ValueError):
+            rand.WeightArrays([1, 2], [1])
+
+    def test_functions_accept_weight_arrays(self):
+        weights = rand.WeightArrays([0, 5, 10], [0, 1, 0])
+        self.assertTrue(0 <= rand.weighted_rand(weights) <= 10)
+        self.assertEqual(len(rand.weighted_rand_many(weights, 5)), 5)
+        self.assertEqual(rand.bound_weights(weights, 5, 10),
+                         [(5, 1), (10, 0)])
+        options = rand.WeightArrays(['a', 'b', 'c'], [0, 1, 0])
+        self.assertEqual(rand.weighted_choice(options), 'b')
+        self.assertEqual(rand.weighted_choice(options, True), (1, 'b'))
+        self.assertEqual(list(rand.weighted_choice_many(options, 3)),
+                         ['b', 'b', 'b'])
+        self.assertEqual(
+            sorted(rand.weighted_order(rand.WeightArrays('xyz', [1, 2, 3]))),
+            ['x', 'y', 'z'])
+
+    def test_weighted_rand_with_one_weight_returns_it(self):
+        weights = rand.WeightArrays(['The Only Weight'], [2])
+        self.assertEqual(rand.weighted_rand(weights), 'The Only Weight')
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_array_segments_match_list_segments(self):
+        generator = random.Random(3)
+        for i in range(200):
+            # Include negative strengths and repeated outcomes
+            weights = [(generator.randint(-5, 5), generator.randint(-3, 6))
+                       for j in range(generator.randint(2, 12))]
+            try:
+                expected = rand.PiecewiseLinearDistribution(weights)
+            except rand.ProbabilityUndefinedError:
+                with self.assertRaises(rand.ProbabilityUndefinedError):
+                    rand.PiecewiseLinearDistribution(rand.WeightArrays(
+                        numpy.array([w[0] for w in weights]),
+                        numpy.array([w[1] for w in weights])))
+                continue
+            result = rand.PiecewiseLinearDistribution(rand.WeightArrays(
+                numpy.array([w[0] for w in weights]),
+                numpy.array([w[1] for w in weights])))
+            self.assertEqual(result.total_area, expected.total_area)
+            for attribute in ['_x_starts', '_y_starts', '_slopes',
+                              '_widths', '_area_starts']:
+                self.assertEqual(getattr(result, attribute),
+                                 getattr(expected, attribute))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_large_numpy_arrays(self):
+        outcomes = numpy.arange(100000)
+        strengths = numpy.zeros(100000)
+        strengths[[10, 99999]] = 1
+        options = rand.WeightArrays(outcomes, strengths)
+        self.assertIn(rand.weighted_choice(options), [10, 99999])
+        self.assertTrue(set(rand.weighted_choice_many(options, 100))
+                        <= {10, 99999})
+        self.assertTrue(9 <= rand.weighted_rand(options) <= 99999)
+
+
+class TestNormalDistribution(unittest.TestCase):
+    def test__standard_normal_ppf_inverts__standard_normal_cdf(self):
+        for x in [-30, -6, -2.5, -0.3, 0, 0.3, 2.5, 6]:
+            p = rand._standard_normal_cdf(x)
+            self.assertAlmostEqual(rand._standard_normal_ppf(p), x, places=6)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test__standard_normal_ppf_array_matches_scalar(self):
+        p = numpy.array([1e-200, 1e-10, 0.01, 0.2, 0.5, 0.9, 0.999999])
+        results = rand._standard_normal_ppf_array(p)
+        for result, single_p in zip(results, p):
+            self.assertAlmostEqual(result,
+                                   rand._standard_normal_ppf(single_p))
+
+    def test_sample_mean_and_variance(self):
+        distribution = rand.NormalDistribution(-12, 2.5)
+        samples = [distribution.sample() for i in range(5000)]
+        mean = sum(samples) / len(samples)
+        variance = sum((s - mean) ** 2 for s in samples) / len(samples)
+        self.assertLess(abs(mean + 12), 0.15)
+        self.assertLess(abs(variance - 2.5), 0.3)
+
+    def test_truncated_samples_stay_in_bounds(self):
+        # Bounds in both tails and straddling the mean
+        for minimum, maximum in [(3, 4), (-4, -3), (-1, 2), (8, None)]:
+            distribution = rand.NormalDistribution(0, 1, minimum, maximum)
+            for i in range(200):
+                sample = distribution.sample()
+                self.assertGreaterEqual(sample, minimum)
+                if maximum is not None:
+                    self.assertLessEqual(sample, maximum)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_sample_many(self):
+        distribution = rand.NormalDistribution(5, 4, minimum=5)
+        samples = distribution.sample_many(100000)
+        self.assertTrue((samples >= 5).all())
+        # The mean of a half-normal is sigma * sqrt(2 / pi) above its edge
+        self.assertLess(abs(samples.mean() - (5 + 2 * math.sqrt(2 / math.pi))),
+                        0.03)
+
+    def test_invalid_arguments_raise(self):
+        with self.assertRaises(ValueError):
+            rand.NormalDistribution(0, 0)
+        with self.assertRaises(ValueError):
+            rand.NormalDistribution(0, 1, minimum=2, maximum=1)
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.NormalDistribution(0, 1, minimum=100)
+
+
+class TestDistributionFunctions(unittest.TestCase):
+    curve = [(0, 0), (2, 2), (2, 0), (4, 0), (5, 1), (6, -1)]
+
+    def test_piecewise_linear_pdf(self):
+        distribution = rand.PiecewiseLinearDistribution(self.curve)
+        total_area = distribution.total_area
+        self.assertAlmostEqual(distribution.pdf(1), 1 / total_area)
+        self.assertEqual(distribution.pdf(3), 0)
+        self.assertEqual(distribution.pdf(-1), 0)
+        self.assertEqual(distribution.pdf(7), 0)
+        self.assertAlmostEqual(distribution.pdf(5.25), 0.5 / total_area)
+
+    def test_piecewise_linear_cdf(self):
+        distribution = rand.PiecewiseLinearDistribution(self.curve)
+        self.assertEqual(distribution.cdf(-1), 0)
+        self.assertAlmostEqual(distribution.cdf(2), 2 / 2.75)
+        self.assertAlmostEqual(distribution.cdf(3), 2 / 2.75)
+        self.assertEqual(distribution.cdf(10), 1)
+
+    def test_piecewise_linear_ppf_inverts_cdf(self):
+        distribution = rand.PiecewiseLinearDistribution(self.curve)
+        for outcome in [0.5, 1, 1.9, 4.5, 5.1, 5.4]:
+            self.assertAlmostEqual(
+                distribution.ppf(distribution.cdf(outcome)), outcome)
+        with self.assertRaises(ValueError):
+            distribution.ppf(1.5)
+
+    def test_continuous_ppf_of_parametric_distributions(self):
+        distribution = rand.NormalDistribution(10, 4)
+        self.assertAlmostEqual(distribution.ppf(0.5), 10)
+        self.assertAlmostEqual(distribution.ppf(0.975), 10 + 1.959964 * 2,
+                               places=5)
+
+    def test_discrete_functions(self):
+        distribution = rand.DiscreteDistribution(
+            [(3, 2), (1, 1), (2, 1), (1, 0), (3, 0), (5, -2)])
+        self.assertEqual(distribution.pmf(3), 0.5)
+        self.assertEqual(distribution.pmf(5), 0)
+        self.assertEqual(distribution.pmf(4), 0)
+        self.assertEqual(distribution.cdf(0), 0)
+        self.assertEqual(distribution.cdf(2), 0.5)
+        self.assertEqual(distribution.cdf(2.5), 0.5)
+        self.assertEqual(distribution.cdf(9), 1)
+        self.assertEqual(distribution.ppf(0), 1)
+        self.assertEqual(distribution.ppf(0.25), 1)
+        self.assertEqual(distribution.ppf(0.26), 2)
+        self.assertEqual(distribution.ppf(1), 3)
+        with self.assertRaises(ValueError):
+            distribution.ppf(-0.5)
+
+    def test_discrete_pmf_merges_equal_outcomes(self):
+        distribution = rand.DiscreteDistribution(
+            [('a', 1), ('b', 1), ('a', 2)])
+        self.assertEqual(distribution.pmf('a'), 0.75)
+        self.assertEqual(distribution.pmf('b'), 0.25)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_vectorized_functions_match_scalar_functions(self):
+        curve = rand.PiecewiseLinearDistribution(self.curve)
+        outcomes = numpy.linspace(-1, 7, 97)
+        fractions = numpy.linspace(0, 1, 97)
+        options = rand.DiscreteDistribution(
+            [(3, 2), (1, 1), (2, 1), (1, 0), (3, 0), (5, -2)])
+        for distribution, function, values in [
+                (curve, 'pdf', outcomes), (curve, 'cdf', outcomes),
+                (curve, 'ppf', fractions), (options, 'pmf', outcomes),
+                (options, 'cdf', outcomes), (options, 'ppf', fractions)]:
+            results = getattr(distribution, function)(values)
+            self.assertIsInstance(results, numpy.ndarray)
+            for value, result in zip(values, results):
+                self.assertAlmostEqual(
+                    result, getattr(distribution, function)(float(value)))
+        with self.assertRaises(ValueError):
+            curve.ppf(numpy.array([0.5, 2]))
+        with self.assertRaises(ValueError):
+            options.ppf(numpy.array([0.5, 2]))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_discrete_pmf_of_string_array(self):
+        distribution = rand.DiscreteDistribution(
+            [('a', 1), ('b', 1), ('a', 2)])
+        self.assertEqual(list(distribution.pmf(['b', 'c', 'a'])),
+                         [0.25, 0, 0.75])
+
+    def test_functions_without_numpy_return_lists(self):
+        original_numpy = rand._numpy
+        rand._numpy = False
+        try:
+            curve = rand.PiecewiseLinearDistribution(self.curve)
+            self.assertIsInstance(curve.cdf([1, 2]), list)
+            self.assertEqual(curve.ppf([0, 1]), [0, 5.5])
+            options = rand.DiscreteDistribution([('a', 1), ('b', 3)])
+            self.assertEqual(options.pmf(['a', 'b']), [0.25, 0.75])
+        finally:
+            rand._numpy = original_numpy
+
+
+class TestDynamicDistribution(unittest.TestCase):
+    def assert_frequencies(self, picks, expected):
+        for outcome, chance in expected.items():
+            self.assertLess(
+                abs(picks.count(outcome) / len(picks) - chance), 0.02)
+        self.assertEqual(set(picks), set(expected))
+
+    def test_sample_matches_strengths(self):
+        distribution = rand.DynamicDistribution(
+            [('a', 1), ('b', 0), ('c', 3), ('d', -2)])
+        self.assertEqual(distribution.total_strength, 4)
+        picks = [distribution.sample() for i in range(8000)]
+        self.assert_frequencies(picks, {'a': 0.25, 'c': 0.75})
+
+    def test_update_insert_and_remove(self):
+        distribution = rand.DynamicDistribution([('a', 1), ('b', 1)])
+        distribution.update(0, 4)
+        self.assertEqual(distribution[0], ('a', 4))
+        self.assertEqual(distribution.insert('c', 5), 2)
+        distribution.remove(1)
+        self.assertEqual(len(distribution), 2)
+        self.assertEqual(distribution.total_strength, 9)
+        picks = [distribution.sample() for i in range(8000)]
+        self.assert_frequencies(picks, {'a': 4 / 9, 'c': 5 / 9})
+        # Removed indices are reused
+        self.assertEqual(distribution.insert('d', 1), 1)
+        self.assertEqual(distribution[1], ('d', 1))
+
+    def test_matches_brute_force_after_many_changes(self):
+        rng = random.Random(3)
+        distribution = rand.DynamicDistribution()
+        options = {}
+        for step in range(3000):
+            action = rng.random()
+            if action < 0.3 or not options:
+                strength = rng.choice([0, -1, rng.uniform(0, 10)])
+                index = distribution.insert(step, strength)
+                self.assertNotIn(index, options)
+                options[index] = strength
+            elif action < 0.5:
+                index = rng.choice(sorted(options))
+                distribution.remove(index)
+                del options[index]
+            else:
+                index = rng.choice(sorted(options))
+                options[index] = rng.uniform(-2, 10)
+                distribution.update(index, options[index])
+            self.assertAlmostEqual(
+                distribution.total_strength,
+                sum(max(strength, 0) for strength in options.values()))
+            if distribution.total_strength > 0:
+                index = distribution.sample_index(rng)
+                self.assertGreater(options[index], 0)
+
+    def test_removing_huge_strength_keeps_small_strengths(self):
+        distribution = rand.DynamicDistribution([('a', 1e20), ('b', 1)])
+        distribution.update(0, 0)
+        self.assertEqual(distribution.total_strength, 1)
+        self.assertEqual(distribution.sample(), 'b')
+        distribution = rand.DynamicDistribution(
+            [('a', 1e20), ('b', 1), ('c', 3)])
+        distribution.remove(0)
+        self.assertEqual(distribution.total_strength, 4)
+        picks = [distribution.sample() for i in range(4000)]
+        self.assertLess(abs(picks.count('b') / 4000 - 0.25), 0.03)
+
+    def test_sample_rebuilds_cancelled_tree(self):
+        distribution = rand.DynamicDistribution([('a', 1), ('b', 1)])
+        # Simulate partial sums which have cancelled out
+        distribution._tree = [0.0] * len(distribution._tree)
+        self.assertIn(distribution.sample(), ['a', 'b'])
+        self.assertEqual(distribution.total_strength, 2)
+
+    def test_missing_indices_raise_IndexError(self):
+        distribution = rand.DynamicDistribution([('a', 1), ('b', 1)])
+        distribution.remove(0)
+        with self.assertRaises(IndexError):
+            distribution.update(0, 1)
+        with self.assertRaises(IndexError):
+            distribution.remove(0)
+        with self.assertRaises(IndexError):
+            distribution[5]
+
+    def test_no_positive_strength_raises(self):
+        distribution = rand.DynamicDistribution([('a', 1)])
+        distribution.update(0, 0)
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            distribution.sample()
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.DynamicDistribution().sample_many(5)
+
+    def test_sample_many_matches_strengths(self):
+        distribution = rand.DynamicDistribution(
+            [('a', 1), ('b', 0), ('c', 3)])
+        distribution.insert('d', 0)
+        picks = list(distribution.sample_many(8000))
+        self.assert_frequencies(picks, {'a': 0.25, 'c': 0.75})
+        indices = list(distribution.sample_many(100, as_indices=True))
+        self.assertTrue(set(indices) <= {0, 2})
+
+    def test_is_reproducible_with_rng(self):
+        distribution = rand.DynamicDistribution([(i, i) for i in range(20)])
+        self.assertEqual(
+            [distribution.sample(rng=random.Random(5)) for i in range(20)],
+            [distribution.sample(rng=random.Random(5)) for i in range(20)])
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestGridDistribution(unittest.TestCase):
+    grid = [[0, 1, 0],
+            [0, 5, 2],
+            [-1, 0, 0]]
+
+    def test_frequencies_match_grid(self):
+        points = rand.GridDistribution(self.grid).sample_many(16000)
+        self.assertEqual(points.shape, (16000, 2))
+        counts = {}
+        for x, y in points.tolist():
+            counts[(x, y)] = counts.get((x, y), 0) + 1
+        self.assertEqual(set(counts), {(1, 0), (1, 1), (2, 1)})
+        self.assertLess(abs(counts[(1, 1)] / 16000 - 5 / 8), 0.02)
+        self.assertLess(abs(counts[(2, 1)] / 16000 - 2 / 8), 0.02)
+
+    def test_sample(self):
+        distribution = rand.GridDistribution(numpy.array(self.grid))
+        for i in range(50):
+            x, y = distribution.sample()
+            self.assertIsInstance(x, int)
+            self.assertIn((x, y), [(1, 0), (1, 1), (2, 1)])
+
+    def test_jitter_spreads_points_over_cells(self):
+        distribution = rand.GridDistribution([[0, 0], [0, 1]])
+        points = distribution.sample_many(1000, jitter=True)
+        self.assertTrue(((points >= 1) & (points < 2)).all())
+        self.assertGreater(len(set(points[:, 0].tolist())), 1)
+        x, y = distribution.sample(jitter=True)
+        self.assertTrue(1 <= x < 2 and 1 <= y < 2)
+
+    def test_invalid_grids_raise(self):
+        with self.assertRaises(ValueError):
+            rand.GridDistribution([1, 2, 3])
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.GridDistribution([[0, 0], [0, -1]])
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.GridDistribution(numpy.zeros((0, 4)))
+
+    def test_is_reproducible_with_rng(self):
+        distribution = rand.GridDistribution(self.grid)
+        self.assertEqual(
+            distribution.sample_many(20, rng=random.Random(2)).tolist(),
+            distribution.sample_many(20, rng=random.Random(2)).tolist())
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestFit(unittest.TestCase):
+    samples = numpy.random.default_rng(4).normal(3, 2, 20000) \
+        if numpy is not None else None
+
+    def test_histogram_matches_samples(self):
+        distribution = rand.fit(self.samples)
+        self.assertIsInstance(distribution, rand.PiecewiseLinearDistribution)
+        self.assertAlmostEqual(distribution.total_area, 1)
+        self.assertAlmostEqual(distribution.mean, 3, delta=0.05)
+        self.assertAlmostEqual(distribution.variance, 4, delta=0.1)
+        low, high = distribution.support
+        self.assertEqual(low, self.samples.min())
+        self.assertEqual(high, self.samples.max())
+
+    def test_histogram_weights_hold_bin_densities(self):
+        distribution, weights = rand.fit([0, 0, 0, 0.5, 2, 2], bins=2,
+                                         return_weights=True)
+        self.assertEqual(weights, [(0, 4 / 6), (1, 4 / 6),
+                                   (1, 2 / 6), (2, 2 / 6)])
+        self.assertAlmostEqual(distribution.cdf(1), 4 / 6)
+        self.assertAlmostEqual(rand.weighted_rand(weights), 1, delta=1)
+
+    def test_histogram_accepts_bin_edges(self):
+        distribution, weights = rand.fit(self.samples, bins=[-1, 3, 7],
+                                         return_weights=True)
+        self.assertEqual([outcome for outcome, strength in weights],
+                         [-1, 3, 3, 7])
+        self.assertEqual(distribution.support, (-1, 7))
+
+    def test_kde_matches_samples(self):
+        bandwidth = 0.5
+        distribution, weights = rand.fit(self.samples, bins=300,
+                                         method='kde', bandwidth=bandwidth,
+                                         return_weights=True)
+        self.assertEqual(len(weights), 300)
+        self.assertAlmostEqual(distribution.total_area, 1, delta=0.001)
+        self.assertAlmostEqual(distribution.mean, 3, delta=0.05)
+        # Smoothing adds the kernel's variance
+        self.assertAlmostEqual(distribution.variance, 4 + bandwidth ** 2,
+                               delta=0.1)
+        self.assertAlmostEqual(distribution.mode, 3, delta=0.3)
+
+    def test_kde_of_one_sample_is_the_kernel(self):
+        distribution = rand.fit([5], method='kde', bandwidth=1, bins=401)
+        self.assertAlmostEqual(distribution.pdf(5),
+                               1 / math.sqrt(2 * math.pi), places=3)
+        self.assertAlmostEqual(distribution.cdf(6), 0.8413, places=3)
+
+    def test_kde_estimates_bandwidth(self):
+        distribution = rand.fit(self.samples, method='kde')
+        self.assertAlmostEqual(distribution.mean, 3, delta=0.05)
+
+    def test_sample_many_from_fit(self):
+        values = rand.fit(self.samples).sample_many(20000)
+        self.assertAlmostEqual(float(values.mean()), 3, delta=0.1)
+
+    def test_invalid_arguments_raise_ValueError(self):
+        with self.assertRaises(ValueError):
+            rand.fit([])
+        with self.assertRaises(ValueError):
+            rand.fit([1, float('nan')])
+        with self.assertRaises(ValueError):
+            rand.fit([1, 2], method='spline')
+        with self.assertRaises(ValueError):
+            rand.fit([1, 2], method='kde', bandwidth=0)
+        with self.assertRaises(ValueError):
+            rand.fit([1, 1, 1], method='kde')
+        with self.assertRaises(ValueError):
+            rand.fit([1, 2], method='kde', bins=1)
+
+
+class TestRoundedDistribution(unittest.TestCase):
+    weights = [(-3, 4), (0, 10), (5, 1)]
+
+    def test_masses_are_areas_around_integers(self):
+        curve = rand.PiecewiseLinearDistribution(self.weights)
+        rounded = curve.rounded()
+        self.assertIs(curve.rounded(), rounded)
+        self.assertEqual(rounded.support, list(range(-3, 6)))
+        self.assertAlmostEqual(sum(rounded.pmf(k) for k in range(-3, 6)), 1)
+        for k in range(-3, 6):
+            self.assertAlmostEqual(rounded.pmf(k),
+                                   curve.cdf(k + 0.5) - curve.cdf(k - 0.5))
+
+    def test_rounded_outcomes_are_ints(self):
+        curve = rand.PiecewiseLinearDistribution([(0.2, 1), (0.4, 1)])
+        self.assertEqual(curve.rounded().support, [0])
+        self.assertIsInstance(curve.rounded().sample(), int)
+
+    def test_weighted_rand_matches_rounded_draws(self):
+        rng = random.Random(6)
+        curve = rand.PiecewiseLinearDistribution(self.weights)
+        values = [rand.weighted_rand(self.weights, round_result=True,
+                                     rng=rng)
+                  for i in range(20000)]
+        self.assertTrue(all(isinstance(value, int) for value in values))
+        for k in range(-3, 6):
+            self.assertLess(
+                abs(values.count(k) / 20000 - curve.rounded().pmf(k)), 0.015)
+
+    def test_wide_curves_are_rounded_per_draw(self):
+        weights = [(0, 1), (10 ** 9, 1)]
+        value = rand.weighted_rand(weights, round_result=True)
+        self.assertIsInstance(value, int)
+        self.assertTrue(0 <= value <= 10 ** 9)
+        self.assertIsNone(rand._compile_rounded(
+            rand.PiecewiseLinearDistribution(weights)))
+
+    def test_wide_curves_cannot_compile_rounded(self):
+        curve = rand.PiecewiseLinearDistribution([(0, 1), (10 ** 9, 1)])
+        with self.assertRaises(ValueError):
+            curve.rounded()
+        self.assertTrue(0 <= curve.sample_rounded() <= 10 ** 9)
+
+    def test_rounded_draws_match_rounded_samples(self):
+        curve = rand.PiecewiseLinearDistribution(self.weights)
+        rng = random.Random(4)
+        values = [curve.sample_rounded(rng) for i in range(200)]
+        self.assertTrue(all(isinstance(value, int) for value in values))
+        rng = random.Random(4)
+        self.assertEqual(values, [int(math.floor(curve.sample(rng) + 0.5))
+                                  for i in range(200)])
+
+    def test_rounded_draws_round_half_up(self):
+        curve = rand.PiecewiseLinearDistribution([(2, 1), (2.5, 1)])
+        self.assertEqual(curve.sample_rounded(_HighestRandom()), 3)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_weighted_rand_many_draws_from_rounded(self):
+        curve = rand.PiecewiseLinearDistribution(self.weights)
+        values = rand.weighted_rand_many(self.weights, 40000,
+                                         round_result=True)
+        self.assertEqual(values.dtype.kind, 'i')
+        counts = numpy.bincount(values + 3, minlength=9) / 40000
+        for k in range(-3, 6):
+            self.assertLess(abs(counts[k + 3] - curve.rounded().pmf(k)),
+                            0.01)
+
+
+class TestSummaryStatistics(unittest.TestCase):
+    def test_uniform_curve(self):
+        distribution = rand.PiecewiseLinearDistribution([(2, 1), (6, 1)])
+        self.assertAlmostEqual(distribution.mean, 4)
+        self.assertAlmostEqual(distribution.variance, 16 / 12)
+        self.assertEqual(distribution.mode, 2)
+        self.assertEqual(distribution.support, (2, 6))
+        self.assertEqual(distribution.total_area, 4)
+
+    def test_triangular_curve(self):
+        distribution = rand.PiecewiseLinearDistribution(
+            [(0, 0), (2, 1), (10, 0), (12, -1)])
+        self.assertAlmostEqual(distribution.mean, 4)
+        self.assertAlmostEqual(distribution.variance,
+                               (100 + 4 - 20) / 18)
+        self.assertEqual(distribution.mode, 2)
+        self.assertEqual(distribution.support, (0, 10))
+
+    def test_curve_far_from_zero(self):
+        distribution = rand.PiecewiseLinearDistribution(
+            [(1e9, 1), (1e9 + 1, 1), (1e9 + 2, 0), (1e9 + 3, 1)])
+        expected = rand.PiecewiseLinearDistribution(
+            [(0, 1), (1, 1), (2, 0), (3, 1)])
+        self.assertAlmostEqual(distribution.mean - 1e9, expected.mean)
+        self.assertAlmostEqual(distribution.variance, expected.variance,
+                               places=6)
+
+    def test_curve_statistics_match_samples(self):
+        distribution = rand.PiecewiseLinearDistribution(
+            rand.normal_distribution(5, 4, minimum=2, weight_count=40))
+        samples = [distribution.sample() for i in range(20000)]
+        mean = sum(samples) / len(samples)
+        variance = sum((s - mean) ** 2 for s in samples) / len(samples)
+        self.assertLess(abs(mean - distribution.mean), 0.05)
+        self.assertLess(abs(variance - distribution.variance),
+                        distribution.variance / 10)
+
+    def test_discrete_statistics(self):
+        distribution = rand.DiscreteDistribution(
+            [(3, 2), (1, 1), (2, 1), (1, 0), (3, 0), (5, -2)])
+        self.assertAlmostEqual(distribution.mean, 9 / 4)
+        self.assertAlmostEqual(distribution.variance, 11 / 16)
+        self.assertEqual(distribution.mode, 3)
+        self.assertEqual(distribution.support, [1, 2, 3])
+        self.assertEqual(distribution.total_strength, 4)
+
+    def test_discrete_mode_merges_equal_outcomes(self):
+        distribution = rand.DiscreteDistribution(
+            [('a', 1), ('b', 2), ('a', 2)])
+        self.assertEqual(distribution.mode, 'a')
+        self.assertEqual(distribution.support, ['a', 'b'])
+
+
+class TestSamplerCache(unittest.TestCase):
+    def setUp(self):
+        rand.clear_sampler_cache()
+
+    def tearDown(self):
+        rand.set_sampler_cache_size(256)
+        rand.clear_sampler_cache()
+
+    def test_equal_weight_lists_share_a_sampler(self):
+        for i in range(3):
+            rand.weighted_rand([(0, 1), (5, 3)])
+        padding = [(None, 0)] * rand._MIN_CACHED_CHOICES
+        rand.weighted_choice([('a', 1), ('b', 3)] + padding)
+        rand.weighted_choice([('c', 1), ('d', 3)] + padding)
+        rand.weighted_choice([('e', 1), ('f', 3)] + padding)
+        info = rand.sampler_cache_info()
+        self.assertEqual(info['hits'], 3)
+        self.assertEqual(info['misses'], 3)
+        self.assertEqual(info['currsize'], 2)
+
+    def test_options_seen_once_are_not_hits(self):
+        padding = [(None, 0)] * rand._MIN_CACHED_CHOICES
+        rand.weighted_choice([('a', 1), ('b', 3)] + padding)
+        rand.weighted_choice([('a', 1), ('b', 3)] + padding)
+        self.assertEqual(rand.sampler_cache_info()['hits'], 0)
+
+    def test_weighted_rand_builds_each_curve_once(self):
+        builds = []
+
+        class CountingDistribution(rand.PiecewiseLinearDistribution):
+            def __init__(self, weights):
+                builds.append(weights)
+                super(CountingDistribution, self).__init__(weights)
+
+        original = rand.PiecewiseLinearDistribution
+        rand.PiecewiseLinearDistribution = CountingDistribution
+        try:
+            for i in range(3):
+                rand.weighted_rand([(0, 1), (5, 3)])
+        finally:
+            rand.PiecewiseLinearDistribution = original
+        self.assertEqual(len(builds), 1)
+
+    def test_weights_are_compiled_when_seen_again(self):
+        strengths = list(range(rand._MIN_CACHED_CHOICES))
+        options = [(str(strength), strength) for strength in strengths]
+        key = rand._sampler_cache_key('discrete', strengths)
+        rand.weighted_choice(options)
+        self.assertIs(rand._sampler_cache.get(key), rand._UNCOMPILED)
+        rand.weighted_choice(options)
+        self.assertIsInstance(rand._sampler_cache.get(key), tuple)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy_strengths_are_compiled_when_seen_again(self):
+        strengths = numpy.arange(rand._MIN_CACHED_CHOICES, dtype=float)
+        options = rand.WeightArrays(list(range(len(strengths))), strengths)
+        key = rand._sampler_cache_key('discrete', strengths)
+        rand.weighted_choice(options)
+        self.assertIs(rand._sampler_cache.get(key), rand._UNCOMPILED)
+        rand.weighted_choice(options)
+        self.assertIsInstance(rand._sampler_cache.get(key), tuple)
+        self.assertEqual(rand.sampler_cache_info()['hits'], 1)
+
+    def test_cached_choices_match_uncompiled_choices(self):
+        options = [(i, (i * 7) % 5)
+                   for i in range(rand._MIN_CACHED_CHOICES)]
+        picks = []
+        for size in (0, 256, 256):
+            rand.set_sampler_cache_size(size)
+            rng = random.Random(3)
+            picks.append([rand.weighted_choice(options, rng=rng)
+                          for j in range(50)])
+        self.assertEqual(picks[0], picks[1])
+        self.assertEqual(picks[0], picks[2])
+
+    def test_uncompiled_choice_matches_strengths(self):
+        rand.set_sampler_cache_size(0)
+        options = [('a', 1), ('b', 0), ('c', 3), ('d', -1)]
+        picks = [rand.weighted_choice(options) for i in range(8000)]
+        self.assertEqual(set(picks), {'a', 'c'})
+        self.assertLess(abs(picks.count('a') / 8000 - 0.25), 0.02)
+        self.assertEqual(
+            rand.weighted_choice([('x', 0), ('y', 2)], True), (1, 'y'))
+        with self.assertRaises(rand.ProbabilityUndefinedError):
+            rand.weighted_choice([('x', 0), ('y', -2)])
+
+    def test_cached_choice_returns_outcomes_of_given_list(self):
+        padding = [(None, 0)] * rand._MIN_CACHED_CHOICES
+        rand.weighted_choice([('a', 1), ('b', 0)] + padding)
+        rand.weighted_choice([('a', 1), ('b', 0)] + padding)
+        self.assertEqual(
+            rand.weighted_choice([('c', 1), ('d', 0)] + padding), 'c')
+        self.assertEqual(
+            rand.weighted_choice([(1.5, 1), (2, 0)] + padding, True),
+            (0, 1.5))
+
+    def test_short_option_lists_are_not_cached(self):
+        rand.weighted_choice([('a', 1), ('b', 3)])
+        self.assertEqual(rand.sampler_cache_info()['currsize'], 0)
+
+    def test_unhashable_outcomes_and_weights_are_cached(self):
+        options = [(['a'], 1), (['b'], 1)]
+        options += [(None, 0)] * rand._MIN_CACHED_CHOICES
+        self.assertIn(rand.weighted_choice(options), [['a'], ['b']])
+        weights = [[0, 1], [5, 1]]
+        self.assertTrue(0 <= rand.weighted_rand(weights) <= 5)
+        self.assertEqual(rand.sampler_cache_info()['currsize'], 2)
+
+    def test_set_sampler_cache_size(self):
+        for i in range(5):
+            rand.weighted_rand([(0, 1), (i + 1, 1)])
+        rand.set_sampler_cache_size(2)
+        self.assertEqual(rand.sampler_cache_info()['currsize'], 2)
+        self.assertEqual(rand.sampler_cache_info()['maxsize'], 2)
+        rand.set_sampler_cache_size(0)
+        rand.weighted_rand([(0, 1), (1, 1)])
+        self.assertEqual(rand.sampler_cache_info()['currsize'], 0)
+        with self.assertRaises(ValueError):
+            rand.set_sampler_cache_size(-1)
+
+    def test_modified_lists_are_recompiled(self):
+        weights = [(0, 1), (1, 1)]
+        rand.weighted_rand(weights)
+        weights[0] = (99, 1)
+        weights[1] = (100, 1)
+        self.assertTrue(99 <= rand.weighted_rand(weights) <= 100)
+
+
+class TestNormalDistributionCache(unittest.TestCase):
+    def test_repeated_calls_are_cached(self):
+        rand._normal_distribution_cache.clear()
+        first = rand.normal_distribution(3, 2, minimum=0, weight_count=9)
+        second = rand.normal_distribution(3, 2, minimum=0, weight_count=9)
+        self.assertEqual(first, second)
+        self.assertEqual(rand._normal_distribution_cache.hits, 1)
+        self.assertEqual(rand._normal_distribution_cache.misses, 1)
+
+    def test_cached_results_are_safe_to_modify(self):
+        first = rand.normal_distribution(7, 2)
+        first.append((100, 100))
+        self.assertNotIn((100, 100), rand.normal_distribution(7, 2))
+
+    def test__lru_cache_evicts_least_recently_used(self):
+        cache = rand._LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 2)
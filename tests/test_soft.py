@@ -1,9 +1,12 @@
 from __future__ import division
 
+import random
 import unittest
 
 from blur import soft
-from blur.rand import ProbabilityUndefinedError
+from blur.noise import GradientNoise
+from blur.rand import (PiecewiseLinearDistribution, ProbabilityUndefinedError,
+                       WeightArrays, WeightTable)
 
 
 class TestSoftObject(unittest.TestCase):
@@ -166,6 +169,25 @@ class TestSoftInt(unittest.TestCase):
             self.assertTrue(min_value <= got_value <= max_value)
             self.assertIsInstance(got_value, int)
 
+    def test_get_from_weight_curve_distribution(self):
+        curve = PiecewiseLinearDistribution([(0, 1), (3, 1)])
+        test_object = soft.SoftInt(curve)
+        values = [test_object.get() for i in range(2000)]
+        self.assertTrue(all(isinstance(value, int) for value in values))
+        self.assertEqual(set(values), {0, 1, 2, 3})
+        # The end integers only cover half a unit of the curve
+        self.assertLess(abs(values.count(0) / 2000 - 1 / 6), 0.04)
+
+    def test_rounded_curve_draws_match_precompiled_curve(self):
+        weights = [(0, 1), (2, 5), (3, 1)]
+        fresh = soft.SoftInt(PiecewiseLinearDistribution(weights),
+                             rng=random.Random(5))
+        precompiled_curve = PiecewiseLinearDistribution(weights)
+        precompiled_curve.rounded()
+        precompiled = soft.SoftInt(precompiled_curve, rng=random.Random(5))
+        self.assertEqual([fresh.get() for i in range(50)],
+                         [precompiled.get() for i in range(50)])
+
 
 class TestSoftColor(unittest.TestCase):
     def test_init_from_int_values(self):
@@ -292,3 +314,75 @@ class TestSoftColor(unittest.TestCase):
         test_object = soft.SoftColor(128, 200, 255)
         hex_color = test_object.get_as_hex()
         self.assertEqual(hex_color, '#80C8FF')
+
+
+class TestSoftObjectRng(unittest.TestCase):
+    def test_soft_objects_are_reproducible_with_rng(self):
+        def roll(seed):
+            rng = random.Random(seed)
+            objects = [soft.SoftOptions([('a', 1), ('b', 2)], rng=rng),
+                       soft.SoftBool(0.5, rng=rng),
+                       soft.SoftFloat([(0, 1), (10, 3)], rng=rng),
+                       soft.SoftInt([(0, 1), (10, 3)], rng=rng),
+                       soft.SoftColor(([(0, 1), (255, 10)],), 0, 0, rng=rng)]
+            return [obj.get() for obj in objects for i in range(5)]
+        self.assertEqual(roll(9), roll(9))
+
+
+class TestSoftObjectWeightTable(unittest.TestCase):
+    def test_soft_options_accepts_weight_table(self):
+        table = WeightTable([('a', 1), ('b', 0)])
+        test_object = soft.SoftOptions(table)
+        self.assertIs(test_object.options, table)
+        self.assertEqual(test_object.get(), 'a')
+
+    def test_soft_float_accepts_numerical_weight_table(self):
+        table = WeightTable([(0, 1), (10, 1)])
+        test_object = soft.SoftFloat(table)
+        self.assertIs(test_object.weights, table)
+        self.assertTrue(0 <= test_object.get() <= 10)
+
+    def test_soft_float_rejects_non_numerical_weight_table(self):
+        with self.assertRaises(TypeError):
+            soft.SoftFloat(WeightTable([('a', 1), ('b', 1)]))
+
+    def test_soft_options_accepts_weight_arrays(self):
+        options = WeightArrays(['a', 'b'], [1, 0])
+        self.assertEqual(soft.SoftOptions(options).get(), 'a')
+
+    def test_soft_float_accepts_weight_arrays(self):
+        weights = WeightArrays([0, 10], [1, 1])
+        self.assertTrue(0 <= soft.SoftFloat(weights).get() <= 10)
+
+
+class TestSoftNoise(unittest.TestCase):
+    def test_get_stays_in_bounds(self):
+        drift = soft.SoftNoise(-5, 5, step=0.37, rng=random.Random(1))
+        values = [drift.get() for i in range(500)]
+        self.assertTrue(all(-5 <= value <= 5 for value in values))
+        self.assertGreater(len(set(values)), 400)
+
+    def test_get_drifts_smoothly(self):
+        drift = soft.SoftNoise(0, 10, step=0.001, rng=random.Random(1))
+        values = [drift.get() for i in range(200)]
+        for previous, current in zip(values, values[1:]):
+            self.assertLess(abs(current - previous), 0.1)
+
+    def test_get_advances_position(self):
+        drift = soft.SoftNoise(0, 1, step=0.25)
+        start = drift.position
+        drift.get()
+        drift.get()
+        self.assertAlmostEqual(drift.position, start + 0.5)
+
+    def test_uses_given_noise(self):
+        noise = GradientNoise(seed=3)
+        drift = soft.SoftNoise(0, 2, step=0.3, noise=noise)
+        start = drift.position
+        drift.get()
+        self.assertEqual(drift.get(), noise(start + 0.3) + 1)
+
+    def test_get_drifts_with_whole_steps(self):
+        drift = soft.SoftNoise(0, 10, step=1, rng=random.Random(1))
+        values = [drift.get() for i in range(10)]
+        self.assertGreater(len(set(values)), 1)